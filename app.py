@@ -1,5 +1,6 @@
 import logging
 import os
+import time
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
 
@@ -8,14 +9,23 @@ from flask import Flask, jsonify, request
 from flask_socketio import SocketIO, join_room, leave_room
 from twilio.rest import Client
 
+from src.analytics_controller import analytics_bp
 from src.auth_controller import auth_bp
+from src.call_event_journal import CallEventJournal
 from src.call_events_controller import events_bp
+from src.call_graph import CallGraph
 from src.conference_controller import conference_bp
 from src.constants import SERVER_DOMAIN
 from src.greet_controller import greet_bp
 from src.hold_controller import hold_bp
+from src.metrics_controller import metrics_bp
+from src.recording_pipeline import DEFAULT_URL_TEMPLATE, RecordingPipeline
+from src.recordings_controller import recordings_bp
+from src.state_store import StateStore
 from src.templates_controller import templates_bp
+from src.transcript_relay import TranscriptRelay
 from src.transfer_controller import transfer_bp
+from src.twilio_guard import GuardedTwilioClient
 from src.voice_controller import voice_bp
 
 load_dotenv()
@@ -109,16 +119,78 @@ socketio = SocketIO(app, cors_allowed_origins="*")
 
 TWILIO_ACCOUNT_SID = os.getenv("TWILIO_ACCOUNT_SID")
 TWILIO_AUTH_TOKEN = os.getenv("TWILIO_AUTH_TOKEN")
-twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+# Every controller shares this client, so rate limiting and the circuit
+# breaker see the whole process's traffic to Twilio.
+twilio_client = GuardedTwilioClient(
+    Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
+)
 
 app.config["socketio"] = socketio
 app.config["twilio_client"] = twilio_client
 
-call_log: dict[str, dict] = {}
-app.config["call_log"] = call_log
-
-redis: dict[str, dict] = {}
-app.config["redis"] = redis
+# One indexed store for call and conference state (formerly the separate
+# ``call_log`` and ``redis`` dicts).
+call_graph = CallGraph()
+app.config["call_graph"] = call_graph
+
+# Snapshot + journal the call graph so a restart (or rolling deploy) resumes
+# in-flight holds and transfers instead of starting from an empty store.
+# Directory configurable via ``STATE_DIR`` (defaults to "state/").
+state_store = StateStore(
+    call_graph,
+    os.getenv("STATE_DIR", "state"),
+    interval=float(os.getenv("STATE_SNAPSHOT_INTERVAL_S", "30")),
+    retention=float(os.getenv("STATE_RETENTION_S", "3600")),
+)
+state_store.restore()
+state_store.start()
+app.config["state_store"] = state_store
+
+# Full call status history goes to an append-only, segment-rotated journal
+# (``CALL_EVENTS_DIR``) that backs the /calls analytics endpoints.
+call_event_journal = CallEventJournal(
+    os.getenv("CALL_EVENTS_DIR", "call_events"),
+    retention=float(os.getenv("CALL_EVENTS_RETENTION_DAYS", "30")) * 86400,
+)
+app.config["call_event_journal"] = call_event_journal
+
+# Completed recordings are downloaded in the background into content-addressed
+# storage with a manifest (``RECORDINGS_STORE_DIR``; unset disables it).
+recording_pipeline = None
+if os.getenv("RECORDINGS_STORE_DIR"):
+    recording_pipeline = RecordingPipeline(
+        os.getenv("RECORDINGS_STORE_DIR"),
+        auth=(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN),
+        workers=int(os.getenv("RECORDINGS_WORKERS", "4")),
+        max_queued=int(os.getenv("RECORDINGS_MAX_QUEUED", "256")),
+        url_template=os.getenv("RECORDINGS_URL_TEMPLATE", DEFAULT_URL_TEMPLATE),
+        transcripts_dir=os.getenv("TRANSCRIPTS_DIR", "transcripts"),
+    )
+    recording_pipeline.start()
+app.config["recording_pipeline"] = recording_pipeline
+
+# Live transcript segments from the transcription server are pushed to the
+# agents' browser dialers (``LIVE_TRANSCRIPTS_ADDR``; empty disables it).
+transcript_relay = None
+live_transcripts_addr = os.getenv("LIVE_TRANSCRIPTS_ADDR", "127.0.0.1:5679")
+if live_transcripts_addr:
+    relay_host, _, relay_port = live_transcripts_addr.rpartition(":")
+    transcript_relay = TranscriptRelay(
+        socketio,
+        call_graph,
+        (relay_host or "127.0.0.1", int(relay_port)),
+        min_interval=float(os.getenv("LIVE_TRANSCRIPTS_INTERVAL_S", "0.25")),
+    )
+    try:
+        transcript_relay.start()
+    except OSError as e:
+        app.logger.warning(
+            "📝 Live transcripts disabled, cannot listen on %s: %s",
+            live_transcripts_addr,
+            e,
+        )
+        transcript_relay = None
+app.config["transcript_relay"] = transcript_relay
 
 app.config["SERVER_NAME"] = SERVER_DOMAIN
 app.config["PREFERRED_URL_SCHEME"] = "https"
@@ -131,6 +203,9 @@ app.register_blueprint(events_bp)
 app.register_blueprint(conference_bp)
 app.register_blueprint(hold_bp)
 app.register_blueprint(transfer_bp)
+app.register_blueprint(metrics_bp)
+app.register_blueprint(analytics_bp)
+app.register_blueprint(recordings_bp)
 
 # Track currently connected Socket.IO client identities so that the web dialer can
 # populate a dropdown with live targets.
@@ -186,6 +261,24 @@ def handle_socket_disconnect():
         )
 
 
+@socketio.on("transcript_ack")
+def handle_transcript_ack(data):
+    """Record that a dialer rendered a ``transcript`` batch (and the
+    audio-to-screen latency it measured), reopening its room's window.
+    """
+    identity = sid_to_identity.get(request.sid)
+    if transcript_relay is not None and identity and isinstance(data, dict):
+        transcript_relay.ack(identity, data)
+
+
+@socketio.on("transcript_clock")
+def handle_transcript_clock(_data=None):
+    """Return the server time (epoch ms) so dialers can correct their clock
+    when measuring transcript latency.
+    """
+    return time.time() * 1000
+
+
 @app.route("/connected-dialers", methods=["GET"])
 def get_connected_dialers():
     """Return a JSON list of identities for currently connected browser
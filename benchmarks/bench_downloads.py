@@ -0,0 +1,116 @@
+"""Recording download benchmark against a local stand-in service.
+
+Runs ``fake_recording_service.py`` in-process, then downloads ``--count``
+recordings with the original one-at-a-time ``download_recording`` (whole
+body in memory, new connection per request) and with the concurrent,
+streaming ``download_recordings`` at each ``--workers`` level. Every file
+is checked against the bytes the stand-in served. ``--drop-at-kb`` cuts
+the first transfer of each recording short so the streaming path has to
+resume it with a Range request.
+
+Usage::
+
+    python benchmarks/bench_downloads.py --count 20 --size-kb 2048 \
+        --kbps 4096 --latency-ms 50 --workers 1 4 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import download_merge_recordings as dmr  # noqa: E402
+import fake_recording_service as fake  # noqa: E402
+
+
+def _check(paths: dict[str, str], size: int) -> int:
+    """Return how many downloaded files differ from what was served."""
+    bad = 0
+    for recording_id, path in paths.items():
+        with open(path, "rb") as fp:
+            if fp.read() != fake.recording_bytes(recording_id, size):
+                bad += 1
+    return bad
+
+
+def _sequential(ids, directory, base_url) -> dict[str, str]:
+    dmr.BASE_URL = base_url
+    return {rid: dmr.download_recording(rid, directory) for rid in ids}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--size-kb", type=int, default=2048)
+    parser.add_argument("--kbps", type=float, default=4096)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--drop-at-kb", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    size = args.size_kb * 1024
+    server = fake.FakeRecordingService(
+        ("127.0.0.1", 0),
+        size,
+        args.kbps * 1024,
+        args.latency_ms / 1000,
+    )
+    fake.serve_in_thread(server)
+    base_url = server.base_url()
+    total_mb = args.count * size / 1e6
+    print(
+        f"{args.count} recordings x {args.size_kb} KB, "
+        f"{args.kbps:.0f} KB/s per connection, {args.latency_ms:.0f} ms "
+        f"latency\n{'mode':<18} {'wall s':>7} {'MB/s':>7} {'requests':>8} "
+        f"{'ranges':>6} {'bad':>4}"
+    )
+
+    def row(label, wall, paths, requests_before, ranges_before):
+        print(
+            f"{label:<18} {wall:>7.2f} {total_mb / wall:>7.2f} "
+            f"{server.requests - requests_before:>8} "
+            f"{server.range_requests - ranges_before:>6} "
+            f"{_check(paths, size) + args.count - len(paths):>4}"
+        )
+
+    with tempfile.TemporaryDirectory(prefix="bench-dl-") as workdir:
+        ids = [f"RE{i:06d}" for i in range(args.count)]
+        directory = os.path.join(workdir, "sequential")
+        os.makedirs(directory)
+        before = server.requests, server.range_requests
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            paths = _sequential(ids, directory, base_url)
+        row("sequential", time.perf_counter() - started, paths, *before)
+
+        for run, workers in enumerate(args.workers):
+            directory = os.path.join(workdir, f"run{run}-workers{workers}")
+            os.makedirs(directory)
+            server.drop_at = args.drop_at_kb * 1024
+            server._dropped.clear()
+            before = server.requests, server.range_requests
+            started = time.perf_counter()
+            with contextlib.redirect_stderr(io.StringIO()):
+                paths, _errors = dmr.download_recordings(
+                    ids, directory, workers=workers, base_url=base_url
+                )
+            row(
+                f"streaming x{workers}",
+                time.perf_counter() - started,
+                paths,
+                *before,
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""Live transcript push benchmark: publisher → relay → Socket.IO clients.
+
+Runs a Flask-SocketIO server with ``src.transcript_relay`` and
+``--conferences`` conferences of ``--agents`` agent dialers each, connected
+as Socket.IO clients that render nothing but acknowledge every batch with
+its latencies, as ``templates/index.html`` does. ``--speakers`` streams per
+conference publish through the transcription server's ``_LivePublisher``:
+a final segment every ``--final-ms`` and interims every ``--interim-ms`` in
+between. Each segment's audio is taken to end when it is published, so the
+reported audio-to-screen latency is what this path adds on top of
+Deepgram (the clients use long-polling, so browsers on WebSocket see a
+little less). Also reports how many events the coalescing saved.
+
+Usage::
+
+    python benchmarks/bench_live_transcripts.py --conferences 10 \
+        --agents 2 --speakers 2 --final-ms 1500 --interim-ms 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+import socketio as socketio_client
+from flask import Flask, request
+from flask_socketio import SocketIO, join_room
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "python-transcription"))
+
+import live_transcription_server as server  # noqa: E402
+
+from src.call_graph import CallGraph  # noqa: E402
+from src.transcript_relay import TranscriptRelay  # noqa: E402
+
+
+def _free_port(kind: int) -> int:
+    with socket.socket(socket.AF_INET, kind) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _speak(publisher, conference, stream_sid, args, stop) -> None:
+    """Publish a segment every --interim-ms; every --final-ms a final one."""
+    tick_ms = args.interim_ms or args.final_ms
+    per_final = max(1, args.final_ms // tick_ms)
+    seq = 0
+    while not stop.wait(tick_ms / 1000):
+        seq += 1
+        now_ms = int(time.time() * 1000)
+        publisher.publish(
+            {
+                "stream_sid": stream_sid,
+                "call_sid": f"CA{stream_sid}",
+                "conference": conference,
+                "participant": stream_sid,
+                "channel": 0,
+                "final": seq % per_final == 0,
+                "text": f"word{seq}",
+                "start_ms": now_ms - tick_ms,
+                "end_ms": now_ms,
+                "seq": seq,
+                "published_ms": now_ms,
+            }
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conferences", type=int, default=10)
+    parser.add_argument("--agents", type=int, default=2)
+    parser.add_argument("--speakers", type=int, default=2)
+    parser.add_argument("--final-ms", type=int, default=1500)
+    parser.add_argument("--interim-ms", type=int, default=100)
+    parser.add_argument("--interval-ms", type=float, default=250)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+    for name in ("werkzeug", "engineio", "socketio", "src.transcript_relay"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+
+    app = Flask(__name__)
+    sio = SocketIO(app, async_mode="threading")
+    graph = CallGraph()
+    identities: dict[str, str] = {}
+    relay = TranscriptRelay(
+        sio,
+        graph,
+        ("127.0.0.1", _free_port(socket.SOCK_DGRAM)),
+        min_interval=args.interval_ms / 1000,
+    )
+
+    @sio.on("connect")
+    def connect():
+        identity = request.args.get("identity")
+        identities[request.sid] = identity
+        join_room(identity)
+
+    @sio.on("transcript_ack")
+    def ack(data):
+        relay.ack(identities[request.sid], data)
+
+    port = _free_port(socket.SOCK_STREAM)
+    threading.Thread(
+        target=sio.run,
+        args=(app,),
+        kwargs={"port": port, "allow_unsafe_werkzeug": True},
+        daemon=True,
+    ).start()
+    relay.start()
+
+    received = {"events": 0, "segments": 0}
+    latencies: list[float] = []
+    lock = threading.Lock()
+    clients = []
+    for c in range(args.conferences):
+        conference = f"room-{c}"
+        graph.ensure_conference(conference, created_by=f"agent-{c}-0")
+        for a in range(args.agents):
+            identity = f"agent-{c}-{a}"
+            graph.add_conference_call(
+                conference,
+                f"CA{c}-{a}",
+                {"role": "agent", "participant_identity": identity},
+            )
+            client = socketio_client.Client()
+
+            def on_transcript(batch, client=client):
+                shown_ms = time.time() * 1000
+                batch_latencies = [
+                    shown_ms - segment["end_ms"]
+                    for segment in batch["segments"]
+                ]
+                client.emit(
+                    "transcript_ack",
+                    {"batch": batch["batch"], "latency_ms": batch_latencies},
+                )
+                with lock:
+                    received["events"] += 1
+                    received["segments"] += len(batch["segments"])
+                    latencies.extend(batch_latencies)
+
+            client.on("transcript", on_transcript)
+            for _ in range(50):
+                try:
+                    client.connect(
+                        f"http://127.0.0.1:{port}?identity={identity}",
+                        transports=["polling"],
+                    )
+                    break
+                except socketio_client.exceptions.ConnectionError:
+                    time.sleep(0.1)
+            clients.append(client)
+
+    publisher = server._LivePublisher(relay.address)
+    stop = threading.Event()
+    speakers = [
+        threading.Thread(
+            target=_speak,
+            args=(publisher, f"room-{c}", f"MZ{c}-{s}", args, stop),
+            daemon=True,
+        )
+        for c in range(args.conferences)
+        for s in range(args.speakers)
+    ]
+    for thread in speakers:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in speakers:
+        thread.join()
+    time.sleep(1)  # let the last batches arrive
+    stats = relay.stats()
+    for client in clients:
+        client.disconnect()
+    relay.stop()
+
+    latencies.sort()
+    print(
+        f"{args.conferences} conferences x {args.speakers} speakers "
+        f"(final every {args.final_ms} ms, interim every {args.interim_ms} "
+        f"ms) -> {args.agents} agents each, batch interval "
+        f"{args.interval_ms:g} ms, {args.seconds:g}s\n"
+        f"published {publisher.published} segments "
+        f"({publisher.published / args.seconds:.0f}/s), relay received "
+        f"{stats['received']}, lost {stats['lost']}, coalesced "
+        f"{stats['coalesced']}\n"
+        f"clients got {received['events']} events "
+        f"({received['events'] / len(clients) / args.seconds:.1f}/s per "
+        f"dialer) carrying {received['segments']} segments; "
+        f"{stats['stalled']} stalled batches"
+    )
+    if latencies:
+        print(
+            f"audio → screen ms: p50 {statistics.median(latencies):.1f}, "
+            f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.1f}, "
+            f"max {latencies[-1]:.1f}"
+        )
+    print(f"relay latency_ms: {stats['latency_ms']}")
+
+
+if __name__ == "__main__":
+    main()
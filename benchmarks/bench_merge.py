@@ -0,0 +1,124 @@
+"""Recording merge benchmark: wall time and peak RSS per merge method.
+
+Builds ``--count`` recordings of ``--minutes`` each, then merges them with
+every method of ``download_merge_recordings.merge_recordings`` in its own
+child process, so peak RSS (the child's and its ffmpeg's) is per method.
+Inputs are encoded by ffmpeg when it is on PATH (8 kHz mono 32 kbit/s MP3,
+like telephony recordings); otherwise they are synthesised as silent MP3
+frames of the same format, which only the frame method can merge.
+
+Usage::
+
+    python benchmarks/bench_merge.py --minutes 60 --count 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+# MPEG 2.5 layer III, 32 kbit/s, 8 kHz, mono: 288-byte frames of 72 ms.
+_FRAME_HEADER = bytes((0xFF, 0xE3, 0x48, 0xC4))
+_FRAME_BYTES = 288
+_FRAME_SECONDS = 576 / 8000
+
+
+def make_input(path: str, seconds: float, seed: int) -> None:
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        frame = _FRAME_HEADER + bytes(_FRAME_BYTES - len(_FRAME_HEADER))
+        with open(path, "wb") as fp:
+            for _ in range(int(seconds / _FRAME_SECONDS)):
+                fp.write(frame)
+        return
+    subprocess.run(
+        [
+            ffmpeg,
+            "-v",
+            "error",
+            "-y",
+            "-f",
+            "lavfi",
+            "-i",
+            f"anoisesrc=d={seconds}:c=pink:r=8000:a=0.2:s={seed}",
+            "-ac",
+            "1",
+            "-b:a",
+            "32k",
+            path,
+        ],
+        check=True,
+    )
+
+
+def _child(method: str, output: str, inputs: list[str]) -> None:
+    import download_merge_recordings as dmr
+
+    try:
+        dmr.merge_recordings(inputs, output, methods=(method,))
+        ok = True
+    except (ValueError, OSError):
+        ok = False
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    print(json.dumps({"ok": ok, "rss_kb": max(usage, children)}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60)
+    parser.add_argument("--count", type=int, default=2)
+    parser.add_argument("--child", nargs="+", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(args.child[0], args.child[1], args.child[2:])
+        return
+
+    import download_merge_recordings as dmr
+
+    with tempfile.TemporaryDirectory(prefix="bench-merge-") as workdir:
+        inputs = [
+            os.path.join(workdir, f"in{i}.mp3") for i in range(args.count)
+        ]
+        started = time.perf_counter()
+        for seed, path in enumerate(inputs):
+            make_input(path, args.minutes * 60, seed)
+        total_mb = sum(os.path.getsize(p) for p in inputs) / 1e6
+        print(
+            f"{args.count} x {args.minutes:g} min inputs ({total_mb:.1f} MB, "
+            f"{'ffmpeg' if shutil.which('ffmpeg') else 'synthetic'}, "
+            f"built in {time.perf_counter() - started:.1f}s)\n"
+            f"{'method':<12} {'wall s':>8} {'peak RSS MB':>12} {'out MB':>8}"
+        )
+        for method in dmr.MERGE_METHODS:
+            output = os.path.join(workdir, f"out-{method}.mp3")
+            started = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, __file__, "--child", method, output, *inputs],
+                capture_output=True,
+                text=True,
+            )
+            wall = time.perf_counter() - started
+            lines = result.stdout.strip().splitlines()
+            report = json.loads(lines[-1]) if lines else {"ok": False}
+            if not report["ok"]:
+                print(f"{method:<12} {'n/a':>8}")
+                continue
+            print(
+                f"{method:<12} {wall:>8.2f} {report['rss_kb'] / 1024:>12.1f} "
+                f"{os.path.getsize(output) / 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
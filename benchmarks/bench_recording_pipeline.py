@@ -0,0 +1,164 @@
+"""Recording webhook pipeline benchmark against a local stand-in service.
+
+Feeds ``--count`` Twilio ``completed`` recording callbacks (each sent
+``--repeat`` times, as Twilio may retry, and with ``--shared`` of them
+pointing at identical media) into ``src.recording_pipeline`` while
+``fake_recording_service.py`` serves the Twilio media URLs with basic auth
+and a redirect to signed storage URLs. Reports how long the webhook-side
+``submit`` calls took, the time until every recording was stored, and
+checks deduplication, the content-addressed objects and the transcript
+links in the manifest.
+
+Usage::
+
+    python benchmarks/bench_recording_pipeline.py --count 200 --workers 8 \
+        --size-kb 512 --kbps 2048 --latency-ms 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import fake_recording_service as fake  # noqa: E402
+
+from src.recording_pipeline import RecordingPipeline  # noqa: E402
+
+_AUTH = ("AC0", "token")
+
+
+def _write_transcripts(directory: str, conferences: list[str]) -> None:
+    os.makedirs(directory, exist_ok=True)
+    for i, name in enumerate(conferences):
+        with open(
+            os.path.join(directory, f"agent-{i}.json"), "w", encoding="utf-8"
+        ) as fp:
+            json.dump(
+                {
+                    "metadata": {
+                        "custom_parameters": {"conference_name": name}
+                    },
+                    "transcription": [{"results": []}],
+                },
+                fp,
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=2)
+    parser.add_argument("--shared", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--max-queued", type=int, default=64)
+    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--kbps", type=float, default=2048)
+    parser.add_argument("--latency-ms", type=float, default=30)
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+    # Deferrals are expected with a small queue; keep the report readable.
+    logging.getLogger("src.recording_pipeline").setLevel(logging.ERROR)
+
+    size = args.size_kb * 1024
+    server = fake.FakeRecordingService(
+        ("127.0.0.1", 0),
+        size,
+        args.kbps * 1024,
+        args.latency_ms / 1000,
+        auth=":".join(_AUTH),
+    )
+    fake.serve_in_thread(server)
+
+    with tempfile.TemporaryDirectory(prefix="bench-rec-") as workdir:
+        conferences = [f"room-{i % 20}" for i in range(args.count)]
+        transcripts_dir = os.path.join(workdir, "transcripts")
+        _write_transcripts(transcripts_dir, sorted(set(conferences)))
+        pipeline = RecordingPipeline(
+            os.path.join(workdir, "store"),
+            auth=_AUTH,
+            workers=args.workers,
+            max_queued=args.max_queued,
+            transcripts_dir=transcripts_dir,
+        )
+        pipeline.start()
+
+        # The first --shared recordings all point at the same media.
+        media = [
+            "REshared" if i < args.shared else f"RE{i:08d}"
+            for i in range(args.count)
+        ]
+        outcomes: collections.Counter[str] = collections.Counter()
+        submit_seconds = 0.0
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            for i in range(args.count):
+                event = {
+                    "RecordingSid": f"RE{i:08d}",
+                    "RecordingStatus": "completed",
+                    "RecordingUrl": server.twilio_recording_url(media[i]),
+                    "CallSid": f"CA{i:08d}",
+                    "RecordingDuration": "60",
+                }
+                t0 = time.perf_counter()
+                outcomes[pipeline.submit(event, conferences[i])] += 1
+                submit_seconds += time.perf_counter() - t0
+
+        deadline = time.monotonic() + args.timeout
+        while time.monotonic() < deadline:
+            statuses = pipeline.stats()["recordings"]
+            if statuses.get("stored", 0) + statuses.get("failed", 0) >= (
+                args.count
+            ):
+                break
+            time.sleep(0.05)
+        wall = time.perf_counter() - started
+        stats = pipeline.stats()
+        records = pipeline.manifest()
+        pipeline.stop()
+
+        objects = [
+            os.path.join(root, name)
+            for root, _dirs, names in os.walk(
+                os.path.join(workdir, "store", "objects")
+            )
+            for name in names
+        ]
+        bad_objects = 0
+        for path in objects:
+            with open(path, "rb") as fp:
+                digest = hashlib.sha256(fp.read()).hexdigest()
+            if not os.path.basename(path).startswith(digest):
+                bad_objects += 1
+        unlinked = sum(1 for r in records if not r.get("transcripts"))
+        submits = args.count * args.repeat
+        print(
+            f"{args.count} recordings x {args.size_kb} KB "
+            f"({args.shared} sharing media), each callback sent "
+            f"{args.repeat}x, {args.workers} workers, queue "
+            f"{args.max_queued}\n"
+            f"submit: {submits} calls, "
+            f"{submit_seconds / submits * 1e6:.0f} µs each "
+            f"({', '.join(f'{n} {k}' for k, n in sorted(outcomes.items()))})\n"
+            f"stored {stats['recordings'].get('stored', 0)}/{args.count} in "
+            f"{wall:.2f}s ({stats['downloaded_bytes'] / 1e6 / wall:.1f} MB/s), "
+            f"{stats['failures']} failed, {server.requests} HTTP requests\n"
+            f"objects: {len(objects)} on disk "
+            f"({stats['deduplicated_objects']} deduplicated by content), "
+            f"{bad_objects} with a wrong hash; "
+            f"{unlinked} records without transcripts"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Transcript format benchmark: JSON vs ``.tbin`` size and parse speed.
+
+Writes one synthetic transcript of ``--words`` words (in results of 1-12
+words, Zipf-like vocabulary) as a ``.tbin`` with
+``scripts/transcript_binary.py``, converts it to the JSON the transcription
+server would have written, and reports both sizes (and gzipped), the time
+to read every word back from each, and the conversion speed. Runs once
+with relative times and once with epoch times (``TRANSCRIPT_EPOCH_TIMES``).
+
+Usage::
+
+    python benchmarks/bench_transcript_formats.py --words 500000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "scripts"))
+
+from merge_conference_transcripts import iter_words  # noqa: E402
+from transcript_binary import (  # noqa: E402
+    TranscriptBinaryReader,
+    TranscriptBinaryWriter,
+    json_to_binary,
+    write_json,
+)
+
+_EPOCH_NS = 1_760_000_000_000 * 1_000_000
+_NS_PER_MS = 1_000_000
+
+
+def _best(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def _drain(iterator) -> None:
+    for _ in iterator:
+        pass
+
+
+def _tbin_batches(path: str) -> None:
+    with TranscriptBinaryReader(path) as reader:
+        _drain(reader.batches())
+
+
+def _json_load(path: str) -> None:
+    with open(path, encoding="utf-8") as fp:
+        json.load(fp)
+
+
+def _to_binary(src: str, dst: str) -> None:
+    with open(src, encoding="utf-8") as fp, open(dst, "wb") as out:
+        json_to_binary(fp, out)
+
+
+def _write(directory: str, args, epoch: bool) -> tuple[str, str]:
+    rng = np.random.default_rng(0)
+    weights = 1 / np.arange(1, args.vocabulary + 1)
+    weights /= weights.sum()
+    words = np.array([f"word{i}" for i in range(args.vocabulary)])
+    text = words[rng.choice(args.vocabulary, args.words, p=weights)]
+    # ~150 words a minute, 200-500 ms each.
+    starts = np.cumsum(rng.integers(200, 600, args.words)) * _NS_PER_MS
+    ends = starts + rng.integers(200, 500, args.words) * _NS_PER_MS
+    if epoch:
+        starts += _EPOCH_NS
+        ends += _EPOCH_NS
+    result_ends = np.cumsum(rng.integers(1, 13, args.words))
+    result_ends = np.append(result_ends[result_ends < args.words], args.words)
+
+    style = "epoch" if epoch else "relative"
+    tbin = os.path.join(directory, f"agent-{style}.tbin")
+    path = os.path.join(directory, f"agent-{style}.json")
+    metadata = {"participant": "agent", "call_sid": "CA0"}
+    with open(tbin, "wb") as fp:
+        writer = TranscriptBinaryWriter(fp, metadata, epoch=epoch)
+        previous = 0
+        for end in result_ends.tolist():
+            writer.add(
+                text[previous:end].tolist(),
+                starts[previous:end].tolist(),
+                ends[previous:end].tolist(),
+            )
+            previous = end
+        writer.close()
+    with (
+        TranscriptBinaryReader(tbin) as reader,
+        open(path, "w", encoding="utf-8") as out,
+    ):
+        write_json(reader, out)
+    return path, tbin
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=500_000)
+    parser.add_argument("--vocabulary", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench-formats-") as workdir:
+        for epoch in (False, True):
+            path, tbin = _write(workdir, args, epoch)
+            sizes = {}
+            for name in (path, tbin):
+                with open(name, "rb") as fp:
+                    data = fp.read()
+                sizes[name] = (len(data), len(gzip.compress(data, 6)))
+            print(
+                f"{args.words:,} words, {'epoch' if epoch else 'relative'} "
+                f"times: JSON {sizes[path][0] / 1e6:.1f} MB "
+                f"({sizes[path][1] / 1e6:.1f} MB gzipped), "
+                f".tbin {sizes[tbin][0] / 1e6:.2f} MB "
+                f"({sizes[tbin][1] / 1e6:.2f} MB gzipped), "
+                f"{sizes[path][0] / sizes[tbin][0]:.1f}x smaller"
+            )
+            converted = os.path.join(workdir, "converted.tbin")
+            cases = {
+                "json.load (whole document)": lambda: _json_load(path),
+                "JSON iter_words (streaming)": lambda: _drain(iter_words(path)),
+                ".tbin iter_words": lambda: _drain(iter_words(tbin)),
+                ".tbin batches (NumPy arrays)": lambda: _tbin_batches(tbin),
+                "JSON -> .tbin conversion": lambda: _to_binary(path, converted),
+            }
+            print(f"  {'read':<30} {'seconds':>8} {'words/s':>12}")
+            for label, case in cases.items():
+                seconds = _best(case, args.repeat)
+                print(
+                    f"  {label:<30} {seconds:>8.3f} "
+                    f"{args.words / seconds:>12,.0f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
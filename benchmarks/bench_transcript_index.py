@@ -0,0 +1,140 @@
+"""Transcript word index benchmark: build time, size and lookup latency.
+
+Adds ``--transcripts`` synthetic transcripts of ``--words`` words each to a
+fresh ``scripts/transcript_index.py`` index, one segment per transcript as
+the transcription server does (merging as it goes), then times each kind
+of lookup ``--queries`` times against random conferences, participants,
+windows and words.
+
+Usage::
+
+    python benchmarks/bench_transcript_index.py --transcripts 1000 \
+        --words 5000 --conferences 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "scripts"))
+
+from transcript_index import TranscriptIndex  # noqa: E402
+
+_EPOCH_MS = 1_760_000_000_000
+_NS_PER_MS = 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--transcripts", type=int, default=1000)
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--vocabulary", type=int, default=20000)
+    parser.add_argument("--conferences", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--window-s", type=float, default=300)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vocabulary = [f"word{i}" for i in range(args.vocabulary)]
+    # Zipf-like word frequencies, like speech.
+    weights = 1 / np.arange(1, args.vocabulary + 1)
+    weights /= weights.sum()
+    call_ns = args.words * 400 * _NS_PER_MS  # ~150 words a minute
+
+    with tempfile.TemporaryDirectory(prefix="bench-index-") as workdir:
+        index = TranscriptIndex(os.path.join(workdir, "index"))
+        calls = []
+        started = time.perf_counter()
+        for i in range(args.transcripts):
+            conference = f"room-{i % args.conferences}"
+            participant = f"agent-{i % 7}"
+            epoch_ms = _EPOCH_MS + i * 60_000
+            metadata = {
+                "participant": participant,
+                "custom_parameters": {"conference_name": conference},
+                "transcript_epoch_ms": epoch_ms,
+            }
+            # Interned like the server's _WordStore: only the words used.
+            used, word_ids = np.unique(
+                rng.choice(args.vocabulary, args.words, p=weights),
+                return_inverse=True,
+            )
+            starts = np.sort(rng.integers(0, call_ns, args.words))
+            index.add(
+                os.path.join(workdir, f"{participant}-{epoch_ms}.json"),
+                metadata,
+                [vocabulary[i] for i in used],
+                word_ids.astype(np.uint32),
+                starts,
+                starts + 300 * _NS_PER_MS,
+            )
+            calls.append((conference, participant, epoch_ms))
+        build = time.perf_counter() - started
+        stats = index.stats()
+        print(
+            f"{stats['words']:,} words in {stats['files']} transcripts: "
+            f"built in {build:.1f}s ({stats['words'] / build:,.0f} words/s), "
+            f"{stats['segments']} segments, {stats['bytes'] / 1e6:.1f} MB"
+        )
+
+        window_ms = args.window_s * 1000
+
+        def pick():
+            conference, participant, epoch_ms = calls[rng.integers(len(calls))]
+            start_ms = epoch_ms + rng.uniform(0, call_ns / _NS_PER_MS)
+            word = vocabulary[int(rng.choice(args.vocabulary, p=weights))]
+            return conference, participant, start_ms, word
+
+        shapes = {
+            "participant+conference+window": lambda c, p, t, w: {
+                "conference": c,
+                "participant": p,
+                "start_ms": t,
+                "end_ms": t + window_ms,
+            },
+            "conference+window": lambda c, p, t, w: {
+                "conference": c,
+                "start_ms": t,
+                "end_ms": t + window_ms,
+            },
+            "participant+window": lambda c, p, t, w: {
+                "participant": p,
+                "start_ms": t,
+                "end_ms": t + window_ms,
+            },
+            "word+conference": lambda c, p, t, w: {
+                "word": w,
+                "conference": c,
+            },
+            "word (limit 100)": lambda c, p, t, w: {"word": w, "limit": 100},
+            "window only": lambda c, p, t, w: {
+                "start_ms": t,
+                "end_ms": t + window_ms,
+            },
+        }
+        print(f"{'query':<30} {'p50 ms':>8} {'p99 ms':>8} {'avg hits':>9}")
+        for label, shape in shapes.items():
+            timings, hits = [], 0
+            for _ in range(args.queries):
+                query = shape(*pick())
+                t0 = time.perf_counter()
+                hits += len(index.search(**query))
+                timings.append((time.perf_counter() - t0) * 1000)
+            timings.sort()
+            print(
+                f"{label:<30} {statistics.median(timings):>8.2f} "
+                f"{timings[int(len(timings) * 0.99) - 1]:>8.2f} "
+                f"{hits / args.queries:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
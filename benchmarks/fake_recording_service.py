@@ -0,0 +1,233 @@
+"""Local stand-in for the JustCall recording download endpoint.
+
+``/api/create_s3presigned_url.php?recsid=<id>&redirect=1`` (JustCall) and
+``/2010-04-01/Accounts/<AC>/Recordings/<RE>.mp3`` (Twilio, with HTTP basic
+auth when ``--auth sid:token`` is given) answer with a 302 to a signed
+``/recordings/<id>.mp3?X-Amz-Signature=…`` URL, like the real services
+redirecting to S3. The recording URL serves deterministic
+bytes (``--size-kb`` per recording, seeded by the ID) and honours
+``Range: bytes=N-`` with 206 responses. ``--kbps`` throttles each
+connection, ``--latency-ms`` delays every response and ``--drop-at-kb``
+cuts the first transfer of each recording short, to exercise resumption.
+
+Usage::
+
+    python benchmarks/fake_recording_service.py --port 8780
+    python download_merge_recordings.py --ids RE1 RE2 --base-url \
+        "http://127.0.0.1:8780/api/create_s3presigned_url.php?recsid={}&isnew=1&redirect=1"
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import hmac
+import random
+import re
+import threading
+import time
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_SECRET = b"fake-recordings"
+_RANGE = re.compile(r"bytes=(\d+)-$")
+_TWILIO_MEDIA = re.compile(
+    r"/2010-04-01/Accounts/([^/]+)/Recordings/([^/.]+)\.(?:mp3|wav)"
+)
+
+
+@lru_cache(maxsize=64)
+def recording_bytes(recording_id: str, size: int) -> bytes:
+    """The body served for *recording_id*."""
+    return random.Random(recording_id).randbytes(size)
+
+
+def _signature(recording_id: str) -> str:
+    return hmac.new(_SECRET, recording_id.encode(), hashlib.sha256).hexdigest()
+
+
+class FakeRecordingService(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops SYNs under concurrent clients.
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        address,
+        size: int,
+        bytes_per_s: float = 0,
+        latency: float = 0,
+        drop_at: int = 0,
+        auth: str | None = None,
+    ):
+        super().__init__(address, _Handler)
+        self.authorization = (
+            "Basic " + base64.b64encode(auth.encode()).decode()
+            if auth
+            else None
+        )
+        self.size = size
+        self.bytes_per_s = bytes_per_s
+        self.latency = latency
+        self.drop_at = drop_at
+        self.requests = 0
+        self.range_requests = 0
+        self.bytes_sent = 0
+        self._dropped: set[str] = set()
+        self._lock = threading.Lock()
+
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return (
+            f"http://{host}:{port}/api/create_s3presigned_url.php"
+            "?recsid={}&isnew=1&redirect=1"
+        )
+
+    def twilio_recording_url(self, recording_id: str, account="AC0") -> str:
+        """The ``RecordingUrl`` Twilio would send for *recording_id*."""
+        host, port = self.server_address[:2]
+        return (
+            f"http://{host}:{port}/2010-04-01/Accounts/{account}"
+            f"/Recordings/{recording_id}"
+        )
+
+    def should_drop(self, recording_id: str) -> bool:
+        with self._lock:
+            if not self.drop_at or recording_id in self._dropped:
+                return False
+            self._dropped.add(recording_id)
+            return True
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeRecordingService
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+    def do_GET(self):  # noqa: N802
+        with self.server._lock:
+            self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        twilio = _TWILIO_MEDIA.fullmatch(url.path)
+        if (
+            twilio
+            and self.server.authorization
+            and (self.headers.get("Authorization") != self.server.authorization)
+        ):
+            return self._empty(401)
+        if twilio or url.path == "/api/create_s3presigned_url.php":
+            recording_id = (
+                twilio.group(2) if twilio else query.get("recsid", [""])[0]
+            )
+            if not recording_id:
+                return self._empty(400)
+            self.send_response(302)
+            self.send_header(
+                "Location",
+                f"/recordings/{recording_id}.mp3"
+                f"?X-Amz-Expires=300&X-Amz-Signature={_signature(recording_id)}",
+            )
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        match = re.fullmatch(r"/recordings/([^/]+)\.mp3", url.path)
+        if not match:
+            return self._empty(404)
+        recording_id = match.group(1)
+        if query.get("X-Amz-Signature", [""])[0] != _signature(recording_id):
+            return self._empty(403)
+        self._serve(recording_id)
+
+    def _empty(self, status: int) -> None:
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _serve(self, recording_id: str) -> None:
+        body = recording_bytes(recording_id, self.server.size)
+        start = 0
+        range_match = _RANGE.match(self.headers.get("Range", ""))
+        if range_match:
+            start = int(range_match.group(1))
+            if start >= len(body):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(body)}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            with self.server._lock:
+                self.server.range_requests += 1
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}"
+            )
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(len(body) - start))
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+
+        end = len(body)
+        if self.server.should_drop(recording_id):
+            end = min(end, start + self.server.drop_at)
+            self.close_connection = True
+        chunk = 1 << 14
+        rate = self.server.bytes_per_s
+        started = time.perf_counter()
+        sent = 0
+        for offset in range(start, end, chunk):
+            data = body[offset : min(offset + chunk, end)]
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            sent += len(data)
+            if rate:
+                ahead = sent / rate - (time.perf_counter() - started)
+                if ahead > 0:
+                    time.sleep(ahead)
+        with self.server._lock:
+            self.server.bytes_sent += sent
+
+
+def serve_in_thread(server: FakeRecordingService) -> threading.Thread:
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--size-kb", type=int, default=2048)
+    parser.add_argument("--kbps", type=float, default=0, help="0: unthrottled")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--drop-at-kb", type=int, default=0)
+    parser.add_argument("--auth", help="sid:token required on Twilio URLs")
+    args = parser.parse_args()
+    server = FakeRecordingService(
+        (args.host, args.port),
+        args.size_kb * 1024,
+        args.kbps * 1024,
+        args.latency_ms / 1000,
+        args.drop_at_kb * 1024,
+        args.auth,
+    )
+    print(f"Fake recording service: {server.base_url()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,14 @@ recordings/result.
 Usage (interactive):
     python src/download_merge_recordings.py
 
+Usage (download many recordings at once, optionally merging them in order):
+    python download_merge_recordings.py --ids RE1 RE2 RE3 --workers 8 --merge
+
+MP3 recordings with matching codec parameters are merged by concatenating
+their frames, and other inputs whose codec suits the output by ffmpeg's
+concat demuxer with ``-c copy``; only mismatched inputs are decoded and
+re-encoded.
+
 You need:
     - requests (pip install requests)
     - pydub   (pip install pydub)
@@ -18,17 +26,56 @@ from __future__ import annotations
 import argparse
 import datetime
 import os
+import re
+import shutil
+import subprocess
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 
 import requests
 import urllib3
 from pydub import AudioSegment
+from requests.adapters import HTTPAdapter
 
-BASE_URL = (
+BASE_URL = os.environ.get(
+    "RECORDINGS_BASE_URL",
     "https://callingservice.justcall.local/"
-    "api/create_s3presigned_url.php?recsid={}&isnew=1&redirect=1"
+    "api/create_s3presigned_url.php?recsid={}&isnew=1&redirect=1",
 )
+CHUNK_SIZE = 1 << 16
+DOWNLOAD_ATTEMPTS = 5
+PART_SUFFIX = ".part"
+
+_CONTENT_RANGE_TOTAL = re.compile(r"/(\d+)\s*$")
+
+MERGE_METHODS = ("frames", "ffmpeg-copy", "decode")
+# Codecs ffmpeg can stream-copy into each output container.
+_COPY_CODECS = {
+    ".mp3": ("mp3",),
+    ".m4a": ("aac",),
+    ".ogg": ("vorbis", "opus"),
+    ".opus": ("opus",),
+    ".flac": ("flac",),
+    ".wav": ("pcm_s16le", "pcm_u8", "pcm_mulaw", "pcm_alaw"),
+}
+
+# MPEG audio layer III tables, indexed by the header's version bits
+# (0: MPEG 2.5, 2: MPEG 2, 3: MPEG 1).
+_MP3_BITRATES_KBPS = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+_MP3_BITRATES_KBPS[0] = _MP3_BITRATES_KBPS[2]
+_MP3_SAMPLE_RATES = {
+    3: (44100, 48000, 32000),
+    2: (22050, 24000, 16000),
+    0: (11025, 12000, 8000),
+}
+_MP3_TRAILERS = (b"TAG", b"APETAGEX", b"LYRICSBEGIN")
 
 
 def ensure_directories() -> tuple[str, str]:
@@ -95,14 +142,421 @@ def download_recording(
     return file_path
 
 
-def merge_recordings(first_path: str, second_path: str, output_path: str):
-    print("Merging recordings...")
-    first_audio = AudioSegment.from_file(first_path)
-    second_audio = AudioSegment.from_file(second_path)
+class DownloadProgress:
+    """Thread-safe byte counter that prints a throughput line now and then."""
+
+    def __init__(self, total_files: int, interval: float = 1.0, out=None):
+        self.total_files = total_files
+        self.interval = interval
+        self.out = out
+        self.started = time.perf_counter()
+        self.bytes = 0
+        self.resumed_bytes = 0
+        self.done = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._last_report = self.started
+
+    def add(self, nbytes: int) -> None:
+        with self._lock:
+            self.bytes += nbytes
+            now = time.perf_counter()
+            if now - self._last_report < self.interval:
+                return
+            self._last_report = now
+        self.report()
+
+    def resumed(self, nbytes: int) -> None:
+        with self._lock:
+            self.resumed_bytes += nbytes
+
+    def finish(self, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.done += 1
+            else:
+                self.failed += 1
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self) -> float:
+        """Bytes per second transferred so far."""
+        return self.bytes / self.elapsed if self.elapsed else 0.0
+
+    def report(self, final: bool = False) -> None:
+        label = "Downloaded" if final else "Downloading"
+        print(
+            f"{label}: {self.done}/{self.total_files} recordings"
+            f"{f', {self.failed} failed' if self.failed else ''}, "
+            f"{self.bytes / 1e6:.1f} MB in {self.elapsed:.1f}s "
+            f"({self.rate / 1e6:.2f} MB/s)"
+            + (
+                f", {self.resumed_bytes / 1e6:.1f} MB resumed"
+                if self.resumed_bytes
+                else ""
+            ),
+            file=self.out or sys.stderr,
+        )
+
+
+def make_session(pool_size: int = 10, verify_ssl: bool = True):
+    """A requests.Session whose connection pool fits *pool_size* workers."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.verify = verify_ssl
+    return session
+
+
+def _resume_total(response: requests.Response) -> int | None:
+    match = _CONTENT_RANGE_TOTAL.search(
+        response.headers.get("Content-Range", "")
+    )
+    return int(match.group(1)) if match else None
+
+
+def stream_recording(
+    session: requests.Session,
+    recording_id: str,
+    destination_folder: str,
+    progress: DownloadProgress | None = None,
+    base_url: str | None = None,
+    attempts: int = DOWNLOAD_ATTEMPTS,
+) -> str:
+    """Download one recording to disk in chunks; return its path.
+
+    The body is written to ``<id>.part`` and renamed once complete. After a
+    dropped connection the presigned URL is requested again and the
+    transfer resumes from the bytes already on disk with an HTTP Range
+    request, up to *attempts* times.
+    """
+    url = (base_url or BASE_URL).format(recording_id)
+    part_path = os.path.join(destination_folder, recording_id + PART_SUFFIX)
+    for attempt in range(1, attempts + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        try:
+            with session.get(
+                url, headers=headers, stream=True, timeout=30
+            ) as response:
+                if response.status_code == 416:
+                    # Nothing left past our offset: the part is complete.
+                    if _resume_total(response) == offset:
+                        final_url = response.url
+                        break
+                    os.remove(part_path)
+                    continue
+                response.raise_for_status()
+                if offset and response.status_code == 206:
+                    mode = "ab"
+                    if progress:
+                        progress.resumed(offset)
+                else:
+                    mode = "wb"  # server ignored the Range: start over
+                with open(part_path, mode) as fp:
+                    for chunk in response.iter_content(CHUNK_SIZE):
+                        fp.write(chunk)
+                        if progress:
+                            progress.add(len(chunk))
+                final_url = response.url
+                break
+        except requests.exceptions.SSLError:
+            if not session.verify:
+                raise
+            print(
+                f"SSL verification failed for {recording_id}. Retrying without verification...",
+                file=sys.stderr,
+            )
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            session.verify = False
+        except (
+            requests.ConnectionError,
+            requests.Timeout,
+            requests.exceptions.ChunkedEncodingError,
+        ) as exc:
+            if attempt == attempts:
+                raise
+            print(
+                f"Download of {recording_id} interrupted ({exc}); resuming...",
+                file=sys.stderr,
+            )
+            time.sleep(min(0.25 * (2**attempt - 2), 5))
+    else:
+        raise requests.RequestException(
+            f"could not download {recording_id} in {attempts} attempts"
+        )
+
+    file_path = os.path.join(
+        destination_folder, f"{recording_id}{infer_extension(final_url)}"
+    )
+    os.replace(part_path, file_path)
+    return file_path
 
-    merged_audio = first_audio + second_audio
-    merged_audio.export(output_path, format="mp3")
-    print(f"Merged audio saved to {output_path}")
+
+def download_recordings(
+    recording_ids: list[str],
+    destination_folder: str,
+    workers: int = 4,
+    verify_ssl: bool = True,
+    base_url: str | None = None,
+    progress_interval: float = 1.0,
+) -> tuple[dict[str, str], dict[str, Exception]]:
+    """Download *recording_ids* concurrently over one pooled session.
+
+    Returns ``(paths, errors)`` keyed by recording ID.
+    """
+    progress = DownloadProgress(len(recording_ids), progress_interval)
+    paths: dict[str, str] = {}
+    errors: dict[str, Exception] = {}
+    with (
+        make_session(workers, verify_ssl) as session,
+        ThreadPoolExecutor(max_workers=workers) as pool,
+    ):
+        futures = {
+            pool.submit(
+                stream_recording,
+                session,
+                recording_id,
+                destination_folder,
+                progress,
+                base_url,
+            ): recording_id
+            for recording_id in dict.fromkeys(recording_ids)
+        }
+        for future in as_completed(futures):
+            recording_id = futures[future]
+            try:
+                paths[recording_id] = future.result()
+                progress.finish(True)
+            except (OSError, requests.RequestException) as exc:
+                errors[recording_id] = exc
+                progress.finish(False)
+                print(
+                    f"Failed to download recording {recording_id}: {exc}",
+                    file=sys.stderr,
+                )
+    progress.report(final=True)
+    return paths, errors
+
+
+def _mp3_header(header: bytes) -> tuple[tuple[int, int, int], int] | None:
+    """Parse a layer III frame header: ``((version, rate, mono), length)``."""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 3
+    layer = (header[1] >> 1) & 3
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 3
+    if version == 1 or layer != 1 or rate_index == 3:
+        return None
+    if bitrate_index in (0, 15):
+        return None  # free-format or invalid
+    bitrate = _MP3_BITRATES_KBPS[version][bitrate_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_index]
+    padding = (header[2] >> 1) & 1
+    samples = 144 if version == 3 else 72
+    mono = header[3] >> 6 == 3
+    length = samples * bitrate // sample_rate + padding
+    return (version, sample_rate, mono), length
+
+
+def _is_vbr_info_frame(frame: bytes, params: tuple[int, int, int]) -> bool:
+    version, _rate, mono = params
+    if version == 3:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    tag = frame[4 + side_info : 8 + side_info]
+    return tag in (b"Xing", b"Info") or frame[36:40] == b"VBRI"
+
+
+def mp3_frame_span(path: str) -> tuple[tuple[int, int, int], int, int] | None:
+    """Locate the MPEG audio frames of *path* without decoding them.
+
+    Returns ``(params, start, end)``: the codec parameters shared by every
+    frame and the byte range holding the frames, past any ID3v2 tag and
+    Xing/Info header frame and before ID3v1/APE trailers. Returns None if
+    the file is not a clean layer III stream with constant parameters.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as fp:
+        head = fp.read(10)
+        start = 0
+        if head[:3] == b"ID3" and len(head) == 10:
+            tag_size = (
+                (head[6] & 0x7F) << 21
+                | (head[7] & 0x7F) << 14
+                | (head[8] & 0x7F) << 7
+                | (head[9] & 0x7F)
+            )
+            start = 10 + tag_size + (10 if head[5] & 0x10 else 0)
+        fp.seek(start)
+        first = _mp3_header(fp.read(4))
+        if first is None:
+            return None
+        params, length = first
+        fp.seek(start)
+        if _is_vbr_info_frame(fp.read(min(length, 64)), params):
+            start += length
+        offset = start
+        while offset < size:
+            fp.seek(offset)
+            header = fp.read(4)
+            parsed = _mp3_header(header)
+            if parsed is None:
+                fp.seek(offset)
+                if fp.read(11).startswith(_MP3_TRAILERS):
+                    break
+                return None
+            if parsed[0] != params:
+                return None
+            if offset + parsed[1] > size:
+                break  # truncated last frame
+            offset += parsed[1]
+        if offset == start:
+            return None
+        return params, start, offset
+
+
+def _concat_mp3_frames(paths: list[str], output_path: str) -> bool:
+    spans = []
+    for path in paths:
+        span = mp3_frame_span(path)
+        if span is None or (spans and span[0] != spans[0][0]):
+            return False
+        spans.append(span)
+    with open(output_path, "wb") as out:
+        for path, (_params, start, end) in zip(paths, spans):
+            with open(path, "rb") as src:
+                src.seek(start)
+                remaining = end - start
+                while remaining:
+                    chunk = src.read(min(CHUNK_SIZE * 16, remaining))
+                    if not chunk:
+                        break
+                    out.write(chunk)
+                    remaining -= len(chunk)
+    return True
+
+
+def _probe_audio(path: str) -> tuple[str, int, int] | None:
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe is None:
+        return None
+    result = subprocess.run(
+        [
+            ffprobe,
+            "-v",
+            "error",
+            "-select_streams",
+            "a:0",
+            "-show_entries",
+            "stream=codec_name,sample_rate,channels",
+            "-of",
+            "csv=p=0",
+            path,
+        ],
+        capture_output=True,
+        text=True,
+    )
+    fields = result.stdout.strip().split(",")
+    if result.returncode or len(fields) != 3:
+        return None
+    codec, sample_rate, channels = fields
+    return codec, int(sample_rate), int(channels)
+
+
+def _concat_ffmpeg_copy(paths: list[str], output_path: str) -> bool:
+    ffmpeg = shutil.which("ffmpeg")
+    copyable = _COPY_CODECS.get(os.path.splitext(output_path)[1].lower(), ())
+    if ffmpeg is None or not copyable:
+        return False
+    probes = {_probe_audio(path) for path in paths}
+    if len(probes) != 1 or None in probes:
+        return False
+    codec, _rate, _channels = probes.pop()
+    if codec not in copyable:
+        return False
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", delete=False, encoding="utf-8"
+    ) as listing:
+        for path in paths:
+            quoted = os.path.abspath(path).replace("'", "'\\''")
+            listing.write(f"file '{quoted}'\n")
+    try:
+        result = subprocess.run(
+            [
+                ffmpeg,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-y",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                listing.name,
+                "-c",
+                "copy",
+                output_path,
+            ],
+            capture_output=True,
+            text=True,
+        )
+    finally:
+        os.remove(listing.name)
+    if result.returncode:
+        print(f"ffmpeg concat failed: {result.stderr.strip()}", file=sys.stderr)
+        return False
+    return True
+
+
+def _concat_decoded(paths: list[str], output_path: str) -> bool:
+    merged_audio = AudioSegment.empty()
+    for path in paths:
+        merged_audio += AudioSegment.from_file(path)
+    output_format = os.path.splitext(output_path)[1].lstrip(".") or "mp3"
+    merged_audio.export(output_path, format=output_format)
+    return True
+
+
+_MERGERS = {
+    "frames": _concat_mp3_frames,
+    "ffmpeg-copy": _concat_ffmpeg_copy,
+    "decode": _concat_decoded,
+}
+
+
+def merge_recordings(
+    paths: list[str],
+    output_path: str,
+    methods: tuple[str, ...] = MERGE_METHODS,
+) -> str:
+    """Concatenate *paths* in order into *output_path*; return the method.
+
+    Tries each of *methods* in turn: MP3 frame concatenation when every
+    input is MP3 with the same version, sample rate and channel mode, then
+    the ffmpeg concat demuxer with ``-c copy`` when every input has the same
+    codec parameters and that codec suits the output, then decoding with
+    pydub and re-encoding.
+    """
+    print("Merging recordings...")
+    tmp_path = f"{os.path.splitext(output_path)[0]}.tmp" + (
+        os.path.splitext(output_path)[1]
+    )
+    for method in methods:
+        if _MERGERS[method](paths, tmp_path):
+            os.replace(tmp_path, output_path)
+            print(f"Merged audio saved to {output_path} ({method})")
+            return method
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    raise ValueError(f"none of {methods} could merge {paths}")
 
 
 def parse_args() -> argparse.Namespace:
@@ -114,6 +568,29 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip SSL certificate verification when downloading recordings.",
     )
+    parser.add_argument(
+        "--ids",
+        nargs="+",
+        metavar="RECORDING_ID",
+        help="Download these recordings concurrently, without prompting.",
+    )
+    parser.add_argument(
+        "--merge",
+        action="store_true",
+        help="With --ids, also merge the recordings in the given order.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent downloads (default: 4).",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=BASE_URL,
+        help="Download URL template with {} for the recording ID "
+        "(default: $RECORDINGS_BASE_URL or the JustCall endpoint).",
+    )
     parser.add_argument(
         "--run-name",
         type=str,
@@ -129,6 +606,36 @@ def main():
     args = parse_args()
     base_source_dir, result_dir = ensure_directories()
 
+    if args.ids:
+        run_name = (args.run_name or "").strip() or (
+            datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        )
+        run_source_dir = os.path.join(base_source_dir, run_name)
+        os.makedirs(run_source_dir, exist_ok=True)
+        paths, errors = download_recordings(
+            args.ids,
+            run_source_dir,
+            workers=args.workers,
+            verify_ssl=not args.skip_ssl_verify,
+            base_url=args.base_url,
+        )
+        for recording_id in args.ids:
+            if recording_id in paths:
+                print(
+                    f"Downloaded recording {recording_id} -> {paths[recording_id]}"
+                )
+        if errors:
+            sys.exit(1)
+        if args.merge:
+            merge_recordings(
+                [
+                    paths[recording_id]
+                    for recording_id in dict.fromkeys(args.ids)
+                ],
+                os.path.join(result_dir, f"{run_name}.mp3"),
+            )
+        return
+
     first_id = input("Enter the FIRST recording_id: ").strip()
     second_id = input("Enter the SECOND recording_id: ").strip()
 
@@ -147,21 +654,21 @@ def main():
     run_source_dir = os.path.join(base_source_dir, run_name)
     os.makedirs(run_source_dir, exist_ok=True)
 
-    first_path = download_recording(
-        first_id,
-        run_source_dir,
-        verify_ssl=not args.skip_ssl_verify,
-    )
-    second_path = download_recording(
-        second_id,
+    paths, errors = download_recordings(
+        [first_id, second_id],
         run_source_dir,
+        workers=2,
         verify_ssl=not args.skip_ssl_verify,
+        base_url=args.base_url,
     )
+    if errors:
+        sys.exit(1)
+    first_path, second_path = paths[first_id], paths[second_id]
 
     output_filename = f"{run_name}.mp3"
     output_path = os.path.join(result_dir, output_filename)
 
-    merge_recordings(first_path, second_path, output_path)
+    merge_recordings([first_path, second_path], output_path)
 
 
 if __name__ == "__main__":
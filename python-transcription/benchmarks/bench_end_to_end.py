@@ -0,0 +1,312 @@
+"""End-to-end transcription benchmark against local stand-ins.
+
+Starts ``fake_deepgram.py`` and one ``live_transcription_server.py`` process,
+then replays increasing numbers of concurrent Twilio streams in real time
+(``replay_twilio.py``). For each level it reports the server's CPU use (in
+cores), streams per core, and transcript latency: from the moment the
+replayer sent the audio a word ends in to the moment that word's final
+result was appended to the server's ``transcripts/*.jsonl``.
+
+"Max streams/core" is the largest level at which the server stayed under
+``--cpu-limit`` of a core with p95 latency under ``--latency-limit-ms``.
+Linux only (CPU time is read from ``/proc``).
+
+Usage::
+
+    python python-transcription/benchmarks/bench_end_to_end.py \
+        --levels 10 50 100 200 --seconds 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+import replay_twilio  # noqa: E402
+
+SERVER = os.path.join(
+    os.path.dirname(BENCH_DIR), "live_transcription_server.py"
+)
+HOST = "127.0.0.1"
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind((HOST, 0))
+        return sock.getsockname()[1]
+
+
+def _cpu_seconds(pid: int) -> float:
+    with open(f"/proc/{pid}/stat") as fp:
+        fields = fp.read().rsplit(")", 1)[1].split()
+    # utime and stime are fields 14 and 15 of the full line.
+    return (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+
+
+def _get_json(port: int, path: str) -> dict:
+    with urllib.request.urlopen(f"http://{HOST}:{port}{path}", timeout=2) as r:
+        return json.loads(r.read())
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _TranscriptTail:
+    """Follow the server's transcript JSONL files and time each word.
+
+    Word times in the transcript are relative to the first forwarded frame;
+    its stream offset is ``transcript_epoch_ms - stream_start_epoch_ms``,
+    read from the control server's ``/stats`` while the stream is live.
+    """
+
+    def __init__(self, directory, control_port, sent_at, poll_s=0.005):
+        self.directory = directory
+        self.control_port = control_port
+        self.sent_at = sent_at
+        self.poll_s = poll_s
+        self.latencies: list[float] = []
+        self._offsets: dict[str, int] = {}
+        self._sids: dict[str, str] = {}
+        self._origins: dict[str, int] = {}
+        # Words seen before their stream's origin was known.
+        self._pending: list[tuple[str, float, float]] = []
+
+    def _refresh_origins(self) -> None:
+        for stream in _get_json(self.control_port, "/stats")["streams"]:
+            start = stream.get("stream_start_epoch_ms")
+            zero = stream.get("transcript_epoch_ms")
+            if start is not None and zero is not None:
+                self._origins[stream["stream_sid"]] = zero - start
+
+    def _record(self, sid: str, end_s: float, seen: float) -> bool:
+        origin = self._origins.get(sid)
+        sent = self.sent_at.get(sid)
+        if origin is None or not sent:
+            return False
+        frame = int((origin + end_s * 1000) // 20)
+        self.latencies.append(seen - sent[min(frame, len(sent) - 1)])
+        return True
+
+    def _read(self, path: str) -> None:
+        seen = time.perf_counter()
+        with open(path, encoding="utf-8") as fp:
+            fp.seek(self._offsets.get(path, 0))
+            chunk = fp.read()
+        complete = chunk[: chunk.rfind("\n") + 1]
+        self._offsets[path] = self._offsets.get(path, 0) + len(
+            complete.encode()
+        )
+        for line in complete.splitlines():
+            obj = json.loads(line)
+            if "metadata" in obj:
+                self._sids[path] = obj["metadata"].get("stream_sid")
+                continue
+            sid = self._sids.get(path)
+            # Journal records hold word end times in ns under "e".
+            for end_ns in obj.get("e", []):
+                end_s = end_ns / 1e9
+                if not self._record(sid, end_s, seen):
+                    self._pending.append((sid, end_s, seen))
+
+    async def run(self) -> None:
+        last_stats = 0.0
+        while True:
+            if time.perf_counter() - last_stats > 0.2:
+                try:
+                    await asyncio.to_thread(self._refresh_origins)
+                except OSError:
+                    pass
+                last_stats = time.perf_counter()
+                self._pending = [
+                    p for p in self._pending if not self._record(*p)
+                ]
+            for path in glob.glob(os.path.join(self.directory, "*.jsonl")):
+                try:
+                    self._read(path)
+                except FileNotFoundError:
+                    pass  # merged into .json between glob and open
+            await asyncio.sleep(self.poll_s)
+
+
+async def _run_level(args, level, recordings, ws_port, control_port, pids):
+    sent_at: dict[str, list[float]] = {}
+    tail = _TranscriptTail(
+        os.path.join(args.workdir, "transcripts"), control_port, sent_at
+    )
+    tail_task = asyncio.create_task(tail.run())
+    cpu_before = {name: _cpu_seconds(pid) for name, pid in pids.items()}
+    shed_before = _get_json(control_port, "/health")["shed_streams"]
+    started = time.perf_counter()
+    results = await replay_twilio.replay(
+        f"ws://{HOST}:{ws_port}",
+        recordings,
+        level,
+        args.speed,
+        args.flow,
+        sid_prefix=f"MZbench{level}x",
+        sent_at=sent_at,
+    )
+    wall = time.perf_counter() - started
+    cpu = {
+        name: (_cpu_seconds(pid) - cpu_before[name]) / wall
+        for name, pid in pids.items()
+    }
+    # Let the last final results land before stopping the tail.
+    await asyncio.sleep(1.5)
+    tail_task.cancel()
+    status = await asyncio.to_thread(_get_json, control_port, "/health")
+    frames = sum(r["frames"] for r in results)
+    return {
+        "streams": level,
+        "server_cores": cpu["server"],
+        "deepgram_cores": cpu["deepgram"],
+        "streams_per_core": level / cpu["server"] if cpu["server"] else 0,
+        "p50_ms": _percentile(tail.latencies, 0.5) * 1000,
+        "p95_ms": _percentile(tail.latencies, 0.95) * 1000,
+        "max_ms": max(tail.latencies, default=float("nan")) * 1000,
+        "words": len(tail.latencies),
+        "late_pct": 100
+        * sum(r["late_frames"] for r in results)
+        / max(frames, 1),
+        "shed": status["shed_streams"] - shed_before,
+    }
+
+
+def _wait_ready(control_port: int, process, timeout: float = 15) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("transcription server exited on startup")
+        try:
+            _get_json(control_port, "/health")
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("transcription server did not start")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--levels", type=int, nargs="+", default=[10, 25, 50, 100]
+    )
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--files", nargs="*", default=[])
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument(
+        "--flow", choices=("normal", "conference"), default="conference"
+    )
+    parser.add_argument("--dg-delay-ms", type=int, default=0)
+    parser.add_argument("--dg-handshake-ms", type=int, default=0)
+    parser.add_argument("--cpu-limit", type=float, default=0.8)
+    parser.add_argument("--latency-limit-ms", type=float, default=1500)
+    parser.add_argument(
+        "--workdir", default=None, help="server cwd (default: temp dir)"
+    )
+    args = parser.parse_args()
+    args.workdir = args.workdir or tempfile.mkdtemp(prefix="bench-e2e-")
+
+    recordings = [replay_twilio.load_ulaw(p) for p in args.files] or [
+        replay_twilio.synthesise(args.seconds)
+    ]
+    dg_port, ws_port, control_port = _free_port(), _free_port(), _free_port()
+    log = open(os.path.join(args.workdir, "server.log"), "w")  # noqa: SIM115
+    deepgram = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(BENCH_DIR, "fake_deepgram.py"),
+            "--port",
+            str(dg_port),
+            "--delay-ms",
+            str(args.dg_delay_ms),
+            "--handshake-ms",
+            str(args.dg_handshake_ms),
+        ],
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    server = subprocess.Popen(
+        [sys.executable, SERVER, "--workers", "1"],
+        cwd=args.workdir,
+        env={
+            **os.environ,
+            "DEEPGRAM_API_KEY": os.environ.get("DEEPGRAM_API_KEY", "bench"),
+            "DEEPGRAM_LIVE_URL": f"ws://{HOST}:{dg_port}/v1/listen",
+            "WEBSOCKET_HOST": HOST,
+            "WEBSOCKET_PORT": str(ws_port),
+            "CONTROL_HTTP_PORT": str(control_port),
+        },
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    try:
+        _wait_ready(control_port, server)
+        pids = {"server": server.pid, "deepgram": deepgram.pid}
+        print(
+            f"{args.flow} streams, {len(recordings)} recording(s), "
+            f"speed {args.speed}x, output in {args.workdir}\n"
+            f"{'streams':>7} {'cores':>6} {'dg':>5} {'str/core':>8} "
+            f"{'p50 ms':>7} {'p95 ms':>7} {'max ms':>7} {'words':>6} "
+            f"{'late%':>6} {'shed':>4}"
+        )
+        best = None
+        for level in args.levels:
+            row = asyncio.run(
+                _run_level(args, level, recordings, ws_port, control_port, pids)
+            )
+            print(
+                f"{row['streams']:>7} {row['server_cores']:>6.2f} "
+                f"{row['deepgram_cores']:>5.2f} "
+                f"{row['streams_per_core']:>8.0f} {row['p50_ms']:>7.0f} "
+                f"{row['p95_ms']:>7.0f} {row['max_ms']:>7.0f} "
+                f"{row['words']:>6} {row['late_pct']:>6.2f} {row['shed']:>4}"
+            )
+            if (
+                row["server_cores"] < args.cpu_limit
+                and row["p95_ms"] < args.latency_limit_ms
+                and row["shed"] == 0
+            ):
+                best = row
+        pools = _get_json(control_port, "/stats").get("deepgram_pools") or {}
+        for channels, pool in sorted(pools.items()):
+            print(
+                f"Deepgram pool ({channels} ch): {pool['hits']} hits / "
+                f"{pool['misses']} misses, {pool['latency_saved_ms']} ms of "
+                "handshakes saved"
+            )
+        if best is None:
+            print("No level met the CPU/latency limits.")
+        else:
+            print(
+                f"Max streams/core: {best['streams']} sustained "
+                f"({best['server_cores']:.2f} cores, p95 "
+                f"{best['p95_ms']:.0f} ms); ~{best['streams_per_core']:.0f} "
+                "extrapolated to a full core"
+            )
+    finally:
+        server.terminate()
+        deepgram.terminate()
+        server.wait(timeout=30)
+        deepgram.wait(timeout=5)
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
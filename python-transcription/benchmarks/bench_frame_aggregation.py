@@ -0,0 +1,152 @@
+"""Benchmark Deepgram send aggregation (``DG_AGGREGATE_MS``).
+
+Replays synthetic 20 ms μ-law frames for N concurrent streams through
+``_AudioBatcher`` into real WebSocket connections – the same queue + sender
+task shape as the server's Deepgram client – against a local sink server
+running in a separate process. Reports, per stream and per second of audio,
+the number of WebSocket sends, client CPU time and ``send(2)`` syscalls
+(counted on the client sockets).
+
+Usage::
+
+    python python-transcription/benchmarks/bench_frame_aggregation.py \
+        --streams 50 --seconds 60 --modes 0 100 250
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import websockets  # noqa: E402
+
+from live_transcription_server import (  # noqa: E402
+    FRAME_BYTES,
+    _AudioBatcher,
+)
+
+HOST = "127.0.0.1"
+
+logging.getLogger("websockets").setLevel(logging.WARNING)
+
+
+class _CountingSocket:
+    """Socket proxy that counts the send syscalls asyncio issues."""
+
+    calls = 0
+
+    def __init__(self, sock):
+        self._sock = sock
+
+    def send(self, *args):
+        _CountingSocket.calls += 1
+        return self._sock.send(*args)
+
+    def sendmsg(self, *args):
+        _CountingSocket.calls += 1
+        return self._sock.sendmsg(*args)
+
+    def __getattr__(self, name):
+        return getattr(self._sock, name)
+
+
+def _run_sink(port: int) -> None:
+    logging.getLogger("websockets").setLevel(logging.WARNING)
+
+    async def sink(websocket, *_):
+        async for _ in websocket:
+            pass
+
+    async def serve():
+        async with websockets.serve(sink, HOST, port, max_size=None):
+            await asyncio.Future()
+
+    asyncio.run(serve())
+
+
+async def _stream(port: int, frames: int, aggregate_ms: int) -> int:
+    queue: asyncio.Queue[bytes | None] = asyncio.Queue()
+    async with websockets.connect(f"ws://{HOST}:{port}") as ws:
+        # Selector transports write through ``_sock``; wrap it to count.
+        transport = ws.transport
+        transport._sock = _CountingSocket(transport._sock)
+
+        async def sender():
+            while (data := await queue.get()) is not None:
+                await ws.send(data)
+
+        task = asyncio.create_task(sender())
+        batcher = _AudioBatcher(queue.put_nowait, max_ms=aggregate_ms)
+        frame = bytes(range(FRAME_BYTES))
+        for i in range(frames):
+            batcher.add(frame)
+            if i % 50 == 0:
+                # Let the sender drain, as the real 20 ms cadence would.
+                await asyncio.sleep(0)
+        batcher.flush()
+        queue.put_nowait(None)
+        await task
+        return batcher.sends
+
+
+async def _run_mode(port: int, streams: int, seconds: int, aggregate_ms: int):
+    frames = seconds * 50
+    _CountingSocket.calls = 0
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    sends = await asyncio.gather(
+        *(_stream(port, frames, aggregate_ms) for _ in range(streams))
+    )
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    audio_seconds = streams * seconds
+    return {
+        "aggregate_ms": aggregate_ms,
+        "sends_per_stream_s": sum(sends) / audio_seconds,
+        "cpu_ms_per_stream_s": cpu * 1000 / audio_seconds,
+        "syscalls_per_stream_s": _CountingSocket.calls / audio_seconds,
+        "wall_s": wall,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--streams", type=int, default=20)
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--modes", type=int, nargs="+", default=[0, 100, 250])
+    args = parser.parse_args()
+
+    sink = multiprocessing.Process(
+        target=_run_sink, args=(args.port,), daemon=True
+    )
+    sink.start()
+    time.sleep(0.5)
+    try:
+        print(
+            f"{args.streams} streams × {args.seconds}s of audio\n"
+            f"{'aggregate':>10} {'sends/s':>9} {'cpu ms/s':>9} "
+            f"{'send(2)/s':>9} {'wall s':>7}"
+        )
+        for mode in args.modes:
+            result = asyncio.run(
+                _run_mode(args.port, args.streams, args.seconds, mode)
+            )
+            print(
+                f"{mode:>8}ms {result['sends_per_stream_s']:>9.1f} "
+                f"{result['cpu_ms_per_stream_s']:>9.3f} "
+                f"{result['syscalls_per_stream_s']:>9.1f} "
+                f"{result['wall_s']:>7.2f}"
+            )
+    finally:
+        sink.terminate()
+
+
+if __name__ == "__main__":
+    main()
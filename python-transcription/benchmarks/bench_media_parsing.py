@@ -0,0 +1,165 @@
+"""Replay benchmark for Twilio media message parsing.
+
+Replays recorded Twilio Media Stream messages (JSONL, one raw message per
+line – see ``TWILIO_CAPTURE_DIR`` in ``live_transcription_server.py``) through
+several parse paths and reports µs per message and how many streams one core
+could keep up with. Without ``--recording`` a 60 s two-track call is
+synthesised.
+
+Usage::
+
+    python python-transcription/benchmarks/bench_media_parsing.py \
+        --recording captures/MZ123.jsonl --mode conference
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import binascii
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import live_transcription_server as server  # noqa: E402
+
+FRAMES_PER_SECOND = 50
+
+
+def _synthesise(seconds: int) -> list[str]:
+    rng = random.Random(0)
+    messages = [
+        json.dumps(
+            {
+                "event": "start",
+                "streamSid": "MZbench",
+                "start": {"customParameters": {"call_flow_type": "normal"}},
+            },
+            separators=(",", ":"),
+        )
+    ]
+    for i in range(seconds * FRAMES_PER_SECOND):
+        for track in ("inbound", "outbound"):
+            payload = bytes(rng.getrandbits(8) for _ in range(160))
+            messages.append(
+                json.dumps(
+                    {
+                        "event": "media",
+                        "sequenceNumber": str(len(messages)),
+                        "media": {
+                            "track": track,
+                            "chunk": str(i + 1),
+                            "timestamp": str(i * 20),
+                            "payload": base64.b64encode(payload).decode(),
+                        },
+                        "streamSid": "MZbench",
+                    },
+                    separators=(",", ":"),
+                )
+            )
+    messages.append('{"event":"stop","streamSid":"MZbench"}')
+    return messages
+
+
+def _baseline(raw: str, conference: bool):
+    """The original loop body: full json.loads + base64.b64decode."""
+    msg = json.loads(raw)
+    if msg.get("event") != "media":
+        return None
+    media = msg.get("media", {})
+    if conference and media.get("track", "inbound") != "inbound":
+        return None
+    return base64.b64decode(media.get("payload"))
+
+
+def _dict_path(loads):
+    def parse(raw: str, conference: bool):
+        msg = loads(raw)
+        if msg.get("event") != "media":
+            return None
+        track, _, payload, _ = server._frame_from_dict(msg)
+        if conference and track != "inbound":
+            return None
+        return binascii.a2b_base64(payload)
+
+    return parse
+
+
+def _server_path(raw: str, conference: bool):
+    """What ``_twilio_media_handler`` does now (best available decoder)."""
+    if server._MEDIA_EVENT_MARKER not in raw:
+        server._loads(raw)
+        return None
+    if conference and server._OUTBOUND_TRACK_MARKER in raw:
+        return None
+    frame = server._parse_media(raw)
+    if frame is None or (conference and frame[0] != "inbound"):
+        return None
+    return binascii.a2b_base64(frame[2])
+
+
+def _paths():
+    paths = {
+        "json + b64decode (old)": _baseline,
+        "json + a2b_base64": _dict_path(json.loads),
+    }
+    if server.orjson is not None:
+        paths["orjson + a2b_base64"] = _dict_path(server.orjson.loads)
+    if server.msgspec is not None:
+        paths["msgspec + a2b_base64"] = _dict_path(server.msgspec.json.decode)
+    paths[
+        "server fast path"
+        + (" (msgspec)" if server.msgspec is not None else "")
+    ] = _server_path
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--recording", nargs="*", default=[], help="Captured JSONL stream(s)"
+    )
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument(
+        "--mode", choices=("normal", "conference"), default="conference"
+    )
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    messages: list[str] = []
+    for path in args.recording:
+        with open(path, encoding="utf-8") as fp:
+            messages.extend(line.rstrip("\n") for line in fp if line.strip())
+    if not messages:
+        messages = _synthesise(args.seconds)
+    conference = args.mode == "conference"
+    media_count = sum(server._MEDIA_EVENT_MARKER in m for m in messages)
+
+    print(
+        f"{len(messages)} messages ({media_count} media), mode={args.mode}\n"
+        f"{'path':<32} {'µs/msg':>8} {'streams/core':>13}"
+    )
+    baseline = None
+    for name, parse in _paths().items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            for raw in messages:
+                parse(raw, conference)
+            best = min(best, time.perf_counter() - started)
+        per_msg = best / len(messages)
+        # A stream delivers 50 frames/s per track (Twilio sends both).
+        streams = 1 / (per_msg * FRAMES_PER_SECOND * 2)
+        baseline = baseline or per_msg
+        print(
+            f"{name:<32} {per_msg * 1e6:>8.2f} {streams:>13.0f}"
+            f"  ({baseline / per_msg:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Local stand-in for Deepgram's live transcription WebSocket.
+
+Accepts the connection ``live_transcription_server.py`` opens
+(``/v1/listen?encoding=mulaw&sample_rate=8000…``) and answers with
+deterministic results: one word per ``--word-ms`` of received audio, named
+``t<offset_ms>`` after its start on Deepgram's clock, an interim result for
+every audio message and a final result every ``--final-ms``. ``CloseStream``
+flushes the remainder, sends ``Metadata`` and closes, like the real service.
+``--delay-ms`` holds every response back to model recognition latency and
+``--handshake-ms`` delays each connection to model TLS/WebSocket setup.
+With ``multichannel=true`` every result is repeated for each channel, tagged
+with its ``channel_index``.
+
+Usage::
+
+    python python-transcription/benchmarks/fake_deepgram.py --port 8766
+    DEEPGRAM_API_KEY=x DEEPGRAM_LIVE_URL=ws://127.0.0.1:8766/v1/listen \
+        python python-transcription/live_transcription_server.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+import urllib.parse
+
+import websockets
+
+# Bytes per sample for the encodings the server may request.
+_SAMPLE_WIDTH = {"mulaw": 1, "alaw": 1, "linear16": 2}
+
+
+def _results(
+    start_ms: int,
+    end_ms: int,
+    word_ms: int,
+    is_final: bool,
+    channel: int = 0,
+    channels: int = 1,
+) -> str:
+    """Return a ``Results`` message covering ``[start_ms, end_ms)``."""
+    first = -(-start_ms // word_ms) * word_ms
+    words = [
+        {
+            "word": f"t{offset}",
+            "start": offset / 1000,
+            "end": (offset + word_ms * 4 // 5) / 1000,
+            "confidence": 1.0,
+            "punctuated_word": f"t{offset}",
+        }
+        for offset in range(first, end_ms, word_ms)
+    ]
+    return json.dumps(
+        {
+            "type": "Results",
+            "channel_index": [channel, channels],
+            "duration": (end_ms - start_ms) / 1000,
+            "start": start_ms / 1000,
+            "is_final": is_final,
+            "speech_final": is_final,
+            "channel": {
+                "alternatives": [
+                    {
+                        "transcript": " ".join(w["word"] for w in words),
+                        "confidence": 1.0,
+                        "words": words,
+                    }
+                ]
+            },
+        }
+    )
+
+
+class FakeDeepgram:
+    """Serve deterministic live-transcription sessions."""
+
+    def __init__(
+        self,
+        word_ms: int = 300,
+        final_ms: int = 1000,
+        delay_ms: int = 0,
+        handshake_ms: int = 0,
+    ):
+        self.word_ms = word_ms
+        self.final_ms = final_ms
+        self.delay = delay_ms / 1000
+        self.handshake = handshake_ms / 1000
+        self.sessions = 0
+        self.audio_bytes = 0
+
+    async def _sender(self, websocket, outbox: asyncio.Queue) -> None:
+        while (item := await outbox.get()) is not None:
+            due, message = item
+            if (wait := due - time.monotonic()) > 0:
+                await asyncio.sleep(wait)
+            await websocket.send(message)
+
+    async def session(self, websocket, path: str | None = None) -> None:
+        query = urllib.parse.parse_qs(
+            urllib.parse.urlsplit(path or websocket.path).query
+        )
+        bytes_per_ms = (
+            int(query.get("sample_rate", ["8000"])[0])
+            * int(query.get("channels", ["1"])[0])
+            * _SAMPLE_WIDTH.get(query.get("encoding", ["mulaw"])[0], 1)
+            / 1000
+        )
+        channels = (
+            int(query.get("channels", ["1"])[0])
+            if query.get("multichannel", ["false"])[0] == "true"
+            else 1
+        )
+        self.sessions += 1
+        outbox: asyncio.Queue = asyncio.Queue()
+        sender = asyncio.create_task(self._sender(websocket, outbox))
+
+        def emit(start_ms: int, end_ms: int, is_final: bool) -> None:
+            due = time.monotonic() + self.delay
+            for channel in range(channels):
+                message = _results(
+                    start_ms, end_ms, self.word_ms, is_final, channel, channels
+                )
+                outbox.put_nowait((due, message))
+
+        received = 0
+        finalised_ms = 0
+        try:
+            async for message in websocket:
+                if isinstance(message, str):
+                    if json.loads(message).get("type") == "CloseStream":
+                        break
+                    continue  # KeepAlive
+                received += len(message)
+                self.audio_bytes += len(message)
+                heard_ms = int(received / bytes_per_ms)
+                while heard_ms - finalised_ms >= self.final_ms:
+                    emit(finalised_ms, finalised_ms + self.final_ms, True)
+                    finalised_ms += self.final_ms
+                if heard_ms > finalised_ms:
+                    emit(finalised_ms, heard_ms, False)
+            heard_ms = int(received / bytes_per_ms)
+            if heard_ms > finalised_ms:
+                emit(finalised_ms, heard_ms, True)
+            outbox.put_nowait(
+                (
+                    time.monotonic() + self.delay,
+                    json.dumps(
+                        {
+                            "type": "Metadata",
+                            "request_id": f"fake-{self.sessions}",
+                            "duration": heard_ms / 1000,
+                            "channels": channels,
+                        }
+                    ),
+                )
+            )
+            outbox.put_nowait(None)
+            await sender
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            sender.cancel()
+
+    async def process_request(self, path, headers):
+        # Runs before the upgrade response, like a slow TLS handshake.
+        await asyncio.sleep(self.handshake)
+
+
+async def serve(host: str, port: int, fake: FakeDeepgram) -> None:
+    async with websockets.serve(
+        fake.session,
+        host,
+        port,
+        max_size=None,
+        process_request=fake.process_request,
+    ):
+        logging.info("Fake Deepgram listening on ws://%s:%s", host, port)
+        await asyncio.Future()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--word-ms", type=int, default=300)
+    parser.add_argument("--final-ms", type=int, default=1000)
+    parser.add_argument("--delay-ms", type=int, default=0)
+    parser.add_argument("--handshake-ms", type=int, default=0)
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s"
+    )
+    logging.getLogger("websockets").setLevel(logging.WARNING)
+    fake = FakeDeepgram(
+        args.word_ms, args.final_ms, args.delay_ms, args.handshake_ms
+    )
+    try:
+        asyncio.run(serve(args.host, args.port, fake))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
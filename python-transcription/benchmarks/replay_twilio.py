@@ -0,0 +1,302 @@
+"""Replay Twilio Media Streams into the transcription server.
+
+Opens N concurrent WebSocket connections that speak Twilio's Media Streams
+protocol (``twilio`` subprotocol; ``connected``, ``start``, ``media`` and
+``stop`` events) and streams 8 kHz μ-law audio from recorded files – raw
+μ-law (``.ulaw``/``.raw``) or WAV (μ-law or 16-bit PCM) – or, without
+files, a synthesised talk/pause pattern. ``--speed 1`` paces 20 ms frames in
+real time, higher values replay faster and ``0`` as fast as possible.
+
+Usage::
+
+    python python-transcription/benchmarks/replay_twilio.py \
+        --url ws://127.0.0.1:6789 --streams 20 --files call1.ulaw call2.wav
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import json
+import logging
+import os
+import struct
+import time
+
+import numpy as np
+import websockets
+
+SAMPLE_RATE = 8000
+FRAME_BYTES = 160
+FRAME_S = FRAME_BYTES / SAMPLE_RATE
+
+logging.getLogger("websockets").setLevel(logging.WARNING)
+
+
+def linear_to_ulaw(pcm: np.ndarray) -> bytes:
+    """Encode 16-bit linear PCM as G.711 μ-law."""
+    pcm = pcm.astype(np.int32)
+    sign = np.where(pcm < 0, 0x80, 0)
+    magnitude = np.minimum(np.abs(pcm), 32635) + 0x84
+    exponent = np.floor(np.log2(magnitude)).astype(np.int32) - 7
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    return (
+        (~(sign | (exponent << 4) | mantissa) & 0xFF).astype(np.uint8).tobytes()
+    )
+
+
+def _read_wav(path: str) -> bytes:
+    with open(path, "rb") as fp:
+        data = fp.read()
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        raise ValueError(f"{path} is not a WAV file")
+    fmt = audio = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id, size = struct.unpack_from("<4sI", data, pos)
+        body = data[pos + 8 : pos + 8 + size]
+        if chunk_id == b"fmt ":
+            fmt = struct.unpack_from("<HHIIHH", body)
+        elif chunk_id == b"data":
+            audio = body
+        pos += 8 + size + (size & 1)
+    if fmt is None or audio is None:
+        raise ValueError(f"{path} has no fmt/data chunk")
+    tag, channels, rate, _, _, bits = fmt
+    if rate != SAMPLE_RATE or channels != 1:
+        raise ValueError(
+            f"{path} must be 8 kHz mono (got {rate} Hz × {channels})"
+        )
+    if tag == 7:  # WAVE_FORMAT_MULAW
+        return audio
+    if tag == 1 and bits == 16:
+        return linear_to_ulaw(np.frombuffer(audio, dtype="<i2"))
+    raise ValueError(f"{path}: unsupported WAV format {tag}/{bits}-bit")
+
+
+def load_ulaw(path: str) -> bytes:
+    """Return the μ-law samples of a recording."""
+    if path.lower().endswith(".wav"):
+        return _read_wav(path)
+    with open(path, "rb") as fp:
+        return fp.read()
+
+
+def synthesise(seconds: float, seed: int = 0) -> bytes:
+    """Alternate 1.5 s of voiced sound with 1 s of quiet line noise."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 120 + 40 * np.sin(2 * np.pi * 0.7 * t)
+    voiced = sum(
+        np.sin(2 * np.pi * k * np.cumsum(pitch) / SAMPLE_RATE) / k
+        for k in range(1, 6)
+    ) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t) ** 2)
+    talking = (t % 2.5) < 1.5
+    pcm = np.where(talking, 6000 * voiced, 0) + rng.normal(0, 40, len(t))
+    return linear_to_ulaw(np.clip(pcm, -32768, 32767))
+
+
+def frame_payloads(audio: bytes) -> list[str]:
+    """Split μ-law audio into base64 payloads of one 20 ms frame each."""
+    pad = -len(audio) % FRAME_BYTES
+    audio += b"\xff" * pad  # μ-law silence
+    return [
+        base64.b64encode(audio[i : i + FRAME_BYTES]).decode()
+        for i in range(0, len(audio), FRAME_BYTES)
+    ]
+
+
+def _dumps(obj: dict) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
+
+async def replay_stream(
+    url: str,
+    stream_sid: str,
+    payloads: list[str],
+    speed: float = 1.0,
+    custom_parameters: dict | None = None,
+    outbound: list[str] | None = None,
+    sent_at: list[float] | None = None,
+    start_delay: float = 0.0,
+) -> dict:
+    """Stream *payloads* as one Twilio call; return pacing statistics.
+
+    The ``time.perf_counter()`` at which each inbound frame went out is
+    appended to *sent_at* (frame *i* covers ``[20·i, 20·i + 20)`` ms).
+    """
+    sent_at = [] if sent_at is None else sent_at
+    call_sid = "CA" + stream_sid[2:]
+    await asyncio.sleep(start_delay)
+    # Twilio doesn't negotiate permessage-deflate; neither do we.
+    async with websockets.connect(
+        url,
+        subprotocols=["twilio"],
+        ping_interval=None,
+        max_size=None,
+        compression=None,
+    ) as ws:
+        await ws.send(
+            _dumps(
+                {
+                    "event": "connected",
+                    "protocol": "Call",
+                    "version": "1.0.0",
+                }
+            )
+        )
+        await ws.send(
+            _dumps(
+                {
+                    "event": "start",
+                    "sequenceNumber": "1",
+                    "start": {
+                        "accountSid": "ACreplay",
+                        "streamSid": stream_sid,
+                        "callSid": call_sid,
+                        "tracks": (
+                            ["inbound", "outbound"] if outbound else ["inbound"]
+                        ),
+                        "customParameters": custom_parameters or {},
+                        "mediaFormat": {
+                            "encoding": "audio/x-mulaw",
+                            "sampleRate": SAMPLE_RATE,
+                            "channels": 1,
+                        },
+                    },
+                    "streamSid": stream_sid,
+                }
+            )
+        )
+        seq = 1
+        late = 0
+        started = time.perf_counter()
+        step = FRAME_S / speed if speed > 0 else 0.0
+        for i, payload in enumerate(payloads):
+            if step:
+                due = started + i * step
+                wait = due - time.perf_counter()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                elif wait < -FRAME_S:
+                    late += 1
+            tracks = [("inbound", payload)]
+            if outbound:
+                tracks.append(("outbound", outbound[i % len(outbound)]))
+            for track, data in tracks:
+                seq += 1
+                # Formatted by hand: the replayer must stay cheaper than the
+                # server it is measuring.
+                await ws.send(
+                    '{"event":"media","sequenceNumber":"%d","media":'
+                    '{"track":"%s","chunk":"%d","timestamp":"%d",'
+                    '"payload":"%s"},"streamSid":"%s"}'
+                    % (seq, track, i + 1, i * 20, data, stream_sid)
+                )
+            sent_at.append(time.perf_counter())
+            if not step and i % 50 == 0:
+                await asyncio.sleep(0)
+        await ws.send(
+            _dumps(
+                {
+                    "event": "stop",
+                    "sequenceNumber": str(seq + 1),
+                    "streamSid": stream_sid,
+                    "stop": {"accountSid": "ACreplay", "callSid": call_sid},
+                }
+            )
+        )
+    return {
+        "stream_sid": stream_sid,
+        "frames": len(payloads),
+        "late_frames": late,
+        "wall_s": time.perf_counter() - started,
+    }
+
+
+async def replay(
+    url: str,
+    recordings: list[bytes],
+    streams: int,
+    speed: float = 1.0,
+    call_flow_type: str = "conference",
+    sid_prefix: str = "MZreplay",
+    sent_at: dict[str, list[float]] | None = None,
+) -> list[dict]:
+    """Run *streams* concurrent calls, cycling through *recordings*.
+
+    Starts are spread over one frame so the streams don't tick in lockstep.
+    *sent_at*, when given, is filled with each stream's frame send times.
+    """
+    payloads = [frame_payloads(audio) for audio in recordings]
+    sent_at = {} if sent_at is None else sent_at
+    tasks = []
+    for n in range(streams):
+        sid = f"{sid_prefix}{n:05d}"
+        frames = payloads[n % len(payloads)]
+        params = {"call_flow_type": call_flow_type}
+        outbound = None
+        if call_flow_type == "conference":
+            params["track1_label"] = f"participant{n}"
+        else:
+            params["track0_label"] = f"callee{n}"
+            params["track1_label"] = f"caller{n}"
+            # The far end: the same audio, half a recording later.
+            half = len(frames) // 2
+            outbound = frames[half:] + frames[:half]
+        sent_at[sid] = []
+        tasks.append(
+            replay_stream(
+                url,
+                sid,
+                frames,
+                speed,
+                params,
+                outbound,
+                sent_at[sid],
+                start_delay=FRAME_S * n / max(streams, 1),
+            )
+        )
+    return await asyncio.gather(*tasks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="ws://127.0.0.1:6789")
+    parser.add_argument("--streams", type=int, default=10)
+    parser.add_argument("--files", nargs="*", default=[])
+    parser.add_argument(
+        "--seconds", type=float, default=30, help="synthesised audio length"
+    )
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument(
+        "--flow", choices=("normal", "conference"), default="conference"
+    )
+    args = parser.parse_args()
+
+    recordings = [load_ulaw(path) for path in args.files] or [
+        synthesise(args.seconds)
+    ]
+    started = time.perf_counter()
+    results = asyncio.run(
+        replay(
+            args.url,
+            recordings,
+            args.streams,
+            args.speed,
+            args.flow,
+            sid_prefix=f"MZreplay{os.getpid()}x",
+        )
+    )
+    frames = sum(r["frames"] for r in results)
+    late = sum(r["late_frames"] for r in results)
+    print(
+        f"{len(results)} streams, {frames} frames in "
+        f"{time.perf_counter() - started:.1f}s, "
+        f"{late} frames sent >20 ms late"
+    )
+
+
+if __name__ == "__main__":
+    main()
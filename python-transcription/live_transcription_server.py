@@ -8,8 +8,15 @@ Key features
    sent in Twilio's <Start><Stream> element:
 
    • ``normal``      – transcribe *both* tracks (inbound/outbound) that share the
-     single Twilio stream.  The transcript JSON will be written to
-     ``transcripts/normal-<epoch_ms>.json``.
+     single Twilio stream.  The tracks are paired by Twilio ``timestamp`` and
+     sent as one 2-channel ``multichannel`` Deepgram session, giving one
+     transcript per speaker::
+
+         transcripts/normal_<track1_label>-<epoch_ms>.json   (inbound, caller)
+         transcripts/normal_<track0_label>-<epoch_ms>.json   (outbound, callee)
+
+     With ``NORMAL_FLOW_MULTICHANNEL=false`` both tracks are mixed into one
+     mono session and ``transcripts/normal-<epoch_ms>.json``.
 
    • ``conference``  – Twilio opens an individual Media Stream per participant.
      For these streams only *inbound* audio is transcribed so that we keep each
@@ -18,33 +25,138 @@ Key features
 
          transcripts/<participant>-<epoch_ms>.json
 
+     ``scripts/merge_conference_transcripts.py`` merges a conference's files
+     (matched on the ``conference_name`` stream parameter) into one timeline.
+
 2. Produces a single JSON file per stream containing **every word** returned by
    Deepgram.  Each word is annotated with timing at *nanosecond* precision
-   relative to the beginning of the stream (`0s 0ns`).
+   relative to the beginning of the stream (`0s 0ns`).  Final results are
+   appended to ``<name>.jsonl`` as they arrive and merged into ``<name>.json``
+   when the stream closes; files orphaned by a crash are merged on startup.
+   Frames pass through a small jitter buffer keyed on Twilio's ``timestamp``
+   (``JITTER_BUFFER_MS``): reordered frames are put back in order, lost ones
+   become silence and late duplicates are dropped, so word times stay on the
+   stream's sample clock – aligned with the call recording without running
+   ``scripts/adjust_json_timestamps.py``.
 
 3. Designed to be standalone – no external helpers, global state, or Flask/FastAPI
    integration.  Run the module directly to start an asyncio WebSocket server
-   that Twilio connects to, as well as a minimal HTTP endpoint that can be used
-   for health-checks if desired.
+   that Twilio connects to, as well as the control HTTP server (see 6).
+
+4. ``--workers N`` (or ``TRANSCRIPTION_WORKERS``) starts a supervisor that runs
+   N worker processes sharing ``WEBSOCKET_PORT`` through ``SO_REUSEPORT``.  The
+   supervisor health-checks every worker, replaces dead or unresponsive ones,
+   performs a rolling restart on ``SIGHUP`` (the replacement starts before the
+   old worker drains its live streams) and serves the combined ``/health`` and
+   ``/stats`` on ``CONTROL_HTTP_PORT``.
+
+5. Every buffer between Twilio, Deepgram and the transcript writer is
+   bounded.  Audio waiting for a slow Deepgram socket is coalesced into
+   larger messages; past ``DG_MAX_BACKLOG_MS`` the stream is shed (closed,
+   its transcript kept and marked ``"shed"``).  Interim results are dropped
+   when the transcript queue is full, while final results wait – which stops
+   reading from Deepgram instead of growing memory.
+
+6. The control HTTP server (``CONTROL_HTTP_PORT``) runs on the same event
+   loop as the media handlers and only reads counters they keep:
+
+   • ``GET /health``    – liveness, worker identity, live stream count.
+   • ``GET /stats``     – per live stream: frames in/out, bytes forwarded to
+     Deepgram, silence ratio, Deepgram lag, queue depths, approx. memory.
+   • ``POST /set_start`` – ``{"stream_sid": ..., "epoch_ms": ...}`` re-anchors
+     a live stream's start epoch; ``transcript_epoch_ms`` in its transcript
+     metadata moves with it.
+   • ``GET /search``    – ``?conference=&participant=&start_ms=&end_ms=&word=``
+     looks words up in the transcript index (see 7).
+
+7. Every transcript written is added to the word index in
+   ``TRANSCRIPT_INDEX_DIR`` (``scripts/transcript_index.py``, which also
+   offers the same search and a backfill of older transcripts on the
+   command line). Indexing is skipped when that module cannot be imported.
+
+8. Final results (and interim ones with ``LIVE_TRANSCRIPTS_INTERIM``) are
+   published as they arrive, one UDP datagram per segment, to
+   ``LIVE_TRANSCRIPTS_ADDR``. The Flask app's ``src/transcript_relay.py``
+   receives them and pushes them to the browser dialers over Socket.IO.
+   Publishing never blocks the stream: a segment that cannot be sent is
+   dropped and counted.
 
 Environment variables (see ``env.example``):
     DEEPGRAM_API_KEY   – your Deepgram API key (REQUIRED)
     WEBSOCKET_HOST     – IP/interface to bind the WebSocket server (default 0.0.0.0)
     WEBSOCKET_PORT     – Port for the WebSocket server (default 6789)
-    CONTROL_HTTP_PORT  – Port for the lightweight aiohttp server (default 4567)
+    CONTROL_HTTP_PORT  – Port for the control HTTP server (default 4567)
+    TRANSCRIPTION_WORKERS – Worker processes; >1 enables the supervisor
+                         (default 1)
+    WORKER_DRAIN_TIMEOUT_S – How long a draining worker waits for its live
+                         streams to end before closing them (default 900)
+    WORKER_HEALTH_INTERVAL_S – Supervisor health-check period (default 5)
+    VAD_ENABLED        – Gate silence/noise before Deepgram (default true)
+    VAD_THRESHOLD_DB   – Minimum frame energy treated as speech (default -50)
+    VAD_HANGOVER_MS    – Audio kept flowing after speech ends (default 400)
+    VAD_PREROLL_MS     – Audio replayed before a speech onset (default 100)
+    DG_KEEPALIVE_S     – KeepAlive interval while audio is gated (default 5)
+    DG_AGGREGATE_MS    – Audio coalesced per Deepgram send, and frames the
+                         VAD decides at once; 0 sends (and gates) every
+                         20 ms Twilio frame on its own (default 100)
+    DEEPGRAM_LIVE_URL  – Deepgram live endpoint
+                         (default wss://api.deepgram.com/v1/listen); point it
+                         at ``benchmarks/fake_deepgram.py`` to run offline
+    DG_MAX_BACKLOG_MS  – Audio allowed to queue for a slow Deepgram socket
+                         before the stream is shed (default 10000)
+    TRANSCRIPT_QUEUE_MAX – Results buffered for the transcript writer;
+                         interim results are dropped beyond it (default 64)
+    NORMAL_FLOW_MULTICHANNEL – Transcribe ``normal`` streams as two
+                         Deepgram channels, one per track (default true)
+    JITTER_BUFFER_MS   – How long a missing Twilio frame is waited for before
+                         it is filled with silence; reordered frames within
+                         this window are put back in order (default 60)
+    TRANSCRIPT_EPOCH_TIMES – Write word times as absolute epoch
+                         (``adjust_json_timestamps.py`` format) instead of
+                         relative to the stream (default false)
+    DG_POOL_SIZE       – Deepgram sessions kept connected ahead of stream
+                         starts, per worker and channel layout; 0 disables
+                         (default 2)
+    DG_POOL_IDLE_S     – Recycle a prewarmed session after this long
+                         unused (default 60)
+    TWILIO_CAPTURE_DIR – When set, raw Twilio messages are recorded to
+                         ``<dir>/<streamSid>.jsonl`` for replay benchmarks
+    TRANSCRIPT_BINARY  – Also write each transcript as a compact
+                         ``<name>.tbin`` (``scripts/transcript_binary.py``)
+                         next to the JSON (default false)
+    TRANSCRIPT_INDEX_DIR – Word index of the transcripts; empty disables
+                         (default transcripts/index)
+    LIVE_TRANSCRIPTS_ADDR – ``host:port`` live segments are sent to (see 8);
+                         empty disables (default 127.0.0.1:5679)
+    LIVE_TRANSCRIPTS_INTERIM – Also publish interim results (default false)
+
+Optional speed-ups: with ``msgspec`` (or ``orjson``) installed, media frames
+are decoded through a typed fast path instead of ``json``.
 """
 
 from __future__ import annotations
 
+import argparse
 import asyncio
-import base64
+import binascii
+import bisect
+import fcntl
+import glob
 import json
 import logging
+import multiprocessing
 import os
 import re
+import signal
+import socket
+import sys
 import time
-from typing import Any, cast
+import urllib.parse
+from array import array
+from collections import deque
+from typing import Any, TextIO, cast
 
+import numpy as np
 from dotenv import load_dotenv
 
 # websockets ≥10 renamed the sub-module; fall back for older versions.
@@ -59,7 +171,35 @@ except ImportError:  # pragma: no cover
         serve,
     )
 
-from deepgram import Deepgram
+# Same version split for the client side (Deepgram live connection).
+try:
+    from websockets.client import connect  # type: ignore[attr-defined]
+except ImportError:  # pragma: no cover
+    from websockets.legacy.client import connect  # type: ignore[attr-defined]
+from websockets.exceptions import ConnectionClosed
+
+# Faster JSON decoding for the per-frame hot path; both are optional.
+try:
+    import msgspec
+except ImportError:  # pragma: no cover
+    msgspec = None  # type: ignore[assignment]
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+# The transcript word index and binary format live with the transcript
+# scripts.
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+)
+try:
+    import transcript_index
+except ImportError:  # pragma: no cover
+    transcript_index = None  # type: ignore[assignment]
+try:
+    import transcript_binary
+except ImportError:  # pragma: no cover
+    transcript_binary = None  # type: ignore[assignment]
 
 ###############################################################################
 # Configuration & helpers
@@ -68,14 +208,78 @@ from deepgram import Deepgram
 load_dotenv()
 
 DEEPGRAM_API_KEY: str | None = os.getenv("DEEPGRAM_API_KEY")
-if not DEEPGRAM_API_KEY:
-    raise OSError(
-        "DEEPGRAM_API_KEY environment variable not set. Please export it first."
-    )
 
 WEBSOCKET_HOST: str = os.getenv("WEBSOCKET_HOST", "0.0.0.0")
 WEBSOCKET_PORT: int = int(os.getenv("WEBSOCKET_PORT", "6789"))
 CONTROL_HTTP_PORT: int = int(os.getenv("CONTROL_HTTP_PORT", "4567"))
+TRANSCRIPTION_WORKERS: int = int(os.getenv("TRANSCRIPTION_WORKERS", "1"))
+WORKER_DRAIN_TIMEOUT_S: float = float(
+    os.getenv("WORKER_DRAIN_TIMEOUT_S", "900")
+)
+WORKER_HEALTH_INTERVAL_S: float = float(
+    os.getenv("WORKER_HEALTH_INTERVAL_S", "5")
+)
+# Consecutive failed health checks before a worker is replaced.
+WORKER_MAX_HEALTH_FAILURES: int = 3
+WORKER_START_TIMEOUT_S: float = 30.0
+
+VAD_ENABLED: bool = os.getenv("VAD_ENABLED", "true").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+VAD_THRESHOLD_DB: float = float(os.getenv("VAD_THRESHOLD_DB", "-50"))
+VAD_HANGOVER_MS: int = int(os.getenv("VAD_HANGOVER_MS", "400"))
+VAD_PREROLL_MS: int = int(os.getenv("VAD_PREROLL_MS", "100"))
+DG_KEEPALIVE_S: float = float(os.getenv("DG_KEEPALIVE_S", "5"))
+DG_AGGREGATE_MS: int = int(os.getenv("DG_AGGREGATE_MS", "100"))
+DEEPGRAM_LIVE_URL: str = os.getenv(
+    "DEEPGRAM_LIVE_URL", "wss://api.deepgram.com/v1/listen"
+)
+DG_MAX_BACKLOG_MS: int = int(os.getenv("DG_MAX_BACKLOG_MS", "10000"))
+TRANSCRIPT_QUEUE_MAX: int = int(os.getenv("TRANSCRIPT_QUEUE_MAX", "64"))
+NORMAL_FLOW_MULTICHANNEL: bool = os.getenv(
+    "NORMAL_FLOW_MULTICHANNEL", "true"
+).lower() in ("true", "1", "yes")
+JITTER_BUFFER_MS: int = int(os.getenv("JITTER_BUFFER_MS", "60"))
+# Longest loss filled with silence; longer outages become timeline gaps.
+JITTER_MAX_FILL_MS: int = 1000
+DG_POOL_SIZE: int = int(os.getenv("DG_POOL_SIZE", "2"))
+DG_POOL_IDLE_S: float = float(os.getenv("DG_POOL_IDLE_S", "60"))
+TRANSCRIPT_EPOCH_TIMES: bool = os.getenv(
+    "TRANSCRIPT_EPOCH_TIMES", "false"
+).lower() in ("true", "1", "yes")
+TRANSCRIPT_BINARY: bool = os.getenv("TRANSCRIPT_BINARY", "false").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+TRANSCRIPT_INDEX_DIR: str = os.getenv(
+    "TRANSCRIPT_INDEX_DIR", os.path.join("transcripts", "index")
+)
+LIVE_TRANSCRIPTS_ADDR: str = os.getenv(
+    "LIVE_TRANSCRIPTS_ADDR", "127.0.0.1:5679"
+)
+LIVE_TRANSCRIPTS_INTERIM: bool = os.getenv(
+    "LIVE_TRANSCRIPTS_INTERIM", "false"
+).lower() in ("true", "1", "yes")
+# Largest live segment datagram sent; longer results are not published.
+LIVE_MAX_DATAGRAM: int = 60_000
+DG_CONNECT_TIMEOUT_S: float = 10.0
+# How long to wait for Deepgram's last results after CloseStream.
+DG_FINISH_TIMEOUT_S: float = 10.0
+
+# Twilio sends 8 kHz μ-law, one byte per sample, in 20 ms (160-byte) frames.
+SAMPLE_RATE: int = 8000
+FRAME_BYTES: int = 160
+FRAME_MS: int = 1000 * FRAME_BYTES // SAMPLE_RATE
+# Frames the VAD decides at once. Deepgram sends hold this much audio
+# anyway, so batching the decisions does not delay speech.
+VAD_BATCH_FRAMES: int = max(1, DG_AGGREGATE_MS // FRAME_MS)
+# μ-law encodes zero as 0xFF; used to fill a track with no audio.
+ULAW_SILENCE: int = 0xFF
+_NS_PER_SECOND: int = 1_000_000_000
+_NS_PER_SAMPLE: int = _NS_PER_SECOND // SAMPLE_RATE
 
 # Deepgram streaming parameters tuned for Twilio 8 kHz µ-law mono streams.
 DG_OPTIONS: dict[str, Any] = {
@@ -89,11 +293,27 @@ DG_OPTIONS: dict[str, Any] = {
     "diarize": False,  # track separation is handled by Twilio parameters
 }
 
-# Initialise Deepgram client once for the process
-_DEEPGRAM: Any = Deepgram(DEEPGRAM_API_KEY)
-
 # Optional overrides: /set_start can update these values while a stream is live.
 STREAM_BASE_EPOCH_MS: dict[str, int] = {}
+# Live streams in this process by streamSid (see ``/stats``).
+_STREAMS: dict[str, _StreamStats] = {}
+# Prewarmed Deepgram sessions by channel count; created by ``_serve`` when
+# DG_POOL_SIZE > 0.
+_DEEPGRAM_POOLS: dict[int, _DeepgramPool] = {}
+
+# Lazily opened transcript word index (see ``_word_index``).
+_WORD_INDEX: dict[str, Any] = {}
+# Lazily created live transcript publisher (see ``_live_publisher``).
+_LIVE_PUBLISHER: dict[str, Any] = {}
+# Open Twilio connections in this process (used for drain and health).
+_ACTIVE_CONNECTIONS: set[Any] = set()
+# Identity/lifecycle of this process when it runs as a supervised worker.
+_WORKER_STATE: dict[str, Any] = {
+    "worker": None,
+    "draining": False,
+    "started_at": time.time(),
+    "shed_streams": 0,
+}
 
 # Logging setup – INFO level is fine for production; DEBUG can be chatty
 logging.basicConfig(
@@ -110,16 +330,570 @@ _SAFE_FILENAME_RE = re.compile(r"\W+")
 # ---------------------------------------------------------------------------
 
 
-def _payload_is_silence(audio: bytes) -> bool:
-    """Return True if the μ-law audio frame is pure silence.
+def _build_ulaw_table() -> np.ndarray:
+    """Return the 256-entry G.711 μ-law → 16-bit linear PCM lookup table."""
+    codes = ~np.arange(256, dtype=np.int32) & 0xFF
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+_ULAW_TO_LINEAR: np.ndarray = _build_ulaw_table()
+
 
-    We treat a frame as silence when *all* bytes have the same value.  For μ-law,
-    true digital silence is 0xFF (sometimes 0x7F), but using the set-size test
-    is more robust against other encoders.
+class VoiceActivityDetector:
+    """Energy + zero-crossing-rate voice activity detector for μ-law audio.
+
+    Audio is decoded through :data:`_ULAW_TO_LINEAR` and split into
+    ``frame_bytes`` frames; energy (dBFS) and zero-crossing rate are computed
+    for the whole batch with NumPy. A frame is speech when its energy clears
+    both ``threshold_db`` and an adaptive noise floor by ``margin_db`` and it
+    is either tonal (low ZCR) or clearly louder than the floor – so steady
+    line/comfort noise is rejected even though its bytes are not identical.
+    ``hangover_frames`` keeps the gate open briefly after speech so word
+    endings are not clipped.
     """
-    if not audio:
-        return True
-    return len(set(audio)) == 1
+
+    def __init__(
+        self,
+        threshold_db: float = -50.0,
+        margin_db: float = 9.0,
+        zcr_max: float = 0.35,
+        hangover_frames: int = 20,
+        frame_bytes: int = FRAME_BYTES,
+    ):
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.zcr_max = zcr_max
+        self.hangover_frames = hangover_frames
+        self.frame_bytes = frame_bytes
+        self.noise_floor_db = threshold_db
+        self._hangover = 0
+
+    def frame_features(self, audio: bytes) -> tuple[np.ndarray, np.ndarray]:
+        """Return per-frame ``(energy_db, zcr)`` arrays for *audio*."""
+        codes = np.frombuffer(audio, dtype=np.uint8)
+        frames = max(1, len(codes) // self.frame_bytes)
+        width = min(len(codes), self.frame_bytes)
+        pcm = _ULAW_TO_LINEAR[codes[: frames * width]].reshape(frames, width)
+        samples = pcm.astype(np.float32) / 32768.0
+        energy_db = 10.0 * np.log10(np.mean(samples * samples, axis=1) + 1e-10)
+        signs = np.signbit(pcm)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / max(
+            width - 1, 1
+        )
+        return energy_db, zcr
+
+    def is_speech(self, audio: bytes) -> list[bool]:
+        """Decide every ``frame_bytes`` frame of *audio*: True for speech
+        (or hangover). Pass a batch of frames; the NumPy part runs once.
+        """
+        if not audio:
+            return []
+        energy_db, zcr = self.frame_features(audio)
+        threshold_db, margin_db = self.threshold_db, self.margin_db
+        zcr_max, floor_db = self.zcr_max, self.noise_floor_db
+        hangover = self._hangover
+        decisions = []
+        for frame_db, frame_zcr in zip(
+            energy_db.tolist(), zcr.tolist(), strict=True
+        ):
+            threshold = max(threshold_db, floor_db + margin_db)
+            speech = frame_db > threshold and (
+                frame_zcr < zcr_max or frame_db > threshold + margin_db
+            )
+            # Track the noise floor: fall quickly, rise slowly – and barely
+            # during speech – so a noisy line is learned within a second or
+            # two without speech dragging the floor up.
+            if frame_db < floor_db:
+                rate = 0.2
+            else:
+                rate = 0.002 if speech else 0.02
+            floor_db += rate * (frame_db - floor_db)
+            if speech:
+                hangover = self.hangover_frames
+            elif hangover > 0:
+                hangover -= 1
+                speech = True
+            decisions.append(speech)
+        self.noise_floor_db = floor_db
+        self._hangover = hangover
+        return decisions
+
+
+def _new_vad() -> VoiceActivityDetector:
+    return VoiceActivityDetector(
+        threshold_db=VAD_THRESHOLD_DB,
+        hangover_frames=max(1, VAD_HANGOVER_MS // FRAME_MS),
+    )
+
+
+class _StreamTimeline:
+    """Map Deepgram's clock back to stream time when audio is gated.
+
+    Deepgram only sees the audio we forward, so every dropped gap shifts its
+    timestamps. Each time forwarding resumes after a gap an anchor
+    ``(deepgram_sample, stream_sample)`` is recorded; word times are mapped
+    through the last anchor at or before them. Positions are whole samples,
+    so the clock does not drift however long the stream runs.
+    """
+
+    def __init__(self):
+        self._dg: list[int] = [0]
+        self._stream: list[int] = [0]
+        self.sent_samples = 0
+
+    @property
+    def sent_seconds(self) -> float:
+        return self.sent_samples / SAMPLE_RATE
+
+    def forward(self, stream_sample: int, num_samples: int) -> None:
+        """Record that *num_samples* captured at *stream_sample* were sent."""
+        expected = self._stream[-1] + (self.sent_samples - self._dg[-1])
+        # Only forward jumps are gaps; frames arriving "early" (mixed
+        # tracks) keep the current anchor.
+        if stream_sample > expected:
+            self._dg.append(self.sent_samples)
+            self._stream.append(stream_sample)
+        self.sent_samples += num_samples
+
+    def to_stream_ns(self, dg_seconds: float) -> int:
+        """Stream time, in integer nanoseconds, of *dg_seconds* on Deepgram's
+        clock."""
+        i = bisect.bisect_right(self._dg, dg_seconds * SAMPLE_RATE) - 1
+        return (self._stream[i] - self._dg[i]) * _NS_PER_SAMPLE + round(
+            dg_seconds * 1e9
+        )
+
+    @property
+    def gaps(self) -> int:
+        return len(self._dg) - 1
+
+
+_SILENCE_FRAME = bytes([ULAW_SILENCE]) * FRAME_BYTES
+
+
+class _JitterBuffer:
+    """Reorder Twilio frames by ``timestamp`` and fill what was lost.
+
+    Frames are slotted by timestamp (``FRAME_MS`` per slot), one column per
+    transcribed track, and slots are released strictly in order once every
+    track has filled them. A slot still incomplete ``depth`` slots behind
+    the newest frame goes out with μ-law silence in place of the missing
+    audio, so a lost chunk costs silence rather than shifting every later
+    word, and a stalled track cannot hold up the other. Outages longer than
+    ``max_fill`` slots are skipped instead (the timeline records the gap).
+    Late frames and duplicates are dropped.
+    """
+
+    def __init__(
+        self,
+        tracks: tuple[str, ...],
+        depth: int = 3,
+        max_fill: int = 50,
+    ):
+        self.tracks = tracks
+        self.depth = depth
+        self.max_fill = max_fill
+        self._column = {track: i for i, track in enumerate(tracks)}
+        self._slots: dict[int, list[bytes | None]] = {}
+        self._next: int | None = None
+        self._newest = -1
+        self.filled = 0
+        self.late = 0
+        self.duplicates = 0
+        self.skipped = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._slots)
+
+    def push(
+        self, track: str, frame_ms: int, audio: bytes
+    ) -> list[tuple[int, list[bytes]]]:
+        """Add a frame; return released ``(slot_ms, [audio per track])``."""
+        column = self._column.get(track)
+        if column is None:
+            return []
+        slot = frame_ms // FRAME_MS
+        if self._next is None:
+            self._next = slot
+        elif slot < self._next:
+            self.late += 1
+            return []
+        frames = self._slots.get(slot)
+        if frames is None:
+            frames = self._slots[slot] = [None] * len(self.tracks)
+        elif frames[column] is not None:
+            self.duplicates += 1
+            return []
+        frames[column] = audio
+        if slot > self._newest:
+            self._newest = slot
+        return self._release(self._newest - self.depth)
+
+    def flush(self) -> list[tuple[int, list[bytes]]]:
+        """Release every buffered slot (stream stop)."""
+        return self._release(self._newest)
+
+    def _release(self, force_until: int) -> list[tuple[int, list[bytes]]]:
+        ready = []
+        while self._slots:
+            slot = self._next
+            frames = self._slots.get(slot)
+            if frames is None or None in frames:
+                if slot > force_until:
+                    break
+                if frames is None:
+                    resume = min(self._slots)
+                    if resume - slot > self.max_fill:
+                        self.skipped += resume - slot
+                        self._next = resume
+                        continue
+                    frames = [None] * len(self.tracks)
+                self.filled += frames.count(None)
+                size = max((len(f) for f in frames if f), default=FRAME_BYTES)
+                silence = (
+                    _SILENCE_FRAME
+                    if size == FRAME_BYTES
+                    else bytes([ULAW_SILENCE]) * size
+                )
+                frames = [f or silence for f in frames]
+            self._slots.pop(slot, None)
+            ready.append((slot * FRAME_MS, frames))
+            self._next = slot + 1
+        return ready
+
+
+def _gate_slots(
+    slots: list[tuple[int, list[bytes]]],
+    vads: list[VoiceActivityDetector],
+) -> list[tuple[int, bytes, bool]]:
+    """Turn released jitter-buffer slots into ``(ms, audio, speech)``.
+
+    Each track's detector runs once over its frames of all *slots*.
+    Multichannel slots are interleaved; all channels go out together, so a
+    slot is speech when any track's detector says so.
+    """
+    speech = [not VAD_ENABLED] * len(slots)
+    if VAD_ENABLED:
+        for column, vad in enumerate(vads):
+            decisions = _vad_decisions(
+                vad, [frames[column] for _, frames in slots]
+            )
+            speech = [a or b for a, b in zip(speech, decisions, strict=True)]
+    return [
+        (
+            slot_ms,
+            frames[0] if len(frames) == 1 else _interleave(*frames),
+            decision,
+        )
+        for (slot_ms, frames), decision in zip(slots, speech, strict=True)
+    ]
+
+
+def _vad_decisions(
+    vad: VoiceActivityDetector, chunks: list[bytes]
+) -> list[bool]:
+    """Run *vad* once over consecutive *chunks*; True per chunk that holds
+    speech."""
+    decisions = vad.is_speech(b"".join(chunks))
+    frame_bytes = vad.frame_bytes
+    if all(len(chunk) == frame_bytes for chunk in chunks):
+        return decisions
+    out, offset = [], 0
+    for chunk in chunks:
+        first = offset // frame_bytes
+        offset += len(chunk)
+        out.append(
+            any(decisions[first : max(first + 1, offset // frame_bytes)])
+        )
+    return out
+
+
+def _gate_frames(
+    frames: list[tuple[int, str, bytes]],
+    vads: dict[str, VoiceActivityDetector],
+) -> list[tuple[int, bytes, bool]]:
+    """Turn ``(ms, track, audio)`` frames of a mixed mono stream into
+    ``(ms, audio, speech)``, running each track's detector once.
+    """
+    speech = [not VAD_ENABLED] * len(frames)
+    if VAD_ENABLED:
+        rows: dict[str, list[int]] = {}
+        for i, (_, track, _) in enumerate(frames):
+            rows.setdefault(track, []).append(i)
+        for track, indices in rows.items():
+            vad = vads.get(track)
+            if vad is None:
+                vad = vads[track] = _new_vad()
+            decisions = _vad_decisions(vad, [frames[i][2] for i in indices])
+            for i, decision in zip(indices, decisions, strict=True):
+                speech[i] = decision
+    return [
+        (frame_ms, audio, decision)
+        for (frame_ms, _, audio), decision in zip(frames, speech, strict=True)
+    ]
+
+
+def _interleave(left: bytes, right: bytes) -> bytes:
+    """Interleave two mono μ-law frames into one 2-channel frame."""
+    size = max(len(left), len(right))
+    out = np.full(2 * size, ULAW_SILENCE, dtype=np.uint8)
+    out[0 : 2 * len(left) : 2] = np.frombuffer(left, dtype=np.uint8)
+    out[1 : 2 * len(right) : 2] = np.frombuffer(right, dtype=np.uint8)
+    return out.tobytes()
+
+
+class _AudioBatcher:
+    """Coalesce 20 ms Twilio frames into fewer, larger Deepgram sends.
+
+    Frames are copied into a preallocated buffer holding ``max_ms`` of audio
+    (of ``channels`` interleaved channels). The buffer is sent when it is
+    full, ``max_ms`` after its first frame arrived (so latency stays bounded
+    when audio trickles in) or on an explicit :meth:`flush` (gate closing,
+    stream stop).
+    """
+
+    def __init__(self, send, max_ms: int = DG_AGGREGATE_MS, channels: int = 1):
+        self._send = send
+        self.capacity = channels * max(
+            FRAME_BYTES, SAMPLE_RATE * max_ms // 1000
+        )
+        self.max_delay = max_ms / 1000
+        self._buf = bytearray(self.capacity)
+        self._view = memoryview(self._buf)
+        self._len = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self.frames = 0
+        self.sends = 0
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._len
+
+    def add(self, chunk: bytes) -> None:
+        self.frames += 1
+        size = len(chunk)
+        if self._len + size > self.capacity:
+            self.flush()
+        if size >= self.capacity:
+            self.sends += 1
+            self._send(bytes(chunk))
+            return
+        self._view[self._len : self._len + size] = chunk
+        self._len += size
+        if self._len >= self.capacity:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.max_delay, self.flush
+            )
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._len:
+            return
+        # The Deepgram client queues the object, so hand it its own copy.
+        data = bytes(self._view[: self._len])
+        self._len = 0
+        self.sends += 1
+        self._send(data)
+
+
+class _StreamStats:
+    """Counters for one live stream, reported by the control server.
+
+    The media handler only bumps integers here; everything derived (ratios,
+    lag, queue depths, memory) is computed when ``/stats`` asks, so the
+    control server adds nothing to the per-frame path.
+    """
+
+    def __init__(self, websocket: Any, timeline: _StreamTimeline, metadata):
+        self.websocket = websocket
+        self.timeline = timeline
+        self.metadata = metadata
+        self.preroll: deque | None = None
+        self.batcher: _AudioBatcher | None = None
+        self.dg_socket: _DeepgramLive | None = None
+        self.dg_queue: asyncio.Queue | None = None
+        self.jitter: _JitterBuffer | None = None
+        self.channels = 1
+        self.started_at = time.time()
+        self.shed_reason: str | None = None
+        self.frames_in = 0
+        self.frames_gated = 0
+        self.frames_voiced = 0
+        self.keepalives = 0
+        self.results = 0
+        self.final_results = 0
+        # End of the audio Deepgram has answered for, on Deepgram's clock.
+        self.dg_audio_end = 0.0
+        self.last_result_at: float | None = None
+        # Live segments sent to the Socket.IO relay (``_LivePublisher``).
+        self.published = 0
+        self.audio_to_publish_ms: int | None = None
+
+    def on_result(self, payload: dict) -> None:
+        self.results += 1
+        if payload.get("is_final"):
+            self.final_results += 1
+        end = payload.get("start", 0.0) + payload.get("duration", 0.0)
+        if end > self.dg_audio_end:
+            self.dg_audio_end = end
+        self.last_result_at = time.time()
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held for this stream (buffers, not code)."""
+        size = self.batcher.capacity if self.batcher is not None else 0
+        if self.preroll is not None:
+            size += sum(sys.getsizeof(chunk) for _, chunk in self.preroll)
+        size += sys.getsizeof(self.timeline._dg) * 2
+        size += 24 * 2 * (self.timeline.gaps + 1)
+        size += sum(len(m) for m in getattr(self.websocket, "messages", ()))
+        if self.dg_socket is not None:
+            size += self.dg_socket.backlog_bytes
+        if self.dg_queue is not None:
+            size += sum(sys.getsizeof(p) for p in self.dg_queue._queue)
+        return size
+
+    def snapshot(self) -> dict[str, Any]:
+        sent = self.timeline.sent_seconds
+        decided = self.frames_gated + self.frames_voiced
+        dg = self.dg_socket
+        return {
+            "stream_sid": self.metadata.get("stream_sid"),
+            "call_flow_type": self.metadata.get("call_flow_type"),
+            "participant": self.metadata.get("participant"),
+            "stream_start_epoch_ms": self.metadata.get("stream_start_epoch_ms"),
+            "transcript_epoch_ms": self.metadata.get("transcript_epoch_ms"),
+            "age_s": round(time.time() - self.started_at, 1),
+            "frames_in": self.frames_in,
+            "frames_out": self.batcher.frames if self.batcher else 0,
+            "deepgram_sends": self.batcher.sends if self.batcher else 0,
+            "channels": self.channels,
+            "bytes_forwarded": round(sent * SAMPLE_RATE * self.channels),
+            "seconds_forwarded": round(sent, 3),
+            "silence_ratio": (
+                round(self.frames_gated / decided, 3) if decided else None
+            ),
+            "keepalives": self.keepalives,
+            "results": self.results,
+            "final_results": self.final_results,
+            # Forwarded audio Deepgram has not yet returned results for.
+            "deepgram_lag_s": (
+                round(max(0.0, sent - self.dg_audio_end), 3)
+                if self.results
+                else None
+            ),
+            "last_result_age_s": (
+                round(time.time() - self.last_result_at, 3)
+                if self.last_result_at is not None
+                else None
+            ),
+            "queues": {
+                "twilio_inbound": len(getattr(self.websocket, "messages", ())),
+                "batcher_bytes": (
+                    self.batcher.pending_bytes if self.batcher else 0
+                ),
+                "jitter_slots": self.jitter.pending if self.jitter else 0,
+                "deepgram_backlog_bytes": dg.backlog_bytes if dg else 0,
+                "transcripts": (
+                    self.dg_queue.qsize() if self.dg_queue is not None else 0
+                ),
+            },
+            "high_water": {
+                "deepgram_backlog_bytes": dg.backlog_high_water if dg else 0,
+                "transcripts": dg.results_high_water if dg else 0,
+            },
+            "overflow": {
+                "coalesced_sends": dg.coalesced if dg else 0,
+                "dropped_interim": dg.dropped_interim if dg else 0,
+                "shed": self.shed_reason,
+                "silence_filled_frames": (
+                    self.jitter.filled if self.jitter else 0
+                ),
+                "late_frames": self.jitter.late if self.jitter else 0,
+                "duplicate_frames": (
+                    self.jitter.duplicates if self.jitter else 0
+                ),
+                "skipped_frames": self.jitter.skipped if self.jitter else 0,
+            },
+            "live": {
+                "published": self.published,
+                # From the end of a segment's audio to its publication.
+                "audio_to_publish_ms": self.audio_to_publish_ms,
+            },
+            "memory_bytes": self.memory_bytes(),
+        }
+
+    def set_start(self, epoch_ms: int) -> None:
+        """Re-anchor the stream (and transcript) epoch to *epoch_ms*."""
+        previous = self.metadata.get("stream_start_epoch_ms")
+        self.metadata["stream_start_epoch_ms"] = epoch_ms
+        if previous is not None and "transcript_epoch_ms" in self.metadata:
+            self.metadata["transcript_epoch_ms"] += epoch_ms - previous
+        self.metadata["start_source"] = "set_start"
+
+
+# ---------------------------------------------------------------------------
+# Twilio message parsing
+# ---------------------------------------------------------------------------
+
+# Twilio sends compact JSON, so these substrings identify media frames (and
+# their track) without decoding. Anything that doesn't match exactly simply
+# takes the full-parse path.
+_MEDIA_EVENT_MARKER = '"event":"media"'
+_OUTBOUND_TRACK_MARKER = '"track":"outbound"'
+
+
+# Parsed media frames are plain ``(track, timestamp, payload, chunk)`` tuples
+# – a NamedTuple would cost more than the rest of the fallback parse.
+_MediaFrame = tuple[str, Any, str, Any]
+
+if msgspec is not None:
+
+    class _MediaStruct(msgspec.Struct):
+        track: str = "inbound"
+        timestamp: str | int | None = None
+        payload: str = ""
+        chunk: str | int | None = None
+
+    class _MediaMessage(msgspec.Struct):
+        media: _MediaStruct | None = None
+
+    _MEDIA_DECODER = msgspec.json.Decoder(_MediaMessage)
+    _loads = msgspec.json.decode
+elif orjson is not None:
+    _loads = orjson.loads
+else:
+    _loads = json.loads
+
+
+def _frame_from_dict(msg: dict) -> _MediaFrame:
+    media = msg.get("media") or {}
+    return (
+        media.get("track", "inbound"),
+        media.get("timestamp"),
+        media.get("payload") or "",
+        media.get("chunk"),
+    )
+
+
+def _parse_media(raw: str | bytes) -> _MediaFrame | None:
+    """Decode a Twilio media message, only materialising the fields we use.
+
+    Raises ``ValueError`` for malformed JSON.
+    """
+    if msgspec is not None:
+        media = _MEDIA_DECODER.decode(raw).media
+        if media is None:
+            return None
+        return (media.track, media.timestamp, media.payload, media.chunk)
+    return _frame_from_dict(_loads(raw))
 
 
 def _safe_label(label: str) -> str:
@@ -132,39 +906,782 @@ def _safe_label(label: str) -> str:
 ###############################################################################
 
 
-async def _create_deepgram_connection():
-    """Open a Deepgram live transcription connection and return it with a queue.
+_CLOSE_STREAM = json.dumps({"type": "CloseStream"})
+_KEEP_ALIVE = json.dumps({"type": "KeepAlive"})
+
 
-    The queue receives every payload Deepgram emits for the lifetime of the
-    connection.
+class _DeepgramLive:
+    """Deepgram live-transcription socket with a bounded send backlog.
+
+    Audio passed to :meth:`send` is queued for a single sender task. While
+    the socket is behind, new audio is appended to the last queued chunk, so
+    a slow upstream gets fewer, larger messages; once ``max_backlog_bytes``
+    are waiting :meth:`send` refuses audio and the caller sheds the stream.
+    Every response is handed to *on_message* (settable after connecting, so
+    a pooled session can be given to a stream later), which may await – that
+    stops reading the socket and pushes backpressure onto Deepgram.
     """
-    transcript_q: asyncio.Queue[dict] = asyncio.Queue()
 
-    async def _on_transcript(event: dict):
-        await transcript_q.put(event)
+    def __init__(self, on_message=None, max_backlog_bytes: int = 0):
+        self.on_message = on_message
+        self.max_backlog_bytes = max_backlog_bytes
+        self._pending: deque[bytes | bytearray | str] = deque()
+        self._wakeup = asyncio.Event()
+        self._ws: Any = None
+        self._tasks: list[asyncio.Task] = []
+        self.error: str | None = None
+        self.backlog_bytes = 0
+        self.backlog_high_water = 0
+        self.coalesced = 0
+        # Maintained by the transcript queue policy (see below).
+        self.dropped_interim = 0
+        self.results_high_water = 0
+
+    async def connect(self, url: str, api_key: str) -> None:
+        self._ws = await asyncio.wait_for(
+            connect(
+                url,
+                extra_headers={"Authorization": f"Token {api_key}"},
+                ping_interval=None,  # Deepgram expects KeepAlive messages
+                # μ-law barely compresses; deflate would only cost CPU.
+                compression=None,
+            ),
+            DG_CONNECT_TIMEOUT_S,
+        )
+        loop = asyncio.get_running_loop()
+        self._tasks = [
+            loop.create_task(self._sender()),
+            loop.create_task(self._receiver()),
+        ]
+
+    def send(self, data: bytes) -> bool:
+        """Queue *data*; return False if the backlog is full or the socket
+        has failed."""
+        if self.error is not None:
+            return False
+        if self.backlog_bytes + len(data) > self.max_backlog_bytes:
+            return False
+        tail = self._pending[-1] if self._pending else None
+        if tail is None or isinstance(tail, str):
+            self._pending.append(data)
+            self._wakeup.set()
+        else:
+            if not isinstance(tail, bytearray):
+                tail = self._pending[-1] = bytearray(tail)
+            tail += data
+            self.coalesced += 1
+        self.backlog_bytes += len(data)
+        if self.backlog_bytes > self.backlog_high_water:
+            self.backlog_high_water = self.backlog_bytes
+        return True
+
+    def keep_alive(self) -> None:
+        self._pending.append(_KEEP_ALIVE)
+        self._wakeup.set()
+
+    async def _sender(self) -> None:
+        try:
+            while True:
+                while not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                item = self._pending.popleft()
+                await self._ws.send(item)
+                if item is _CLOSE_STREAM:
+                    return
+                if not isinstance(item, str):
+                    self.backlog_bytes -= len(item)
+        except ConnectionClosed as exc:
+            self.error = f"Deepgram closed the connection: {exc}"
+        except Exception as exc:
+            self.error = f"Deepgram send failed: {exc}"
+            logging.error("%s", self.error)
+
+    async def _receiver(self) -> None:
+        try:
+            async for message in self._ws:
+                if self.on_message is not None:
+                    await self.on_message(_loads(message))
+        except ConnectionClosed:
+            pass
+        except Exception as exc:
+            logging.error("Deepgram receive failed: %s", exc)
+
+    async def finish(self) -> None:
+        """Send CloseStream, wait for the final results and close."""
+        if self._ws is None:
+            return
+        self._pending.append(_CLOSE_STREAM)
+        self._wakeup.set()
+        sender, receiver = self._tasks
+        try:
+            await asyncio.wait_for(receiver, DG_FINISH_TIMEOUT_S)
+        except asyncio.TimeoutError:
+            logging.warning(
+                "Deepgram did not close within %ss", DG_FINISH_TIMEOUT_S
+            )
+        await self.close()
+
+    @property
+    def open(self) -> bool:
+        return (
+            self._ws is not None
+            and self._ws.open
+            and self.error is None
+            and not self._tasks[1].done()
+        )
+
+    async def close(self) -> None:
+        """Close the socket without waiting for outstanding results."""
+        for task in self._tasks:
+            task.cancel()
+        if self._ws is not None:
+            await self._ws.close()
+
+
+def _deepgram_url(channels: int = 1) -> str:
+    options = dict(DG_OPTIONS)
+    if channels > 1:
+        # One transcript per channel instead of a mix of both speakers.
+        options.update(channels=channels, multichannel=True)
+    query = {
+        key: str(value).lower() if isinstance(value, bool) else value
+        for key, value in options.items()
+    }
+    return f"{DEEPGRAM_LIVE_URL}?{urllib.parse.urlencode(query)}"
+
+
+async def _create_deepgram_connection(channels: int = 1):
+    """Open a Deepgram live transcription connection and return it with a queue.
+
+    *channels* > 1 opens a ``multichannel`` session for interleaved audio.
 
-    dg_socket = await _DEEPGRAM.transcription.live(DG_OPTIONS)
-    dg_socket.registerHandler(  # type: ignore[attr-defined]
-        dg_socket.event.TRANSCRIPT_RECEIVED,
-        _on_transcript,
+    The queue is bounded (``TRANSCRIPT_QUEUE_MAX``): when the consumer falls
+    behind, interim results are dropped and final results wait, which stops
+    reading from Deepgram rather than buffering without limit.
+    """
+    transcript_q: asyncio.Queue[dict | None] = asyncio.Queue(
+        maxsize=TRANSCRIPT_QUEUE_MAX
     )
+
+    async def _on_message(payload: dict):
+        if payload.get("type", "Results") != "Results":
+            return
+        if payload.get("is_final"):
+            await transcript_q.put(payload)
+        elif transcript_q.full():
+            dg_socket.dropped_interim += 1
+            return
+        else:
+            transcript_q.put_nowait(payload)
+        if transcript_q.qsize() > dg_socket.results_high_water:
+            dg_socket.results_high_water = transcript_q.qsize()
+
+    pool = _DEEPGRAM_POOLS.get(channels)
+    if pool is not None:
+        dg_socket = await pool.acquire()
+    else:
+        dg_socket = await _connect_deepgram(channels)
+    dg_socket.on_message = _on_message
     return dg_socket, transcript_q
 
 
+async def _connect_deepgram(channels: int = 1) -> _DeepgramLive:
+    session = _DeepgramLive(
+        max_backlog_bytes=channels * SAMPLE_RATE * DG_MAX_BACKLOG_MS // 1000
+    )
+    await session.connect(_deepgram_url(channels), DEEPGRAM_API_KEY or "")
+    return session
+
+
+class _DeepgramPool:
+    """Keep ``size`` Deepgram sessions connected ahead of stream starts.
+
+    A stream takes a ready session in :meth:`acquire` instead of paying the
+    TLS + WebSocket handshake after Twilio's ``start`` (which delays or
+    loses the first words); the pool refills in the background. Idle
+    sessions get a KeepAlive every ``DG_KEEPALIVE_S`` and are recycled after
+    ``idle_timeout`` seconds, so a stream never gets one Deepgram dropped.
+    Sessions are opened for ``channels`` channels; one pool per layout.
+    """
+
+    def __init__(self, size: int, idle_timeout: float, channels: int = 1):
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.channels = channels
+        self._ready: deque[tuple[float, _DeepgramLive]] = deque()
+        self._connecting = 0
+        self._tasks: set[asyncio.Task] = set()
+        self._closed = False
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.failures = 0
+        self.connects = 0
+        self.connect_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def _background(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _open(self) -> _DeepgramLive:
+        started = time.monotonic()
+        session = await _connect_deepgram(self.channels)
+        self.connects += 1
+        self.connect_seconds += time.monotonic() - started
+        return session
+
+    async def _add(self) -> None:
+        try:
+            session = await self._open()
+        except Exception as exc:
+            self.failures += 1
+            logging.warning("Could not prewarm a Deepgram session: %s", exc)
+            return
+        finally:
+            self._connecting -= 1
+        if self._closed:
+            await session.close()
+            return
+        self._ready.append((time.monotonic(), session))
+
+    def _refill(self) -> None:
+        while (
+            not self._closed and len(self._ready) + self._connecting < self.size
+        ):
+            self._connecting += 1
+            self._background(self._add())
+
+    async def acquire(self) -> _DeepgramLive:
+        """Return a connected session, prewarmed when one is ready."""
+        while self._ready:
+            _, session = self._ready.popleft()
+            if session.open:
+                self.hits += 1
+                if self.connects:
+                    self.saved_seconds += self.connect_seconds / self.connects
+                self._refill()
+                return session
+            self.expired += 1
+            self._background(session.close())
+        self.misses += 1
+        self._refill()
+        return await self._open()
+
+    async def run(self) -> None:
+        """Fill the pool, then keep idle sessions alive (or recycle them)."""
+        self._refill()
+        while not self._closed:
+            await asyncio.sleep(DG_KEEPALIVE_S)
+            now = time.monotonic()
+            for _ in range(len(self._ready)):
+                created, session = self._ready.popleft()
+                if session.open and now - created < self.idle_timeout:
+                    session.keep_alive()
+                    self._ready.append((created, session))
+                else:
+                    self.expired += 1
+                    self._background(session.close())
+            # Also retries after failed connects.
+            self._refill()
+
+    async def close(self) -> None:
+        self._closed = True
+        while self._ready:
+            _, session = self._ready.popleft()
+            await session.close()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "channels": self.channels,
+            "size": self.size,
+            "ready": len(self._ready),
+            "connecting": self._connecting,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "expired": self.expired,
+            "failures": self.failures,
+            "avg_connect_ms": (
+                round(1000 * self.connect_seconds / self.connects, 1)
+                if self.connects
+                else None
+            ),
+            "latency_saved_ms": round(1000 * self.saved_seconds),
+        }
+
+
+class _WordStore:
+    """Final words of one transcript, held in columns.
+
+    Times are int64 nanoseconds from transcript time 0 (``array("q")``),
+    word text is interned (``word_ids`` index ``text``) and ``result_ends``
+    holds the word count at the end of each Deepgram result – about 20
+    bytes per word and no per-word objects. :meth:`write_results` is the only
+    place the nested ``startTime``/``endTime`` schema is produced.
+    """
+
+    def __init__(self):
+        self.text: list[str] = []
+        self._ids: dict[str, int] = {}
+        self.word_ids = array("I")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.result_ends = array("I")
+
+    def __len__(self) -> int:
+        return len(self.word_ids)
+
+    @property
+    def results(self) -> int:
+        return len(self.result_ends)
+
+    def add(self, words: list[str], starts: list[int], ends: list[int]):
+        """Append one result's words and nanosecond times."""
+        ids = self._ids
+        for word in words:
+            word_id = ids.get(word)
+            if word_id is None:
+                word_id = ids[word] = len(self.text)
+                self.text.append(word)
+            self.word_ids.append(word_id)
+        self.starts.extend(starts)
+        self.ends.extend(ends)
+        self.result_ends.append(len(self.word_ids))
+
+    def write_results(self, fp, epoch_ms: int | None = None) -> None:
+        """Write the results as ``{"alternatives": [...]}`` JSON objects.
+
+        With *epoch_ms*, times are absolute and carry the ``finalseconds``/
+        ``finalnanos`` fields ``scripts/adjust_json_timestamps.py`` writes.
+        """
+        encoded = [json.dumps(word, ensure_ascii=False) for word in self.text]
+        if epoch_ms is None:
+            offset = 0
+            time_format = '{"seconds": %d, "nanos": %d}'
+        else:
+            offset = epoch_ms * 1_000_000
+            time_format = (
+                '{"seconds": %d, "nanos": "%d", '
+                '"finalseconds": %d, "finalnanos": "%d"}'
+            )
+        ids, starts, ends = self.word_ids, self.starts, self.ends
+        begin = 0
+        for end in self.result_ends:
+            entries = []
+            for i in range(begin, end):
+                start_s, start_ns = divmod(starts[i] + offset, _NS_PER_SECOND)
+                end_s, end_ns = divmod(ends[i] + offset, _NS_PER_SECOND)
+                if epoch_ms is None:
+                    start_time = time_format % (start_s, start_ns)
+                    end_time = time_format % (end_s, end_ns)
+                else:
+                    start_time = time_format % (
+                        start_s,
+                        start_ns,
+                        start_s,
+                        start_ns,
+                    )
+                    end_time = time_format % (end_s, end_ns, end_s, end_ns)
+                entries.append(
+                    '{"word": %s, "startTime": %s, "endTime": %s}'
+                    % (encoded[ids[i]], start_time, end_time)
+                )
+            if begin:
+                fp.write(", ")
+            fp.write('{"alternatives": [{"words": [')
+            fp.write(", ".join(entries))
+            fp.write("]}]}")
+            begin = end
+
+
+def _journal_record(
+    words: list[dict], timeline: _StreamTimeline
+) -> dict[str, list]:
+    """A Deepgram result's words, mapped to stream time, as a compact
+    ``{"w", "s", "e"}`` journal record.
+    """
+    to_ns = timeline.to_stream_ns
+    return {
+        "w": [w.get("word", "") for w in words],
+        "s": [to_ns(float(w.get("start", 0.0))) for w in words],
+        "e": [to_ns(float(w.get("end", w.get("start", 0.0)))) for w in words],
+    }
+
+
+def _create_journal(path: str) -> TextIO | None:
+    """Create the journal *path*, already ``flock``-ed, and return it open
+    for writing; None if it exists.
+
+    It is created under a temporary name and linked into place, so
+    :func:`_recover_transcripts` never finds a live journal unlocked.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    fp = open(tmp_path, "w", encoding="utf-8")  # noqa: SIM115
+    try:
+        try:
+            fcntl.flock(fp, fcntl.LOCK_EX)
+            os.link(tmp_path, path)
+        finally:
+            os.remove(tmp_path)
+    except FileExistsError:
+        fp.close()
+        return None
+    except BaseException:
+        fp.close()
+        raise
+    return fp
+
+
+class _TranscriptWriter:
+    """Journal final results to disk; write the transcript JSON on close.
+
+    Every result is journalled to ``<name>.jsonl`` as a compact
+    ``{"w": [...], "s": [...], "e": [...]}`` line (the first line holds the
+    stream metadata), flushed as it arrives so a crash loses at most the last
+    line. Nothing else is kept per word while the stream runs: :meth:`close`
+    rebuilds the familiar
+    ``{"metadata": ..., "transcription": [{"results": [...]}]}`` document
+    from the journal, like startup recovery does, and deletes the journal.
+    *extra* is merged over the (shared, still changing) stream *metadata*,
+    e.g. the speaker of one channel.
+    """
+
+    def __init__(
+        self, file_prefix: str, metadata: dict, extra: dict | None = None
+    ):
+        os.makedirs("transcripts", exist_ok=True)
+        self.metadata = metadata
+        self.extra = extra or {}
+        self.results = 0
+        # Streams with the same label can start in the same millisecond;
+        # take the next free one rather than share a file.
+        epoch_ms = int(time.time() * 1000)
+        while True:
+            self.base_path = os.path.join(
+                "transcripts", f"{file_prefix}-{epoch_ms}"
+            )
+            if not os.path.exists(self.base_path + ".json"):
+                fp = _create_journal(self.base_path + ".jsonl")
+                if fp is not None:
+                    self._fp = fp
+                    break
+            epoch_ms += 1
+        self._write_line({"metadata": {**metadata, **self.extra}})
+
+    def _write_line(self, obj: dict) -> None:
+        self._fp.write(
+            json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        )
+        self._fp.write("\n")
+        self._fp.flush()
+
+    def append(self, words: list[dict], timeline: _StreamTimeline) -> None:
+        """Add the words of one final Deepgram result."""
+        self._write_line(_journal_record(words, timeline))
+        self.results += 1
+
+    def final_metadata(self) -> dict:
+        """The metadata to write: it may have been completed (e.g. epoch
+        calibration) since the header line was journalled.
+        """
+        return {**self.metadata, **self.extra}
+
+    def close(self, metadata: dict) -> str | None:
+        """Write and index ``<name>.json`` with *metadata*; return its path
+        (None if empty). Blocking: reads the whole journal back.
+        """
+        # Merged before the journal's lock is released, so startup
+        # recovery in another process never merges it too.
+        try:
+            if not self.results:
+                os.remove(self.base_path + ".jsonl")
+                return None
+            return _merge_transcript_jsonl(self.base_path, metadata)
+        finally:
+            self._fp.close()
+
+
+def _write_transcript_json(
+    base_path: str, metadata: dict, store: _WordStore
+) -> str:
+    """Write *store* as ``<base>.json`` (atomically) and return the path.
+
+    With ``TRANSCRIPT_BINARY`` the same transcript is also written as
+    ``<base>.tbin``.
+    """
+    epoch_ms = None
+    if (
+        TRANSCRIPT_EPOCH_TIMES
+        and metadata.get("transcript_epoch_ms") is not None
+    ):
+        epoch_ms = int(metadata["transcript_epoch_ms"])
+        metadata = {**metadata, "time_base": "epoch"}
+    json_path = base_path + ".json"
+    tmp_path = json_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as dst:
+        dst.write('{"metadata": ')
+        dst.write(json.dumps(metadata, ensure_ascii=False))
+        dst.write(', "transcription": [{"results": [')
+        store.write_results(dst, epoch_ms)
+        dst.write("]}]}")
+    os.replace(tmp_path, json_path)
+    if TRANSCRIPT_BINARY and transcript_binary is not None:
+        tmp_path = base_path + ".tbin.tmp"
+        with open(tmp_path, "wb") as dst:
+            writer = transcript_binary.TranscriptBinaryWriter(
+                dst, metadata, epoch=epoch_ms is not None
+            )
+            writer.add_columns(
+                store.text,
+                store.word_ids,
+                store.starts,
+                store.ends,
+                store.result_ends,
+                offset=(epoch_ms or 0) * 1_000_000,
+            )
+            writer.close()
+        os.replace(tmp_path, base_path + ".tbin")
+    return json_path
+
+
+def _word_index():
+    """The process's :class:`transcript_index.TranscriptIndex`, if enabled."""
+    if transcript_index is None or not TRANSCRIPT_INDEX_DIR:
+        return None
+    if _WORD_INDEX.get("index") is None:
+        _WORD_INDEX["index"] = transcript_index.TranscriptIndex(
+            TRANSCRIPT_INDEX_DIR
+        )
+    return _WORD_INDEX["index"]
+
+
+def _index_transcript(path: str, metadata: dict, store: _WordStore) -> None:
+    """Add a written transcript to the word index; failures are logged."""
+    try:
+        index = _word_index()
+        if index is None:
+            return
+        count = index.add(
+            path, metadata, store.text, store.word_ids, store.starts, store.ends
+        )
+        logging.info("Indexed %s words of %s", count, path)
+    except Exception as exc:
+        logging.warning("Could not index %s: %s", path, exc)
+
+
+def _time_ns(value: dict) -> int:
+    return int(value.get("seconds", 0)) * _NS_PER_SECOND + int(
+        value.get("nanos", 0)
+    )
+
+
+def _merge_transcript_jsonl(base_path: str, metadata: dict | None = None):
+    """Rebuild ``<base>.json`` from its journal and delete the journal."""
+    jsonl_path = base_path + ".jsonl"
+    store = _WordStore()
+    with open(jsonl_path, encoding="utf-8") as src:
+        header = json.loads(next(src, "{}") or "{}")
+        for line in src:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Torn final line from a crash.
+                break
+            if "w" in record:
+                store.add(record["w"], record["s"], record["e"])
+                continue
+            # Journals written before the columnar store.
+            for alt in record.get("alternatives", [])[:1]:
+                words = alt.get("words", [])
+                store.add(
+                    [w.get("word", "") for w in words],
+                    [_time_ns(w.get("startTime", {})) for w in words],
+                    [_time_ns(w.get("endTime", {})) for w in words],
+                )
+    metadata = metadata or header.get("metadata", {})
+    json_path = _write_transcript_json(base_path, metadata, store)
+    os.remove(jsonl_path)
+    _index_transcript(json_path, metadata, store)
+    return json_path
+
+
+def _recover_transcripts() -> None:
+    """Merge transcripts left as JSONL by a crashed or killed server.
+
+    Live writers (in this or another process) hold an exclusive ``flock``
+    on their journal until it is merged; those journals are left alone.
+    """
+    for jsonl_path in glob.glob(os.path.join("transcripts", "*.jsonl")):
+        try:
+            fp = open(jsonl_path, "rb")  # noqa: SIM115
+        except FileNotFoundError:
+            continue
+        with fp:
+            try:
+                fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                continue
+            try:
+                if os.stat(jsonl_path).st_ino != os.fstat(fp.fileno()).st_ino:
+                    continue  # merged by its writer before we got the lock
+            except FileNotFoundError:
+                continue
+            try:
+                json_path = _merge_transcript_jsonl(
+                    jsonl_path[: -len(".jsonl")]
+                )
+                logging.info("Recovered transcript %s", json_path)
+            except Exception as exc:
+                logging.warning("Could not recover %s: %s", jsonl_path, exc)
+
+
+class _LivePublisher:
+    """Send live transcript segments to the Flask app's Socket.IO relay.
+
+    Each segment is one JSON datagram to ``LIVE_TRANSCRIPTS_ADDR``, where
+    ``src/transcript_relay.py`` listens. Sending never waits: the socket is
+    non-blocking and a segment that cannot be sent at once is dropped – the
+    transcript file is the record, the live view is best effort. Segments
+    carry a per-stream ``seq`` so the relay can count losses.
+    """
+
+    def __init__(self, address: tuple[str, int]):
+        self.address = address
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, segment: dict) -> bool:
+        data = json.dumps(
+            segment, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+        if len(data) > LIVE_MAX_DATAGRAM:
+            self.dropped += 1
+            return False
+        try:
+            self._sock.sendto(data, self.address)
+        except OSError:
+            self.dropped += 1
+            return False
+        self.published += 1
+        return True
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "address": "%s:%d" % self.address,
+            "interim": LIVE_TRANSCRIPTS_INTERIM,
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+def _live_publisher() -> _LivePublisher | None:
+    """The process's :class:`_LivePublisher`, if enabled."""
+    if not LIVE_TRANSCRIPTS_ADDR:
+        return None
+    if _LIVE_PUBLISHER.get("publisher") is None:
+        host, _, port = LIVE_TRANSCRIPTS_ADDR.rpartition(":")
+        _LIVE_PUBLISHER["publisher"] = _LivePublisher(
+            (host or "127.0.0.1", int(port))
+        )
+    return _LIVE_PUBLISHER["publisher"]
+
+
+def _live_segment(
+    writer: _TranscriptWriter,
+    alt: dict,
+    words: list[dict],
+    timeline: _StreamTimeline,
+    final: bool,
+) -> dict[str, Any] | None:
+    """Describe a Deepgram result for the live view, with epoch ms times.
+
+    Returns None until the stream's epoch is known.
+    """
+    metadata = writer.metadata
+    epoch_ms = metadata.get("transcript_epoch_ms")
+    if epoch_ms is None:
+        return None
+    last = words[-1]
+    start_ns = timeline.to_stream_ns(float(words[0].get("start", 0.0)))
+    end_ns = timeline.to_stream_ns(
+        float(last.get("end", last.get("start", 0.0)))
+    )
+    text = alt.get("transcript") or " ".join(
+        w.get("punctuated_word") or w.get("word", "") for w in words
+    )
+    params = metadata.get("custom_parameters") or {}
+    return {
+        "stream_sid": metadata.get("stream_sid"),
+        "call_sid": metadata.get("call_sid"),
+        "conference": params.get("conference_name"),
+        "participant": writer.extra.get(
+            "participant", metadata.get("participant")
+        ),
+        "channel": writer.extra.get("channel", 0),
+        "final": final,
+        "text": text,
+        "start_ms": epoch_ms + start_ns // 1_000_000,
+        "end_ms": epoch_ms + end_ns // 1_000_000,
+    }
+
+
 async def _consume_transcripts(
     queue: asyncio.Queue[dict],
     file_prefix: str,
+    timeline: _StreamTimeline,
+    metadata: dict,
+    stats: _StreamStats | None = None,
+    channel_labels: list[tuple[str, str]] | None = None,
 ):
-    """Aggregate Deepgram transcripts and write them to disk when done.
-
-    The function exits when ``None`` is pushed onto *queue*.
+    """Write final Deepgram results to disk as they arrive.
+
+    Word times are mapped through *timeline* so they stay relative to the
+    stream even when silent gaps were never sent to Deepgram, and kept as
+    integer nanoseconds until the transcript is written. For a
+    multichannel session *channel_labels* gives ``(track, participant)`` per
+    channel and each channel is written to its own
+    ``<file_prefix>_<participant>`` transcript. Results are also published
+    live (finals, and interims with ``LIVE_TRANSCRIPTS_INTERIM``) through
+    :class:`_LivePublisher`. The function exits when ``None`` is pushed onto
+    *queue*.
     """
-    results: list[dict] = []  # each element is one Deepgram "final" result
+    if channel_labels:
+        writers = [
+            _TranscriptWriter(
+                f"{file_prefix}_{label}",
+                metadata,
+                {"participant": label, "track": track, "channel": index},
+            )
+            for index, (track, label) in enumerate(channel_labels)
+        ]
+    else:
+        writers = [_TranscriptWriter(file_prefix, metadata)]
+    writer = writers[0]
+    publisher = _live_publisher()
+    publish_interim = publisher is not None and LIVE_TRANSCRIPTS_INTERIM
+    live_seq = 0
 
     while True:
         payload = await queue.get()
         if payload is None:  # sentinel indicates end of stream
             break
+        if stats is not None:
+            stats.on_result(payload)
+
+        # Interim results are superseded by the final one; skip them before
+        # doing any work unless they are published live.
+        final = payload.get("is_final", False)
+        if not final and not publish_interim:
+            continue
 
         # We only care about payloads that contain alternatives/words
         channel: dict = payload.get("channel", {})
@@ -177,47 +1694,32 @@ async def _consume_transcripts(
         if not words:
             continue
 
-        word_entries: list[dict] = []
-        for w in words:
-            rel_start_s: float = float(w.get("start", 0.0))
-            rel_end_s: float = float(w.get("end", rel_start_s))
-
-            # Convert to (<seconds>, <nanos>) tuples
-            s_sec = int(rel_start_s)
-            s_ns = int((rel_start_s - s_sec) * 1_000_000_000)
-            e_sec = int(rel_end_s)
-            e_ns = int((rel_end_s - e_sec) * 1_000_000_000)
-
-            word_entries.append(
-                {
-                    "word": w.get("word", ""),
-                    "startTime": {"seconds": s_sec, "nanos": s_ns},
-                    "endTime": {"seconds": e_sec, "nanos": e_ns},
-                }
-            )
-
-        # Only append full word lists once Deepgram marks the result as final
-        if payload.get("is_final", False):
-            results.append({"alternatives": [{"words": word_entries}]})
-
-    if not results:
-        logging.info(
-            "No transcript results to write for prefix %s", file_prefix
+        if len(writers) > 1:
+            # ``channel_index`` is ``[channel, total_channels]``.
+            index = payload.get("channel_index") or (0,)
+            writer = writers[min(index[0], len(writers) - 1)]
+        if publisher is not None:
+            segment = _live_segment(writer, alt, words, timeline, final)
+            if segment is not None:
+                live_seq += 1
+                now_ms = int(time.time() * 1000)
+                segment.update(seq=live_seq, published_ms=now_ms)
+                if publisher.publish(segment) and stats is not None:
+                    stats.published += 1
+                    stats.audio_to_publish_ms = now_ms - segment["end_ms"]
+        if final:
+            writer.append(words, timeline)
+
+    for writer in writers:
+        file_path = await asyncio.to_thread(
+            writer.close, writer.final_metadata()
         )
-        return
-
-    output = {
-        "transcription": [{"results": results}],
-    }
-
-    os.makedirs("transcripts", exist_ok=True)
-    file_path = os.path.join(
-        "transcripts", f"{file_prefix}-{int(time.time()*1000)}.json"
-    )
-    with open(file_path, "w", encoding="utf-8") as fp:
-        json.dump(output, fp, ensure_ascii=False)
-
-    logging.info("Transcript JSON written to %s", file_path)
+        if file_path is None:
+            logging.info(
+                "No transcript results to write for %s", writer.base_path
+            )
+        else:
+            logging.info("Transcript JSON written to %s", file_path)
 
 
 ###############################################################################
@@ -230,33 +1732,94 @@ async def _twilio_media_handler(
 ):
     """Handle a single Twilio Media Stream connection."""
     logging.info("New connection from %s", websocket.remote_address)
+    _ACTIVE_CONNECTIONS.add(websocket)
 
     # We do not know flow-type / labels until the Start event, so keep them here
     call_flow_type: str | None = None  # "normal" or "conference"
     participant_label: str = "participant"
+    # Written as the transcript's "metadata"; completed as the stream runs.
+    metadata: dict[str, Any] = {}
 
     # Epoch that aligns to Deepgram's 0.0 s. We set it on first media chunk.
     base_epoch_ms: int | None = None
+    # Earliest (arrival - timestamp) seen: network delay only ever makes a
+    # frame late, so the minimum is the best estimate of the stream start.
+    clock_epoch_ms: int | None = None
     stream_active: bool = (
         False  # becomes True once we forward first non-silent frame
     )
+    # Stream offset (ms) of the first forwarded frame – transcript time 0.
+    origin_ms: int | None = None
+    # Audio received so far per track, for frames without a timestamp.
+    received_ms: dict[str, int] = {}
+    # One detector per track: inbound and outbound have different levels.
+    vads: dict[str, VoiceActivityDetector] = {}
+    # Mixed mono frames waiting for a VAD batch (``VAD_BATCH_FRAMES``).
+    mixed: list[tuple[int, str, bytes]] = []
+    # Puts the transcribed tracks' frames back in timestamp order (and pairs
+    # them for multichannel); ``track_vads`` follow its columns.
+    jitter: _JitterBuffer | None = None
+    track_vads: list[VoiceActivityDetector] = []
+    # Released slots waiting for a VAD batch.
+    released: list[tuple[int, list[bytes]]] = []
+    channels = 1
+    timeline = _StreamTimeline()
+    # Recent gated frames, replayed on speech onset so soft starts survive.
+    preroll: deque[tuple[int, bytes]] = deque(
+        maxlen=max(0, VAD_PREROLL_MS // FRAME_MS)
+    )
+    last_send = time.monotonic()
+    stats = _StreamStats(websocket, timeline, metadata)
+    stats.preroll = preroll
+    stream_sid: str | None = None
     # We intentionally ignore any recording_start custom params for now
     # to keep timing generic (relative to when we received Start).
 
     # Deepgram connection & transcript consumer – created after we see Start
     dg_socket = None  # type: ignore
+    batcher: _AudioBatcher | None = None
     dg_queue: asyncio.Queue | None = None
     transcript_task: asyncio.Task | None = None
 
+    capture_fp = None
+    # ``(stream_ms, audio, speech)`` frames ready to forward (or gate).
+    ready: Any = ()
+
     try:
         async for raw_msg in websocket:
-            try:
-                msg = json.loads(raw_msg)
-            except json.JSONDecodeError:
-                logging.warning("Received non-JSON message: %s", raw_msg)
-                continue
-
-            event = msg.get("event")
+            if isinstance(raw_msg, bytes):
+                # Binary frames: the markers below are str. Invalid UTF-8
+                # then fails the JSON parse like any other bad message.
+                raw_msg = raw_msg.decode("utf-8", "replace")
+            if capture_fp is not None:
+                capture_fp.write(raw_msg)
+                capture_fp.write("\n")
+
+            # Hot path: media frames are ~all of the traffic, so recognise
+            # them without a full parse and drop conference outbound audio
+            # before decoding anything.
+            if _MEDIA_EVENT_MARKER in raw_msg:
+                stats.frames_in += 1
+                if (
+                    call_flow_type == "conference"
+                    and _OUTBOUND_TRACK_MARKER in raw_msg
+                ):
+                    continue
+                try:
+                    frame = _parse_media(raw_msg)
+                except ValueError:
+                    logging.warning("Received non-JSON message: %s", raw_msg)
+                    continue
+                event = "media"
+            else:
+                try:
+                    msg = _loads(raw_msg)
+                except ValueError:
+                    logging.warning("Received non-JSON message: %s", raw_msg)
+                    continue
+                event = msg.get("event")
+                if event == "media":
+                    frame = _frame_from_dict(msg)
 
             # -----------------------------------------------------------------
             # 1) START – extract metadata & bring Deepgram online
@@ -291,8 +1854,90 @@ async def _twilio_media_handler(
                     participant_label,
                 )
 
+                capture_dir = os.getenv("TWILIO_CAPTURE_DIR")
+                if capture_dir:
+                    os.makedirs(capture_dir, exist_ok=True)
+                    capture_fp = open(  # noqa: SIM115
+                        os.path.join(
+                            capture_dir,
+                            f"{msg.get('streamSid') or int(time.time())}.jsonl",
+                        ),
+                        "w",
+                        encoding="utf-8",
+                    )
+                    capture_fp.write(json.dumps(msg) + "\n")
+
+                stream_sid = msg.get("streamSid")
+                if stream_sid:
+                    _STREAMS[stream_sid] = stats
+                metadata.update(
+                    stream_sid=stream_sid,
+                    call_sid=start_info.get("callSid"),
+                    call_flow_type=call_flow_type,
+                    participant=participant_label,
+                    custom_parameters=params,
+                    started_at_epoch_ms=int(time.time() * 1000),
+                )
+
+                # Normal flow: the stream is on the caller's leg, so inbound
+                # is the caller (track1) and outbound the callee (track0).
+                channel_labels = None
+                if call_flow_type == "normal" and NORMAL_FLOW_MULTICHANNEL:
+                    channel_labels = [
+                        (
+                            "inbound",
+                            _safe_label(params.get("track1_label") or "caller"),
+                        ),
+                        (
+                            "outbound",
+                            _safe_label(params.get("track0_label") or "callee"),
+                        ),
+                    ]
+                    if channel_labels[0][1] == channel_labels[1][1]:
+                        channel_labels = [
+                            (track, f"{label}_{track}")
+                            for track, label in channel_labels
+                        ]
+                    channels = stats.channels = len(channel_labels)
+                    metadata["tracks"] = dict(channel_labels)
+                    tracks = tuple(track for track, _ in channel_labels)
+                elif call_flow_type == "conference":
+                    tracks = ("inbound",)
+                else:
+                    # Mixed mono normal flow: tracks interleave in arrival
+                    # order, so there is no single sequence to restore.
+                    tracks = ()
+                if tracks:
+                    jitter = stats.jitter = _JitterBuffer(
+                        tracks,
+                        depth=JITTER_BUFFER_MS // FRAME_MS,
+                        max_fill=JITTER_MAX_FILL_MS // FRAME_MS,
+                    )
+                    track_vads = [_new_vad() for _ in tracks]
+
                 # Initialise Deepgram connection **after** we've parsed metadata
-                dg_socket, dg_queue = await _create_deepgram_connection()
+                dg_socket, dg_queue = await _create_deepgram_connection(
+                    channels
+                )
+
+                def _send_to_deepgram(data: bytes, dg_socket=dg_socket) -> None:
+                    if dg_socket.send(data) or stats.shed_reason is not None:
+                        return
+                    # Deepgram can't keep up (or is gone): stop transcribing
+                    # this stream rather than buffer its audio without limit.
+                    stats.shed_reason = dg_socket.error or (
+                        f"Deepgram backlog over {DG_MAX_BACKLOG_MS} ms"
+                    )
+                    metadata["shed"] = stats.shed_reason
+                    _WORKER_STATE["shed_streams"] += 1
+                    logging.error(
+                        "Shedding stream %s: %s", stream_sid, stats.shed_reason
+                    )
+
+                batcher = _AudioBatcher(_send_to_deepgram, channels=channels)
+                stats.batcher = batcher
+                stats.dg_socket = dg_socket
+                stats.dg_queue = dg_queue
 
                 transcript_task = asyncio.create_task(
                     _consume_transcripts(
@@ -302,6 +1947,10 @@ async def _twilio_media_handler(
                             if call_flow_type == "normal"
                             else participant_label
                         ),
+                        timeline,
+                        metadata,
+                        stats,
+                        channel_labels,
                     ),
                 )
 
@@ -313,69 +1962,147 @@ async def _twilio_media_handler(
                     logging.warning("Media received before Start – ignored")
                     continue
 
-                media = msg.get("media", {})
-                track_name: str = media.get(
-                    "track", "inbound"
-                )  # inbound / outbound
+                if frame is None:
+                    continue
+                # track is inbound / outbound
+                track_name, frame_timestamp, payload_b64, frame_chunk = frame
 
                 if call_flow_type == "conference" and track_name != "inbound":
                     # Ignore conference mix/outbound tracks
                     continue
 
-                # ---------------------------------------------------------
-                # Establish precise epoch on the very first media frame.
-                # Twilio includes a `timestamp` (ms since stream start).  We
-                # capture wall-clock now and subtract that relative value so
-                # startEpochMs matches Deepgram's 0.0 reference.
-                # ---------------------------------------------------------
-                payload_b64 = media.get("payload")
                 if not payload_b64:
                     continue
 
                 try:
-                    audio_bytes = base64.b64decode(payload_b64)
+                    # a2b_base64 skips base64.b64decode's wrapper overhead;
+                    # the batcher's preallocated buffer is the reused copy.
+                    audio_bytes = binascii.a2b_base64(payload_b64)
                 except Exception as exc:
                     logging.warning("Bad base64 payload: %s", exc)
                     continue
 
-                # Skip forwarding completely silent frames **until** we've seen
-                # real audio once (saves Deepgram seconds & cost).
-                if not stream_active and _payload_is_silence(audio_bytes):
-                    continue  # wait for first non-silent chunk
+                # Position of this frame in the stream: Twilio's timestamp,
+                # else its chunk number, else the track's audio so far.
+                try:
+                    frame_ms = int(frame_timestamp)
+                except (TypeError, ValueError):
+                    try:
+                        frame_ms = (int(frame_chunk) - 1) * FRAME_MS
+                    except (TypeError, ValueError):
+                        frame_ms = received_ms.get(track_name, 0)
+                received_ms[track_name] = (
+                    frame_ms + len(audio_bytes) * 1000 // SAMPLE_RATE
+                )
+
+                # ---------------------------------------------------------
+                # Twilio's `timestamp` is ms since stream start; arrival
+                # wall-clock minus it estimates the start epoch. Keep the
+                # earliest estimate, and move an already calibrated epoch
+                # with it unless /set_start pinned it.
+                # ---------------------------------------------------------
+                arrival_epoch_ms = int(time.time() * 1000) - frame_ms
+                if clock_epoch_ms is None or arrival_epoch_ms < clock_epoch_ms:
+                    clock_epoch_ms = arrival_epoch_ms
+                    if (
+                        base_epoch_ms is not None
+                        and (stream_sid or "") not in STREAM_BASE_EPOCH_MS
+                    ):
+                        base_epoch_ms = clock_epoch_ms
+                        metadata["stream_start_epoch_ms"] = base_epoch_ms
+                        metadata["transcript_epoch_ms"] = (
+                            base_epoch_ms + origin_ms
+                        )
+
+                # Gate silence and line noise anywhere in the call (saves
+                # Deepgram seconds & cost); see the forwarding loop below.
+                if jitter is None:
+                    mixed.append((frame_ms, track_name, audio_bytes))
+                    if len(mixed) >= VAD_BATCH_FRAMES:
+                        ready = _gate_frames(mixed, vads)
+                        mixed = []
+                else:
+                    released.extend(
+                        jitter.push(track_name, frame_ms, audio_bytes)
+                    )
+                    if len(released) >= VAD_BATCH_FRAMES:
+                        ready = _gate_slots(released, track_vads)
+                        released = []
+
+            # -----------------------------------------------------------------
+            # 3) STOP – release what the jitter buffer still holds, clean up
+            # -----------------------------------------------------------------
+            elif event == "stop":
+                if jitter is not None:
+                    ready = _gate_slots(
+                        [*released, *jitter.flush()], track_vads
+                    )
+                elif mixed:
+                    ready = _gate_frames(mixed, vads)
+
+            # -----------------------------------------------------------------
+            # Forward released audio to Deepgram. Deepgram closes idle
+            # sockets, so send KeepAlive while nothing is being forwarded.
+            # -----------------------------------------------------------------
+            for frame_ms, audio_bytes, speech in ready:
+                if not speech:
+                    stats.frames_gated += 1
+                    # Speech just ended: don't hold its tail for the timer.
+                    batcher.flush()
+                    preroll.append((frame_ms, audio_bytes))
+                    if time.monotonic() - last_send >= DG_KEEPALIVE_S:
+                        dg_socket.keep_alive()
+                        stats.keepalives += 1
+                        last_send = time.monotonic()
+                    continue
+                stats.frames_voiced += 1
 
                 # Mark stream as active the first time we forward audio
                 if not stream_active:
                     stream_active = True
 
+                pending = [*preroll, (frame_ms, audio_bytes)]
+                preroll.clear()
+
                 # Calibrate epoch if not done yet (we may have delayed until
                 # first non-silent chunk).
                 if base_epoch_ms is None:
-                    ts_val = media.get("timestamp")
-                    try:
-                        rel_ms = int(ts_val)
-                        now_ms = int(time.time() * 1000)
-                        base_epoch_ms = now_ms - rel_ms
-                        logging.info(
-                            "Calibrated epoch for stream %s (rel %s ms)",
-                            base_epoch_ms,
-                            rel_ms,
-                        )
-                    except Exception:
-                        pass
+                    origin_ms = pending[0][0]
+                    # A /set_start that arrived before any audio wins.
+                    base_epoch_ms = STREAM_BASE_EPOCH_MS.get(
+                        stream_sid or "", clock_epoch_ms
+                    )
+                    metadata["stream_start_epoch_ms"] = base_epoch_ms
+                    # Epoch of transcript time 0 (the first forwarded frame).
+                    metadata["transcript_epoch_ms"] = base_epoch_ms + origin_ms
+                    logging.info(
+                        "Calibrated epoch for stream %s (origin %s ms)",
+                        base_epoch_ms,
+                        origin_ms,
+                    )
 
                 # Forward to Deepgram now that we have real audio
-                try:
-                    dg_socket.send(audio_bytes)
-                except Exception as exc:
-                    logging.error(
-                        "Failed to forward audio to Deepgram: %s", exc
+                for chunk_ms, chunk in pending:
+                    timeline.forward(
+                        (chunk_ms - origin_ms) * SAMPLE_RATE // 1000,
+                        len(chunk) // channels,
                     )
+                    batcher.add(chunk)
+                last_send = time.monotonic()
+            ready = ()
 
-            # -----------------------------------------------------------------
-            # 3) STOP – clean up
-            # -----------------------------------------------------------------
-            elif event == "stop":
-                logging.info("Stream %s stopped", msg.get("streamSid"))
+            if event == "stop":
+                logging.info(
+                    "Stream %s stopped – forwarded %.1fs of audio, %s gated "
+                    "gaps, %s frames in %s sends",
+                    msg.get("streamSid"),
+                    timeline.sent_seconds,
+                    timeline.gaps,
+                    batcher.frames if batcher else 0,
+                    batcher.sends if batcher else 0,
+                )
+                break
+            if stats.shed_reason is not None:
                 break
 
     except Exception as exc:
@@ -384,6 +2111,10 @@ async def _twilio_media_handler(
         # -------------------------------------------------------------
         # Tidy up Deepgram & transcript consumer regardless of exit path
         # -------------------------------------------------------------
+        if capture_fp is not None:
+            capture_fp.close()
+        if batcher is not None:
+            batcher.flush()
         if dg_socket is not None:
             try:
                 await dg_socket.finish()
@@ -398,18 +2129,233 @@ async def _twilio_media_handler(
             except asyncio.CancelledError:
                 pass
 
+        _ACTIVE_CONNECTIONS.discard(websocket)
+        if stream_sid and _STREAMS.get(stream_sid) is stats:
+            del _STREAMS[stream_sid]
+            STREAM_BASE_EPOCH_MS.pop(stream_sid, None)
         logging.info("Connection closed for %s", websocket.remote_address)
 
 
 ###############################################################################
-# Entrypoint
+# Control HTTP server
 ###############################################################################
 
+_HTTP_REASONS: dict[int, str] = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    503: "Service Unavailable",
+}
 
-async def main() -> None:
-    logging.info(
-        "Starting WebSocket server on %s:%s", WEBSOCKET_HOST, WEBSOCKET_PORT
+
+async def _handle_control_request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    routes: dict,
+) -> None:
+    """Serve one HTTP/1.1 request with a JSON response and close.
+
+    *routes* maps a path to ``async (method, query, body) -> (status, dict)``.
+    """
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), 5)
+        method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        headers: dict[str, str] = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = b""
+        length = int(headers.get("content-length") or 0)
+        if length:
+            body = await reader.readexactly(length)
+        path, _, query_string = target.partition("?")
+        query = dict(urllib.parse.parse_qsl(query_string))
+        route = routes.get(path)
+        if route is None:
+            status, payload = 404, {"error": f"Unknown path {path}"}
+        else:
+            status, payload = await route(method, query, body)
+    except Exception as exc:
+        status, payload = 400, {"error": str(exc)}
+
+    data = json.dumps(payload).encode()
+    writer.write(
+        (
+            f"HTTP/1.1 {status} {_HTTP_REASONS.get(status, '')}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode()
+        + data
     )
+    try:
+        await writer.drain()
+    finally:
+        writer.close()
+
+
+async def _start_control_server(
+    host: str, port: int, routes: dict
+) -> asyncio.Server:
+    return await asyncio.start_server(
+        lambda reader, writer: _handle_control_request(reader, writer, routes),
+        host,
+        port,
+    )
+
+
+async def _http_json(
+    port: int,
+    method: str,
+    path: str,
+    body: dict | None = None,
+    timeout: float = 2.0,
+) -> tuple[int, dict]:
+    """Minimal HTTP client for supervisor → worker control calls."""
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection("127.0.0.1", port), timeout
+    )
+    try:
+        data = json.dumps(body).encode() if body is not None else b""
+        writer.write(
+            (
+                f"{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+                f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n"
+            ).encode()
+            + data
+        )
+        raw = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    return int(head.split(b" ", 2)[1]), json.loads(payload or b"{}")
+
+
+###############################################################################
+# Worker
+###############################################################################
+
+
+def _worker_status() -> dict[str, Any]:
+    return {
+        "status": "draining" if _WORKER_STATE["draining"] else "ok",
+        "worker": _WORKER_STATE["worker"],
+        "pid": os.getpid(),
+        "active_streams": len(_ACTIVE_CONNECTIONS),
+        "shed_streams": _WORKER_STATE["shed_streams"],
+        "uptime_s": round(time.time() - _WORKER_STATE["started_at"], 1),
+    }
+
+
+async def _worker_health(method: str, query: dict, body: bytes):
+    return 200, _worker_status()
+
+
+async def _worker_stats(method: str, query: dict, body: bytes):
+    return 200, {
+        **_worker_status(),
+        # Keyed by channel count (JSON object keys are strings).
+        "deepgram_pools": {
+            str(channels): pool.stats()
+            for channels, pool in _DEEPGRAM_POOLS.items()
+        },
+        "live_transcripts": (
+            _LIVE_PUBLISHER["publisher"].stats()
+            if _LIVE_PUBLISHER.get("publisher") is not None
+            else None
+        ),
+        "streams": [stats.snapshot() for stats in _STREAMS.values()],
+    }
+
+
+def _set_start_args(query: dict, body: bytes) -> tuple[str, int]:
+    """Return ``(stream_sid, epoch_ms)`` from a JSON body or the query."""
+    args = {**query, **(json.loads(body) if body else {})}
+    stream_sid = args.get("stream_sid") or args.get("streamSid")
+    if not stream_sid or args.get("epoch_ms") is None:
+        raise ValueError("stream_sid and epoch_ms are required")
+    return str(stream_sid), int(args["epoch_ms"])
+
+
+async def _worker_set_start(method: str, query: dict, body: bytes):
+    """Re-anchor a live stream's start epoch (and its transcript's)."""
+    if method != "POST":
+        return 405, {"error": "POST required"}
+    stream_sid, epoch_ms = _set_start_args(query, body)
+    stats = _STREAMS.get(stream_sid)
+    if stats is None:
+        return 404, {"error": f"No live stream {stream_sid}"}
+    STREAM_BASE_EPOCH_MS[stream_sid] = epoch_ms
+    stats.set_start(epoch_ms)
+    logging.info("Stream %s re-anchored to epoch %s ms", stream_sid, epoch_ms)
+    return 200, {
+        "stream_sid": stream_sid,
+        "stream_start_epoch_ms": stats.metadata.get("stream_start_epoch_ms"),
+        "transcript_epoch_ms": stats.metadata.get("transcript_epoch_ms"),
+    }
+
+
+async def _search(method: str, query: dict, body: bytes):
+    """Look words up in the transcript index (any process can serve it)."""
+    index = _word_index()
+    if index is None:
+        return 404, {"error": "Transcript index disabled"}
+    args = {**query, **(json.loads(body) if body else {})}
+    words = await asyncio.to_thread(
+        index.search,
+        conference=args.get("conference"),
+        participant=args.get("participant"),
+        start_ms=float(args["start_ms"]) if args.get("start_ms") else None,
+        end_ms=float(args["end_ms"]) if args.get("end_ms") else None,
+        word=args.get("word"),
+        limit=int(args.get("limit") or 1000),
+    )
+    return 200, {"count": len(words), "words": words}
+
+
+_WORKER_ROUTES: dict[str, Any] = {
+    "/health": _worker_health,
+    "/stats": _worker_stats,
+    "/set_start": _worker_set_start,
+    "/search": _search,
+}
+
+
+async def _wait_drained(stop: asyncio.Future) -> None:
+    deadline = time.monotonic() + WORKER_DRAIN_TIMEOUT_S
+    while _ACTIVE_CONNECTIONS and time.monotonic() < deadline:
+        await asyncio.sleep(0.5)
+    if _ACTIVE_CONNECTIONS:
+        logging.warning(
+            "Drain timeout – closing %s live streams", len(_ACTIVE_CONNECTIONS)
+        )
+    if not stop.done():
+        stop.set_result(None)
+
+
+async def _serve(
+    control_host: str,
+    control_port: int,
+    reuse_port: bool = False,
+    on_ready=None,
+) -> None:
+    """Run the Twilio WebSocket server and control server until drained.
+
+    ``SIGTERM``/``SIGINT`` stop accepting new streams, wait (up to
+    ``WORKER_DRAIN_TIMEOUT_S``) for live ones to finish, then return.
+    """
+    loop = asyncio.get_running_loop()
+    stop: asyncio.Future = loop.create_future()
+    pool_tasks: list[asyncio.Task] = []
+    if DG_POOL_SIZE > 0:
+        # Mono for conference (and mixed normal) streams, stereo for
+        # multichannel normal streams.
+        for channels in (1, 2) if NORMAL_FLOW_MULTICHANNEL else (1,):
+            pool = _DEEPGRAM_POOLS[channels] = _DeepgramPool(
+                DG_POOL_SIZE, DG_POOL_IDLE_S, channels
+            )
+            pool_tasks.append(loop.create_task(pool.run()))
 
     async with serve(
         _twilio_media_handler,
@@ -417,12 +2363,319 @@ async def main() -> None:
         WEBSOCKET_PORT,
         subprotocols=cast(Any, ["twilio"]),  # Twilio requires this sub-protocol
         ping_interval=None,  # Twilio handles its own heartbeats
-    ):
-        await asyncio.Future()  # run forever
+        # Bounded: if a handler falls behind, Twilio waits on TCP.
+        max_queue=32,
+        reuse_port=reuse_port,
+    ) as ws_server:
+        control = await _start_control_server(
+            control_host, control_port, _WORKER_ROUTES
+        )
+        if on_ready is not None:
+            on_ready(control.sockets[0].getsockname()[1])
+
+        def drain() -> None:
+            if _WORKER_STATE["draining"]:
+                return
+            _WORKER_STATE["draining"] = True
+            logging.info(
+                "Draining – %s live streams, no new connections",
+                len(_ACTIVE_CONNECTIONS),
+            )
+            # Close only the listening socket; live streams carry on.
+            ws_server.server.close()
+            # No new streams will come to use the pooled sessions.
+            for pool in _DEEPGRAM_POOLS.values():
+                loop.create_task(pool.close())
+            loop.create_task(_wait_drained(stop))
+
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, drain)
+
+        await stop
+        control.close()
+        for task in pool_tasks:
+            task.cancel()
+        for pool in _DEEPGRAM_POOLS.values():
+            await pool.close()
+
+
+def _worker_main(index: int, ready_conn) -> None:
+    """Entry point of a supervised worker process."""
+    _WORKER_STATE["worker"] = index
+    asyncio.run(
+        _serve(
+            "127.0.0.1",
+            0,  # the supervisor learns the port through *ready_conn*
+            reuse_port=True,
+            on_ready=ready_conn.send,
+        )
+    )
+
+
+###############################################################################
+# Supervisor
+###############################################################################
+
+
+def _combine_pool_stats(workers: list[dict]) -> dict[str, Any]:
+    """Sum the workers' ``deepgram_pools`` per channel layout."""
+    combined: dict[str, Any] = {}
+    for worker in workers:
+        for key, pool in (worker.get("deepgram_pools") or {}).items():
+            total = combined.setdefault(
+                key, {"hits": 0, "misses": 0, "latency_saved_ms": 0}
+            )
+            for field in total:
+                total[field] += pool[field]
+    for total in combined.values():
+        lookups = total["hits"] + total["misses"]
+        total["hit_rate"] = (
+            round(total["hits"] / lookups, 3) if lookups else None
+        )
+    return combined
+
+
+class _Supervisor:
+    """Run N workers sharing ``WEBSOCKET_PORT`` through ``SO_REUSEPORT``.
+
+    The kernel spreads new Twilio connections across the workers. Each
+    worker exposes ``/health`` and ``/stats`` on a private loopback port;
+    the supervisor polls them, replaces workers that exit or fail
+    ``WORKER_MAX_HEALTH_FAILURES`` checks in a row, and aggregates them on
+    ``CONTROL_HTTP_PORT``. Replacements always start before the old worker
+    is told to drain, so the listening port never goes away.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.workers: dict[int, dict[str, Any]] = {}
+        self.draining: list[dict[str, Any]] = []
+        self._ctx = multiprocessing.get_context("spawn")
+        self._tasks: set[asyncio.Task] = set()
+        self._stopping = False
+
+    def _background(self, coro) -> None:
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _spawn(self, slot: int) -> dict[str, Any]:
+        parent_conn, child_conn = self._ctx.Pipe(duplex=False)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(slot, child_conn),
+            name=f"transcription-worker-{slot}",
+        )
+        process.start()
+        child_conn.close()
+        ready = await asyncio.to_thread(
+            parent_conn.poll, WORKER_START_TIMEOUT_S
+        )
+        control_port = parent_conn.recv() if ready else None
+        parent_conn.close()
+        if control_port is None:
+            logging.error("Worker %s (pid %s) did not start", slot, process.pid)
+        else:
+            logging.info("Worker %s started (pid %s)", slot, process.pid)
+        return {
+            "slot": slot,
+            "process": process,
+            "control_port": control_port,
+            "failures": 0,
+            "health": None,
+        }
+
+    async def _retire(self, worker: dict[str, Any]) -> None:
+        """Ask *worker* to drain and reap it once its streams are done."""
+        process = worker["process"]
+        self.draining.append(worker)
+        if process.is_alive():
+            os.kill(process.pid, signal.SIGTERM)
+        await asyncio.to_thread(process.join, WORKER_DRAIN_TIMEOUT_S + 30)
+        if process.is_alive():
+            logging.warning("Worker pid %s ignored drain; killing", process.pid)
+            process.kill()
+            await asyncio.to_thread(process.join)
+        self.draining.remove(worker)
+
+    async def restart(self, slot: int, reason: str) -> None:
+        logging.warning("Restarting worker %s: %s", slot, reason)
+        old = self.workers[slot]
+        self.workers[slot] = await self._spawn(slot)
+        self._background(self._retire(old))
+
+    async def rolling_restart(self) -> None:
+        for slot in sorted(self.workers):
+            await self.restart(slot, "rolling restart")
+
+    async def _check(self, slot: int) -> None:
+        worker = self.workers[slot]
+        process = worker["process"]
+        if not process.is_alive():
+            await self.restart(slot, f"exited with code {process.exitcode}")
+            return
+        try:
+            status, body = await _http_json(
+                worker["control_port"], "GET", "/health"
+            )
+            healthy = status == 200
+        except Exception:
+            healthy, body = False, None
+        worker["health"] = body if healthy else None
+        worker["failures"] = 0 if healthy else worker["failures"] + 1
+        if worker["failures"] >= WORKER_MAX_HEALTH_FAILURES:
+            await self.restart(slot, "failed health checks")
+
+    async def _monitor(self) -> None:
+        while not self._stopping:
+            await asyncio.gather(*(self._check(slot) for slot in self.workers))
+            await asyncio.sleep(WORKER_HEALTH_INTERVAL_S)
+
+    def _describe(self, worker: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "slot": worker["slot"],
+            "pid": worker["process"].pid,
+            "alive": worker["process"].is_alive(),
+            "failed_checks": worker["failures"],
+            **(worker["health"] or {}),
+        }
+
+    async def health(self, method: str, query: dict, body: bytes):
+        workers = [self._describe(w) for w in self.workers.values()]
+        healthy = sum(1 for w in workers if w.get("status") == "ok")
+        if healthy == self.size:
+            status = "ok"
+        else:
+            status = "degraded" if healthy else "down"
+        return (200 if healthy else 503), {
+            "status": status,
+            "workers": workers,
+            "draining": [self._describe(w) for w in self.draining],
+        }
+
+    async def stats(self, method: str, query: dict, body: bytes):
+        # Draining workers still carry live streams, so include them.
+        workers = [*self.workers.values(), *self.draining]
+
+        async def fetch(worker):
+            try:
+                _, stats = await _http_json(
+                    worker["control_port"], "GET", "/stats"
+                )
+            except Exception as exc:
+                stats = {"error": str(exc)}
+            return {"slot": worker["slot"], **stats}
+
+        results = await asyncio.gather(*(fetch(w) for w in workers))
+        return 200, {
+            "active_streams": sum(r.get("active_streams", 0) for r in results),
+            "shed_streams": sum(r.get("shed_streams", 0) for r in results),
+            "deepgram_pools": _combine_pool_stats(results),
+            "workers": results,
+        }
+
+    async def set_start(self, method: str, query: dict, body: bytes):
+        """Forward ``/set_start`` to the worker that owns the stream."""
+        if method != "POST":
+            return 405, {"error": "POST required"}
+        stream_sid, epoch_ms = _set_start_args(query, body)
+        # Only the owning worker knows the stream; ask them all.
+        replies = await asyncio.gather(
+            *(
+                _http_json(
+                    w["control_port"],
+                    "POST",
+                    "/set_start",
+                    {"stream_sid": stream_sid, "epoch_ms": epoch_ms},
+                )
+                for w in [*self.workers.values(), *self.draining]
+            ),
+            return_exceptions=True,
+        )
+        for reply in replies:
+            if not isinstance(reply, BaseException) and reply[0] == 200:
+                return reply
+        return 404, {"error": f"No live stream {stream_sid}"}
+
+    async def run(self) -> None:
+        _recover_transcripts()
+        for slot in range(self.size):
+            self.workers[slot] = await self._spawn(slot)
+        control = await _start_control_server(
+            WEBSOCKET_HOST,
+            CONTROL_HTTP_PORT,
+            {
+                "/health": self.health,
+                "/stats": self.stats,
+                "/set_start": self.set_start,
+                "/search": _search,
+            },
+        )
+        logging.info(
+            "Supervisor running %s workers on %s:%s (control :%s)",
+            self.size,
+            WEBSOCKET_HOST,
+            WEBSOCKET_PORT,
+            CONTROL_HTTP_PORT,
+        )
+
+        loop = asyncio.get_running_loop()
+        stop: asyncio.Future = loop.create_future()
+        loop.add_signal_handler(
+            signal.SIGHUP, lambda: self._background(self.rolling_restart())
+        )
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(
+                sig, lambda: stop.done() or stop.set_result(None)
+            )
+        monitor = loop.create_task(self._monitor())
+
+        await stop
+        logging.info("Supervisor stopping – draining all workers")
+        self._stopping = True
+        monitor.cancel()
+        control.close()
+        await asyncio.gather(
+            *(self._retire(w) for w in self.workers.values()), *self._tasks
+        )
+
+
+###############################################################################
+# Entrypoint
+###############################################################################
+
+
+async def main() -> None:
+    _recover_transcripts()
+    logging.info(
+        "Starting WebSocket server on %s:%s (control :%s)",
+        WEBSOCKET_HOST,
+        WEBSOCKET_PORT,
+        CONTROL_HTTP_PORT,
+    )
+    await _serve(WEBSOCKET_HOST, CONTROL_HTTP_PORT)
 
 
 if __name__ == "__main__":
+    # Checked here rather than at import so tools and benchmarks can import
+    # the module without a key.
+    if not DEEPGRAM_API_KEY:
+        raise OSError(
+            "DEEPGRAM_API_KEY environment variable not set. "
+            "Please export it first."
+        )
+    parser = argparse.ArgumentParser(description="Twilio → Deepgram server")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=TRANSCRIPTION_WORKERS,
+        help="worker processes sharing the port (default: 1, no supervisor)",
+    )
+    args = parser.parse_args()
     try:
-        asyncio.run(main())
+        if args.workers > 1:
+            asyncio.run(_Supervisor(args.workers).run())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logging.info("Server interrupted by user – shutting down.")
@@ -1,7 +1,45 @@
+"""Shift transcript word times to absolute epoch.
+
+Interactive use adjusts one file and asks for the epoch. ``--batch`` adjusts
+whole directories without prompting: each transcript's epoch comes from a
+``--manifest`` (CSV ``file,epoch_ms`` or a JSON ``{file: epoch_ms}`` object),
+``--epoch-ms``, or its own metadata, and files are streamed through an
+incremental parser on a process pool. Inputs are hashed (SHA-256) and
+recorded in an index next to the outputs, so re-running over the same
+directories only touches new transcripts.
+
+Usage::
+
+    python scripts/adjust_json_timestamps.py transcripts/alice-1.json
+    python scripts/adjust_json_timestamps.py --batch transcripts \
+        --output-dir adjusted --workers 8
+"""
+
 import argparse
+import contextlib
+import csv
+import hashlib
 import json
 import os
-from typing import Any
+import re
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, TextIO
+
+from transcript_stream import (
+    IncrementalJSONReader,
+    anchor_epoch_ms,
+    read_metadata,
+)
+
+ADJUSTED_SUFFIX = "-adjusted.json"
+INDEX_NAME = ".adjusted-index.jsonl"
+
+_OBJECT_START = re.compile(r"\s*\{")
+_OBJECT_END = re.compile(r"\s*\}")
+_ARRAY_START = re.compile(r"\s*\[")
+_ARRAY_END = re.compile(r"\s*\]")
+_COLON = re.compile(r"\s*:")
 
 
 def _adjust_word_time(word: dict[str, Any], epoch_start_ms: int) -> None:
@@ -35,6 +73,323 @@ def adjust_transcript(
     return data
 
 
+def _adjust_result(result: Any, epoch_start_ms: int) -> Any:
+    if isinstance(result, dict):
+        for alt in result.get("alternatives", []):
+            for word in alt.get("words", []):
+                _adjust_word_time(word, epoch_start_ms)
+    return result
+
+
+def _expect(reader: IncrementalJSONReader, pattern: re.Pattern) -> None:
+    if not reader.match(pattern):
+        raise ValueError(f"expected {pattern.pattern!r}")
+
+
+def _stream_object(
+    reader: IncrementalJSONReader,
+    out: TextIO,
+    write_member,
+) -> None:
+    """Copy a JSON object from *reader* to *out*, member by member."""
+    _expect(reader, _OBJECT_START)
+    out.write("{")
+    first = True
+    while reader.peek() != "}":
+        key = reader.value()
+        if not isinstance(key, str):
+            raise ValueError("object key is not a string")
+        _expect(reader, _COLON)
+        if not first:
+            out.write(", ")
+        first = False
+        out.write(json.dumps(key, ensure_ascii=False) + ": ")
+        write_member(key)
+    _expect(reader, _OBJECT_END)
+    out.write("}")
+
+
+def _stream_array(reader: IncrementalJSONReader, out: TextIO, write_item):
+    """Copy a JSON array from *reader* to *out*, item by item."""
+    _expect(reader, _ARRAY_START)
+    out.write("[")
+    first = True
+    while reader.peek() != "]":
+        if not first:
+            out.write(", ")
+        first = False
+        write_item()
+    _expect(reader, _ARRAY_END)
+    out.write("]")
+
+
+def stream_adjust(fp: TextIO, out: TextIO, epoch_start_ms: int) -> None:
+    """Adjust the transcript in *fp* into *out* one result at a time.
+
+    Produces exactly what ``json.dump(adjust_transcript(json.load(fp)))``
+    would, holding a single result in memory. Raises ValueError when the
+    document is not shaped like a transcript.
+    """
+    reader = IncrementalJSONReader(fp)
+
+    def copy_value() -> None:
+        out.write(json.dumps(reader.value(), ensure_ascii=False))
+
+    def copy_result() -> None:
+        result = _adjust_result(reader.value(), epoch_start_ms)
+        out.write(json.dumps(result, ensure_ascii=False))
+
+    def transcription_member(key: str) -> None:
+        if key == "results" and reader.peek() == "[":
+            _stream_array(reader, out, copy_result)
+        else:
+            copy_value()
+
+    def transcription_item() -> None:
+        if reader.peek() == "{":
+            _stream_object(reader, out, transcription_member)
+        else:
+            copy_value()
+
+    def top_member(key: str) -> None:
+        if key == "transcription" and reader.peek() == "[":
+            _stream_array(reader, out, transcription_item)
+        else:
+            copy_value()
+
+    _stream_object(reader, out, top_member)
+    if reader.peek():
+        raise ValueError("trailing data after transcript")
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fp:
+        while chunk := fp.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def adjust_file(input_path: str, output_path: str, epoch_start_ms: int) -> str:
+    """Adjust *input_path* into *output_path* (atomically).
+
+    Streams the document when it has the usual transcript shape and falls
+    back to loading it whole otherwise. Returns the mode used.
+    """
+    tmp_path = output_path + ".tmp"
+    try:
+        try:
+            with (
+                open(input_path, encoding="utf-8") as fp,
+                open(tmp_path, "w", encoding="utf-8") as out,
+            ):
+                stream_adjust(fp, out, epoch_start_ms)
+            mode = "streamed"
+        except ValueError:
+            with open(input_path, encoding="utf-8") as fp:
+                data = json.load(fp)
+            if not isinstance(data, dict):
+                raise ValueError("not a transcript object")
+            with open(tmp_path, "w", encoding="utf-8") as out:
+                json.dump(
+                    adjust_transcript(data, epoch_start_ms),
+                    out,
+                    ensure_ascii=False,
+                )
+            mode = "loaded"
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    return mode
+
+
+def load_manifest(path: str) -> dict[str, int]:
+    """Read ``file -> epoch_ms`` from a CSV or JSON manifest."""
+    with open(path, encoding="utf-8", newline="") as fp:
+        if path.lower().endswith(".json"):
+            entries = json.load(fp).items()
+        else:
+            entries = (
+                (row["file"], row["epoch_ms"]) for row in csv.DictReader(fp)
+            )
+        return {name: int(epoch) for name, epoch in entries}
+
+
+def _epoch_for(
+    manifest: dict[str, int], path: str, default: int | None
+) -> int | None:
+    for key in (path, os.path.abspath(path), os.path.basename(path)):
+        if key in manifest:
+            return manifest[key]
+    return default
+
+
+def iter_transcripts(paths: list[str]) -> Iterator[str]:
+    """Transcript files under *paths*, skipping our own outputs."""
+    for path in paths:
+        if os.path.isdir(path):
+            names = sorted(
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if name.lower().endswith(".json")
+            )
+        else:
+            names = [path]
+        for name in names:
+            if not name.endswith(ADJUSTED_SUFFIX):
+                yield name
+
+
+def latest_transcript(directory: str) -> str | None:
+    """The newest transcript in *directory*.
+
+    Read from the word index the transcription server keeps in
+    ``<directory>/index`` when there is one (newest by the transcript's
+    own start time); otherwise the most recently written file, found by
+    scanning the directory once. Earlier ``-adjusted.json`` outputs are
+    never picked.
+    """
+    index_dir = os.path.join(directory, "index")
+    if os.path.exists(os.path.join(index_dir, "MANIFEST")):
+        from transcript_index import TranscriptIndex
+
+        for entry in reversed(TranscriptIndex(index_dir).files()):
+            if os.path.exists(entry["path"]):
+                return entry["path"]
+    newest = None
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name.lower()
+            if not name.endswith(".json") or name.endswith(ADJUSTED_SUFFIX):
+                continue
+            mtime = entry.stat().st_mtime
+            if newest is None or mtime > newest[0]:
+                newest = (mtime, entry.path)
+    return newest[1] if newest else None
+
+
+def output_path_for(input_path: str, output_dir: str | None) -> str:
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    directory = output_dir or os.path.dirname(input_path)
+    return os.path.join(directory, stem + ADJUSTED_SUFFIX)
+
+
+def read_index(path: str) -> dict[str, dict[str, Any]]:
+    """Load the ``sha256 -> record`` index of already adjusted inputs."""
+    index: dict[str, dict[str, Any]] = {}
+    try:
+        with open(path, encoding="utf-8") as fp:
+            for line in fp:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn last line
+                index[record["sha256"]] = record
+    except FileNotFoundError:
+        pass
+    return index
+
+
+# Index entries the pool workers check before adjusting a file.
+_WORKER_INDEX: dict[str, dict[str, Any]] = {}
+
+
+def _init_worker(index: dict[str, dict[str, Any]]) -> None:
+    global _WORKER_INDEX
+    _WORKER_INDEX = index
+
+
+def _process(
+    input_path: str, output_path: str, epoch_ms: int | None, force: bool
+) -> dict[str, Any]:
+    """Adjust one file in a worker; return its index record and status.
+
+    An epoch from the manifest or ``--epoch-ms`` is applied as given;
+    otherwise it comes from the file's metadata.
+    """
+    record: dict[str, Any] = {"input": input_path, "output": output_path}
+    if epoch_ms is None:
+        try:
+            metadata = read_metadata(input_path)
+        except ValueError:
+            metadata = {}  # no metadata: needs a manifest or --epoch-ms
+        except OSError as exc:
+            return {**record, "status": f"error: {exc}"}
+        if metadata.get("time_base") == "epoch":
+            return {**record, "status": "already absolute"}
+        epoch_ms = anchor_epoch_ms(metadata)
+        if epoch_ms is None:
+            return {**record, "status": "no epoch"}
+    record["epoch_ms"] = epoch_ms
+    record["sha256"] = _file_digest(input_path)
+    known = _WORKER_INDEX.get(record["sha256"])
+    if (
+        not force
+        and known is not None
+        and known.get("epoch_ms") == epoch_ms
+        and os.path.exists(known["output"])
+    ):
+        return {**record, "status": "unchanged"}
+    try:
+        record["mode"] = adjust_file(input_path, output_path, epoch_ms)
+    except (OSError, ValueError) as exc:
+        return {**record, "status": f"error: {exc}"}
+    return {**record, "status": "adjusted"}
+
+
+def run_batch(
+    paths: list[str],
+    output_dir: str | None = None,
+    manifest: dict[str, int] | None = None,
+    epoch_ms: int | None = None,
+    workers: int | None = None,
+    index_path: str | None = None,
+    force: bool = False,
+) -> dict[str, int]:
+    """Adjust every transcript under *paths*; return a count per status."""
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    if index_path is None:
+        roots = [
+            p if os.path.isdir(p) else os.path.dirname(p)
+            for p in map(os.path.abspath, paths)
+        ]
+        index_path = os.path.join(
+            output_dir or os.path.commonpath(roots), INDEX_NAME
+        )
+    index = read_index(index_path)
+    counts: dict[str, int] = {}
+    with (
+        ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(index,)
+        ) as pool,
+        open(index_path, "a", encoding="utf-8") as index_fp,
+    ):
+        futures = [
+            pool.submit(
+                _process,
+                path,
+                output_path_for(path, output_dir),
+                _epoch_for(manifest or {}, path, epoch_ms),
+                force,
+            )
+            for path in iter_transcripts(paths)
+        ]
+        for future in as_completed(futures):
+            record = future.result()
+            status = record.pop("status")
+            key = "error" if status.startswith("error") else status
+            counts[key] = counts.get(key, 0) + 1
+            if status == "adjusted":
+                index_fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+                index_fp.flush()
+            elif key in ("error", "no epoch"):
+                print(f"{record['input']}: {status}")
+    return counts
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Adjust Deepgram transcript JSON times to absolute epoch."
@@ -51,8 +406,56 @@ def main() -> None:
         help="Optional path for the output JSON file. Defaults to <input>_adjusted.json",
         default=None,
     )
+    parser.add_argument(
+        "--epoch-ms",
+        type=int,
+        default=None,
+        help="Epoch start in ms; skips the prompt (batch: default for files "
+        "missing from the manifest)",
+    )
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="PATH",
+        help="Adjust these transcript files/directories without prompting",
+    )
+    batch.add_argument(
+        "--manifest", help="CSV (file,epoch_ms) or JSON {file: epoch_ms}"
+    )
+    batch.add_argument(
+        "--output-dir", help="Where to write outputs (default: beside inputs)"
+    )
+    batch.add_argument(
+        "--workers", type=int, default=None, help="Worker processes"
+    )
+    batch.add_argument(
+        "--index",
+        default=None,
+        help=f"Hash index of adjusted inputs (default: {INDEX_NAME} in the "
+        "output directory)",
+    )
+    batch.add_argument(
+        "--force", action="store_true", help="Re-adjust indexed inputs"
+    )
     args = parser.parse_args()
 
+    if args.batch:
+        counts = run_batch(
+            args.batch,
+            output_dir=args.output_dir,
+            manifest=load_manifest(args.manifest) if args.manifest else None,
+            epoch_ms=args.epoch_ms,
+            workers=args.workers,
+            index_path=args.index,
+            force=args.force,
+        )
+        print(
+            ", ".join(f"{n} {status}" for status, n in sorted(counts.items()))
+            or "No transcripts found."
+        )
+        return
+
     input_path = args.input
     if input_path is None:
         # Auto-select the most recent *.json file within the "transcripts" dir.
@@ -62,36 +465,28 @@ def main() -> None:
                 "No input file specified and 'transcripts' directory not found."
             )
 
-        json_files = [
-            os.path.join(transcripts_dir, f)
-            for f in os.listdir(transcripts_dir)
-            if f.lower().endswith(".json")
-        ]
-        if not json_files:
+        input_path = latest_transcript(transcripts_dir)
+        if input_path is None:
             raise SystemExit(
                 "No JSON transcripts found in 'transcripts'. Please specify input file."
             )
-
-        input_path = max(json_files, key=os.path.getmtime)
         print(f"Auto-selected latest transcript: {input_path}")
 
-    with open(input_path, encoding="utf-8") as fp:
-        data = json.load(fp)
-
-    # Always prompt the user for the desired absolute epoch start (ms).
-    user_epoch_ms = int(
-        input("Enter epoch start in milliseconds (absolute) to align with: ")
-    )
-
-    adjusted = adjust_transcript(data, user_epoch_ms)
+    # Prompt for the desired absolute epoch start (ms) unless it was given.
+    user_epoch_ms = args.epoch_ms
+    if user_epoch_ms is None:
+        user_epoch_ms = int(
+            input(
+                "Enter epoch start in milliseconds (absolute) to align with: "
+            )
+        )
 
     # Default output path: same name with "-adjusted" inserted before the
     # extension unless the user overrides with --output.
     output_path = (
         args.output or f"{os.path.splitext(input_path)[0]}-adjusted.json"
     )
-    with open(output_path, "w", encoding="utf-8") as fp:
-        json.dump(adjusted, fp, ensure_ascii=False)
+    adjust_file(input_path, output_path, user_epoch_ms)
 
     print(f"Adjusted transcript written to {output_path}")
 
@@ -0,0 +1,299 @@
+"""Merge per-participant conference transcripts into one timeline.
+
+Conference streams write one ``transcripts/<participant>-<epoch_ms>.json``
+per stream (and a new one after every hold/unhold). Each file's word times
+are relative to its own stream; this tool anchors every file on the epoch
+the transcription server calibrated (``transcript_epoch_ms``, falling back
+to the ``stream_start_time_in_epoch_seconds`` stream parameter), k-way
+merges the words by absolute time and writes them relative to the
+conference recording (``recording_start_time_in_epoch_seconds``).
+
+Files are read incrementally and the output is written as it is merged, so
+memory stays constant however long the conference ran.
+
+Usage::
+
+    python scripts/merge_conference_transcripts.py --conference my-room
+    python scripts/merge_conference_transcripts.py alice-1.json bob-2.json \
+        --output merged.json --time-base epoch
+"""
+
+import argparse
+import glob
+import heapq
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator
+from typing import Any, NamedTuple, TextIO
+
+from transcript_stream import (
+    IncrementalJSONReader,
+    anchor_epoch_ms,
+    epoch_param_ms,
+    read_metadata,
+    speaker_of,
+)
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_MS = 1_000_000
+# A speaker turn ends at a pause this long, or at this many words.
+TURN_GAP_NS = 1_500_000_000
+TURN_MAX_WORDS = 200
+
+_RESULTS_RE = re.compile(r'"results"\s*:\s*\[')
+
+
+class Word(NamedTuple):
+    start_ns: int
+    end_ns: int
+    speaker: str
+    word: str
+
+
+def _time_ns(value: dict[str, Any]) -> int:
+    # Nanos are strings in files written by adjust_json_timestamps.py.
+    return int(value.get("seconds", 0)) * NS_PER_SECOND + int(
+        value.get("nanos", 0)
+    )
+
+
+def iter_words(path: str) -> Iterator[tuple[int, int, str, bool]]:
+    """Yield ``(start_ns, end_ns, word, absolute)`` for every word of *path*.
+
+    Reads merged ``.json`` transcripts result by result, their compact
+    ``.tbin`` form batch by batch, and the live ``.jsonl`` journals the
+    transcription server keeps while a stream runs. *absolute* is True when
+    the file already holds epoch times.
+    """
+    if path.endswith(".tbin"):
+        from transcript_binary import TranscriptBinaryReader
+
+        with TranscriptBinaryReader(path) as reader:
+            for start, end, word in reader.iter_words():
+                yield start, end, word, reader.epoch
+        return
+    with open(path, encoding="utf-8") as fp:
+        if path.endswith(".jsonl"):
+            next(fp, None)  # metadata
+            for line in fp:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    return  # the line being written right now
+                yield from (
+                    (start, end, word, False)
+                    for word, start, end in zip(
+                        record.get("w", ()),
+                        record.get("s", ()),
+                        record.get("e", ()),
+                    )
+                )
+            return
+        reader = IncrementalJSONReader(fp)
+        reader.skip_past(_RESULTS_RE)
+        while reader.peek() not in ("]", ""):
+            result = reader.value()
+            for alt in result.get("alternatives", [])[:1]:
+                for word in alt.get("words", []):
+                    start = word.get("startTime", {})
+                    yield (
+                        _time_ns(start),
+                        _time_ns(word.get("endTime", start)),
+                        word.get("word", ""),
+                        "finalseconds" in start,
+                    )
+
+
+def recording_start_ms(metadatas: Iterable[dict[str, Any]]) -> int | None:
+    """The conference recording start passed to the participant streams."""
+    starts = [
+        epoch_param_ms(
+            m.get("custom_parameters") or {},
+            "recording_start_time_in_epoch_seconds",
+        )
+        for m in metadatas
+    ]
+    return min((s for s in starts if s is not None), default=None)
+
+
+def _absolute_words(path: str, metadata: dict[str, Any]) -> Iterator[Word]:
+    anchor_ns = (anchor_epoch_ms(metadata) or 0) * NS_PER_MS
+    speaker = speaker_of(metadata, path)
+    for start, end, word, absolute in iter_words(path):
+        offset = 0 if absolute else anchor_ns
+        yield Word(start + offset, end + offset, speaker, word)
+
+
+def iter_conference_words(
+    paths: Iterable[str],
+) -> Iterator[Word]:
+    """K-way merge the words of *paths* by absolute (epoch ns) start time.
+
+    Each file is consumed lazily; at most one pending word per file is held.
+    """
+    streams = [_absolute_words(p, read_metadata(p)) for p in paths]
+    return heapq.merge(*streams, key=lambda w: (w.start_ns, w.end_ns))
+
+
+def find_conference_files(directory: str, conference_name: str) -> list[str]:
+    """Transcripts in *directory* whose stream carried *conference_name*.
+
+    A ``.tbin`` copy is used instead of the ``.json`` it was written with.
+    """
+    by_stem: dict[str, str] = {}
+    for pattern in ("*.json", "*.tbin"):
+        for path in glob.glob(os.path.join(directory, pattern)):
+            by_stem[os.path.splitext(path)[0]] = path
+    paths = []
+    for path in sorted(by_stem.values()):
+        try:
+            params = read_metadata(path).get("custom_parameters") or {}
+        except (OSError, ValueError):
+            continue
+        if params.get("conference_name") == conference_name:
+            paths.append(path)
+    return paths
+
+
+def _format_time(ns: int) -> str:
+    seconds, nanos = divmod(ns, NS_PER_SECOND)
+    return '{"seconds": %d, "nanos": %d}' % (seconds, nanos)
+
+
+def merge_conference(
+    paths: list[str],
+    out: TextIO,
+    time_base: str = "recording",
+    conference_name: str | None = None,
+) -> int:
+    """Write the merged transcript of *paths* to *out*; return the word count.
+
+    The output keeps the per-stream schema – ``transcription[0].results`` of
+    ``{"alternatives": [{"words": [...]}]}`` – with one result per speaker
+    turn and a ``speaker`` field. Times are relative to the recording start
+    (``time_base="recording"``; the earliest stream when no recording start
+    was passed) or absolute epoch (``"epoch"``).
+    """
+    metadatas = [read_metadata(p) for p in paths]
+    anchors = [anchor_epoch_ms(m) for m in metadatas]
+    if time_base == "epoch":
+        origin_ms = 0
+    else:
+        origin_ms = recording_start_ms(metadatas)
+        if origin_ms is None:
+            origin_ms = min((a for a in anchors if a is not None), default=0)
+    metadata = {
+        "conference_name": conference_name,
+        "time_base": time_base,
+        "origin_epoch_ms": origin_ms,
+        "sources": [
+            {
+                "path": path,
+                "participant": speaker_of(m, path),
+                "anchor_epoch_ms": anchor,
+            }
+            for path, m, anchor in zip(paths, metadatas, anchors)
+        ],
+    }
+    origin_ns = origin_ms * NS_PER_MS
+
+    out.write('{"metadata": ')
+    out.write(json.dumps(metadata, ensure_ascii=False))
+    out.write(', "transcription": [{"results": [')
+    count = 0
+    turns = 0
+    turn: list[str] = []
+    speaker = None
+    last_end = 0
+
+    def flush() -> None:
+        nonlocal turns
+        if not turn:
+            return
+        if turns:
+            out.write(", ")
+        out.write(
+            '{"speaker": %s, "alternatives": [{"words": ['
+            % (json.dumps(speaker, ensure_ascii=False))
+        )
+        out.write(", ".join(turn))
+        out.write("]}]}")
+        turn.clear()
+        turns += 1
+
+    for word in iter_conference_words(paths):
+        if (
+            word.speaker != speaker
+            or word.start_ns - last_end > TURN_GAP_NS
+            or len(turn) >= TURN_MAX_WORDS
+        ):
+            flush()
+            speaker = word.speaker
+        turn.append(
+            '{"word": %s, "startTime": %s, "endTime": %s}'
+            % (
+                json.dumps(word.word, ensure_ascii=False),
+                _format_time(word.start_ns - origin_ns),
+                _format_time(word.end_ns - origin_ns),
+            )
+        )
+        last_end = max(last_end, word.end_ns)
+        count += 1
+    flush()
+    out.write("]}]}")
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Merge per-participant conference transcripts."
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="*",
+        help="Transcript files (.json, .tbin or live .jsonl)",
+    )
+    parser.add_argument(
+        "--conference",
+        help="Merge every transcript whose stream carried this "
+        "conference_name",
+    )
+    parser.add_argument(
+        "--transcripts-dir",
+        default=os.path.join(os.getcwd(), "transcripts"),
+        help="Where to look for --conference transcripts",
+    )
+    parser.add_argument(
+        "--time-base",
+        choices=("recording", "epoch"),
+        default="recording",
+        help="Word times relative to the recording start, or absolute",
+    )
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Output path. Defaults to conference-<name>.json",
+    )
+    args = parser.parse_args()
+
+    paths = list(args.inputs)
+    if args.conference:
+        paths += find_conference_files(args.transcripts_dir, args.conference)
+    if not paths:
+        raise SystemExit("No transcripts to merge.")
+
+    output_path = (
+        args.output or f"conference-{args.conference or 'merged'}.json"
+    )
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as out:
+        count = merge_conference(paths, out, args.time_base, args.conference)
+    os.replace(tmp_path, output_path)
+    print(
+        f"Merged {count} words from {len(paths)} transcripts into {output_path}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,603 @@
+"""Compact binary transcripts (``.tbin``) and lossless JSON conversion.
+
+A ``.tbin`` file holds the same data as a transcript JSON document in a
+fraction of the space and parses several times faster::
+
+    file    := b"TBIN" version:u8 record*
+    record  := varint(length) type:u8 payload     (length covers type+payload)
+    "M"     := varint(time style) UTF-8 JSON metadata          (first record)
+    "D"     := varint(count) (varint(length) UTF-8 word)*  appended to the
+               word dictionary
+    "R"     := varints: result count k, k word counts, then per word its
+               dictionary id, zigzag(start - previous start) and
+               zigzag(end - start), in ns
+
+Words are stored once in the dictionary and referenced by id; start times
+are deltas from the previous word (across batches), so most take one or
+two bytes. A batch ("R" record) holds whole results, up to about
+``batch_words`` words, and its varints are encoded and decoded as NumPy
+arrays. The time style records which JSON time objects the words had:
+relative ``{"seconds", "nanos"}`` (the transcription server's default) or
+absolute epoch with string nanos and ``finalseconds``/``finalnanos``
+(``TRANSCRIPT_EPOCH_TIMES`` and ``adjust_json_timestamps.py``). Documents of
+any other shape are rejected rather than converted lossily; converting back
+gives the document the server or the adjust script wrote, byte for byte.
+A reader stops at a torn final record, so files can be read while written.
+
+Usage::
+
+    python scripts/transcript_binary.py to-binary transcripts/alice-1.json
+    python scripts/transcript_binary.py to-json transcripts/alice-1.tbin
+    python scripts/transcript_binary.py to-binary transcripts --check
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import mmap
+import os
+import re
+import sys
+from collections.abc import Iterator, Sequence
+from typing import Any, BinaryIO, TextIO
+
+import numpy as np
+
+from transcript_stream import IncrementalJSONReader
+
+MAGIC = b"TBIN"
+VERSION = 1
+STYLE_RELATIVE = 0
+STYLE_EPOCH = 1
+NS_PER_SECOND = 1_000_000_000
+
+_METADATA = b"M"
+_DICTIONARY = b"D"
+_RESULTS = b"R"
+_BODY_START = re.compile(
+    r'\s*,\s*"transcription"\s*:\s*\[\s*\{\s*"results"\s*:\s*\['
+)
+_BODY_END = re.compile(r"\s*\]\s*\}\s*\]\s*\}\s*$")
+_METADATA_START = re.compile(r'\s*\{\s*"metadata"\s*:')
+_SEVEN = np.uint64(7)
+
+
+def _uvarint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _read_uvarint(buf, pos: int) -> tuple[int, int]:
+    """Decode one varint at *pos*; return ``(value, next_pos)``."""
+    value = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """LEB128-encode an array of non-negative integers."""
+    values = np.asarray(values, dtype=np.uint64)
+    lengths = np.ones(len(values), dtype=np.int64)
+    rest = values >> _SEVEN
+    while rest.any():
+        lengths += rest > 0
+        rest >>= _SEVEN
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    offsets = np.cumsum(lengths) - lengths
+    live = np.arange(len(values))
+    for k in range(int(lengths.max(initial=0))):
+        live = live[lengths[live] > k]
+        byte = (values[live] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        more = (lengths[live] > k + 1).astype(np.uint8) << 7
+        out[offsets[live] + k] = byte.astype(np.uint8) | more
+    return out.tobytes()
+
+
+def decode_varints(data) -> np.ndarray:
+    """Decode every LEB128 varint in *data* into a ``uint64`` array."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    last = np.flatnonzero(raw < 0x80)
+    first = np.empty_like(last)
+    first[:1] = 0
+    first[1:] = last[:-1] + 1
+    lengths = last - first + 1
+    values = np.zeros(len(last), dtype=np.uint64)
+    live = np.arange(len(last))
+    for k in range(int(lengths.max(initial=0))):
+        live = live[lengths[live] > k]
+        values[live] |= (raw[first[live] + k] & 0x7F).astype(
+            np.uint64
+        ) << np.uint64(7 * k)
+    return values
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    values = values.astype(np.int64)
+    return ((values << 1) ^ (values >> 63)).view(np.uint64)
+
+
+def _unzigzag(values: np.ndarray) -> np.ndarray:
+    return (values >> np.uint64(1)).view(np.int64) ^ -(
+        values & np.uint64(1)
+    ).view(np.int64)
+
+
+class TranscriptBinaryWriter:
+    """Write a ``.tbin`` transcript to a binary file object.
+
+    Results are buffered and written as batches of about *batch_words*
+    words; :meth:`close` writes the last one.
+    """
+
+    def __init__(
+        self,
+        fp: BinaryIO,
+        metadata: dict[str, Any],
+        epoch: bool = False,
+        batch_words: int = 4096,
+    ):
+        self._fp = fp
+        self.batch_words = batch_words
+        self._ids: dict[str, int] = {}
+        self._new_words: list[str] = []
+        self._counts: list[int] = []
+        self._word_ids: list[np.ndarray] = []
+        self._starts: list[np.ndarray] = []
+        self._ends: list[np.ndarray] = []
+        self._pending = 0
+        self._previous_start = 0
+        self.epoch = epoch
+        fp.write(MAGIC + bytes((VERSION,)))
+        self._record(
+            _METADATA,
+            _uvarint(STYLE_EPOCH if epoch else STYLE_RELATIVE)
+            + json.dumps(metadata, ensure_ascii=False).encode(),
+        )
+
+    def _record(self, kind: bytes, payload: bytes) -> None:
+        self._fp.write(_uvarint(len(payload) + 1) + kind + payload)
+
+    def _id(self, word: str) -> int:
+        word_id = self._ids.get(word)
+        if word_id is None:
+            word_id = self._ids[word] = len(self._ids)
+            self._new_words.append(word)
+        return word_id
+
+    def add(
+        self, words: Sequence[str], starts: Sequence[int], ends: Sequence[int]
+    ) -> None:
+        """Append one result: its words and their start/end ns."""
+        self._append(
+            [len(words)],
+            np.array([self._id(w) for w in words], dtype=np.uint64),
+            np.asarray(starts, dtype=np.int64),
+            np.asarray(ends, dtype=np.int64),
+        )
+
+    def add_columns(
+        self,
+        text: Sequence[str],
+        word_ids: Sequence[int],
+        starts: Sequence[int],
+        ends: Sequence[int],
+        result_ends: Sequence[int],
+        offset: int = 0,
+    ) -> None:
+        """Append many results held in columns, like ``_WordStore``.
+
+        ``word_ids`` index *text*; result *i* ends before word
+        ``result_ends[i]``; *offset* is added to every time.
+        """
+        mapping = np.array([self._id(w) for w in text], dtype=np.uint64)
+        ids = mapping[np.asarray(word_ids, dtype=np.int64)]
+        starts = np.asarray(starts, dtype=np.int64) + offset
+        ends = np.asarray(ends, dtype=np.int64) + offset
+        bounds = np.asarray(result_ends, dtype=np.int64)
+        counts = np.diff(bounds, prepend=0)
+        # Cut after the result that reaches each multiple of batch_words.
+        targets = np.arange(self.batch_words, len(ids), self.batch_words)
+        cuts = np.unique(np.searchsorted(bounds, targets) + 1).tolist()
+        first = 0
+        for last in [*cuts, len(counts)]:
+            if last <= first:
+                continue
+            lo = int(bounds[first - 1]) if first else 0
+            hi = int(bounds[last - 1])
+            self._append(
+                counts[first:last].tolist(),
+                ids[lo:hi],
+                starts[lo:hi],
+                ends[lo:hi],
+            )
+            first = last
+
+    def _append(self, counts, word_ids, starts, ends) -> None:
+        self._counts.extend(counts)
+        self._word_ids.append(word_ids)
+        self._starts.append(starts)
+        self._ends.append(ends)
+        self._pending += len(word_ids)
+        if self._pending >= self.batch_words:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered results (and any new words) as records."""
+        if self._new_words:
+            payload = bytearray(_uvarint(len(self._new_words)))
+            for word in self._new_words:
+                encoded = word.encode()
+                payload += _uvarint(len(encoded)) + encoded
+            self._record(_DICTIONARY, bytes(payload))
+            self._new_words = []
+        if not self._counts:
+            return
+        starts = np.concatenate(self._starts)
+        ends = np.concatenate(self._ends)
+        deltas = np.diff(starts, prepend=np.int64(self._previous_start))
+        if len(starts):
+            self._previous_start = int(starts[-1])
+        values = np.concatenate(
+            [
+                np.array([len(self._counts), *self._counts], dtype=np.uint64),
+                np.concatenate(self._word_ids).astype(np.uint64),
+                _zigzag(deltas),
+                _zigzag(ends - starts),
+            ]
+        )
+        self._record(_RESULTS, encode_varints(values))
+        self._counts, self._word_ids, self._starts, self._ends = [], [], [], []
+        self._pending = 0
+
+    def close(self) -> None:
+        self.flush()
+
+
+class TranscriptBinaryReader:
+    """Read a ``.tbin`` transcript through ``mmap``, a batch at a time."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as fp:
+            self._mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mm[:4] != MAGIC or len(self._mm) < 5:
+            raise ValueError(f"{path} is not a binary transcript")
+        if self._mm[4] != VERSION:
+            raise ValueError(f"{path}: unsupported version {self._mm[4]}")
+        records = self._records()
+        kind, start, end = next(records, (None, 0, 0))
+        if kind != _METADATA:
+            raise ValueError(f"{path}: metadata record missing")
+        style, pos = _read_uvarint(self._mm, start)
+        self.epoch = style == STYLE_EPOCH
+        self.metadata: dict[str, Any] = json.loads(self._mm[pos:end])
+        self.words: list[str] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def _records(self) -> Iterator[tuple[bytes, int, int]]:
+        """Yield ``(type, payload_start, payload_end)`` per whole record."""
+        pos, size = 5, len(self._mm)
+        while pos < size:
+            try:
+                length, body = _read_uvarint(self._mm, pos)
+            except IndexError:
+                return  # torn length prefix
+            if length < 1 or body + length > size:
+                return  # torn record
+            yield self._mm[body : body + 1], body + 1, body + length
+            pos = body + length
+
+    def batches(
+        self,
+    ) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+        """Yield ``(result_word_counts, word_ids, starts, ends)`` arrays.
+
+        ``word_ids`` index :attr:`words`, which grows as dictionary
+        records are read.
+        """
+        self.words = []
+        previous = np.int64(0)
+        for kind, start, end in self._records():
+            if kind == _DICTIONARY:
+                count, pos = _read_uvarint(self._mm, start)
+                for _ in range(count):
+                    length, pos = _read_uvarint(self._mm, pos)
+                    self.words.append(self._mm[pos : pos + length].decode())
+                    pos += length
+            elif kind == _RESULTS:
+                values = decode_varints(self._mm[start:end])
+                results = int(values[0])
+                counts = values[1 : 1 + results].astype(np.int64)
+                n = int(counts.sum())
+                at = 1 + results
+                word_ids = values[at : at + n].astype(np.int64)
+                starts = np.cumsum(_unzigzag(values[at + n : at + 2 * n]))
+                starts += previous
+                if n:
+                    previous = starts[-1]
+                ends = starts + _unzigzag(values[at + 2 * n : at + 3 * n])
+                yield counts, word_ids, starts, ends
+
+    def iter_results(
+        self,
+    ) -> Iterator[tuple[list[str], list[int], list[int]]]:
+        """Yield ``(words, starts, ends)`` per result."""
+        for counts, word_ids, starts, ends in self.batches():
+            words = self.words
+            ids, start_list, end_list = (
+                word_ids.tolist(),
+                starts.tolist(),
+                ends.tolist(),
+            )
+            begin = 0
+            for count in counts.tolist():
+                stop = begin + count
+                yield (
+                    [words[i] for i in ids[begin:stop]],
+                    start_list[begin:stop],
+                    end_list[begin:stop],
+                )
+                begin = stop
+
+    def iter_words(self) -> Iterator[tuple[int, int, str]]:
+        """Yield ``(start_ns, end_ns, word)`` for every word."""
+        for counts, word_ids, starts, ends in self.batches():
+            words = self.words
+            for word_id, start, end in zip(
+                word_ids.tolist(), starts.tolist(), ends.tolist()
+            ):
+                yield start, end, words[word_id]
+
+
+def _time_json(ns: int, epoch: bool) -> str:
+    seconds, nanos = divmod(ns, NS_PER_SECOND)
+    if epoch:
+        return (
+            f'{{"seconds": {seconds}, "nanos": "{nanos}", '
+            f'"finalseconds": {seconds}, "finalnanos": "{nanos}"}}'
+        )
+    return f'{{"seconds": {seconds}, "nanos": {nanos}}}'
+
+
+def write_json(reader: TranscriptBinaryReader, out: TextIO) -> None:
+    """Write *reader*'s transcript as JSON, a batch at a time."""
+    out.write('{"metadata": ')
+    out.write(json.dumps(reader.metadata, ensure_ascii=False))
+    out.write(', "transcription": [{"results": [')
+    encoded: list[str] = []
+    first = True
+    for counts, word_ids, starts, ends in reader.batches():
+        encoded.extend(
+            json.dumps(w, ensure_ascii=False)
+            for w in reader.words[len(encoded) :]
+        )
+        entries = [
+            '{"word": %s, "startTime": %s, "endTime": %s}'
+            % (
+                encoded[word_id],
+                _time_json(start, reader.epoch),
+                _time_json(end, reader.epoch),
+            )
+            for word_id, start, end in zip(
+                word_ids.tolist(), starts.tolist(), ends.tolist()
+            )
+        ]
+        begin = 0
+        for count in counts.tolist():
+            if not first:
+                out.write(", ")
+            first = False
+            out.write('{"alternatives": [{"words": [')
+            out.write(", ".join(entries[begin : begin + count]))
+            out.write("]}]}")
+            begin += count
+    out.write("]}]}")
+
+
+def _time_ns(value: Any, epoch: bool) -> int:
+    """ns of a JSON time object; ValueError if it has another shape."""
+    if not isinstance(value, dict):
+        raise ValueError("time is not an object")
+    seconds, nanos = value.get("seconds"), value.get("nanos")
+    if epoch:
+        if (
+            list(value) != ["seconds", "nanos", "finalseconds", "finalnanos"]
+            or not isinstance(nanos, str)
+            or value["finalseconds"] != seconds
+            or value["finalnanos"] != nanos
+            or str(int(nanos)) != nanos
+        ):
+            raise ValueError(f"unsupported epoch time {value!r}")
+        nanos = int(nanos)
+    elif list(value) != ["seconds", "nanos"] or not isinstance(nanos, int):
+        raise ValueError(f"unsupported time {value!r}")
+    if not isinstance(seconds, int) or not 0 <= nanos < NS_PER_SECOND:
+        raise ValueError(f"unsupported time {value!r}")
+    return seconds * NS_PER_SECOND + nanos
+
+
+def _result_words(result: Any, epoch: bool):
+    """``(words, starts, ends)`` of one result; ValueError if not lossless."""
+    if (
+        not isinstance(result, dict)
+        or list(result) != ["alternatives"]
+        or not isinstance(result["alternatives"], list)
+        or len(result["alternatives"]) != 1
+        or not isinstance(result["alternatives"][0], dict)
+        or list(result["alternatives"][0]) != ["words"]
+    ):
+        raise ValueError("result is not a single alternative of words")
+    words, starts, ends = [], [], []
+    for word in result["alternatives"][0]["words"]:
+        if (
+            not isinstance(word, dict)
+            or list(word) != ["word", "startTime", "endTime"]
+            or not isinstance(word["word"], str)
+        ):
+            raise ValueError(f"unsupported word {word!r}")
+        words.append(word["word"])
+        starts.append(_time_ns(word["startTime"], epoch))
+        ends.append(_time_ns(word["endTime"], epoch))
+    return words, starts, ends
+
+
+def _epoch_style(result: Any) -> bool | None:
+    """Whether the first word of *result* has epoch times (None: no words)."""
+    try:
+        word = result["alternatives"][0]["words"][0]
+        return "finalseconds" in word["startTime"]
+    except (KeyError, IndexError, TypeError):
+        return None
+
+
+def json_to_binary(fp: TextIO, out: BinaryIO, batch_words: int = 4096) -> int:
+    """Convert the transcript JSON in *fp*, streaming; return the word count.
+
+    Raises ValueError for documents ``.tbin`` cannot represent exactly.
+    """
+    reader = IncrementalJSONReader(fp)
+    if not reader.match(_METADATA_START):
+        raise ValueError('transcript must start with "metadata"')
+    metadata = reader.value()
+    if not reader.match(_BODY_START):
+        raise ValueError('expected "transcription": [{"results": [')
+    writer = None
+    # Results before the first word are held until it shows the time style.
+    pending: list[Any] = []
+    count = 0
+    while reader.peek() not in ("]", ""):
+        result = reader.value()
+        if writer is None:
+            pending.append(result)
+            epoch = _epoch_style(result)
+            if epoch is None:
+                continue
+            writer = TranscriptBinaryWriter(out, metadata, epoch, batch_words)
+            results, pending = pending, []
+        else:
+            results = [result]
+        for item in results:
+            words, starts, ends = _result_words(item, writer.epoch)
+            writer.add(words, starts, ends)
+            count += len(words)
+    if not reader.match(_BODY_END):
+        raise ValueError("unexpected data after the results")
+    if writer is None:
+        writer = TranscriptBinaryWriter(out, metadata, False, batch_words)
+        for item in pending:
+            writer.add(*_result_words(item, False))
+    writer.close()
+    return count
+
+
+def _inputs(paths: list[str], suffix: str) -> list[str]:
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(sorted(glob.glob(os.path.join(path, "*" + suffix))))
+        else:
+            found.append(path)
+    return found
+
+
+def _output_path(path: str, suffix: str, output_dir: str | None) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(output_dir or os.path.dirname(path), stem + suffix)
+
+
+def convert(
+    path: str, output_dir: str | None = None, check: bool = False
+) -> str:
+    """Convert a ``.json`` transcript to ``.tbin`` or back; return the path.
+
+    With *check*, a ``.tbin`` written from JSON is read back and must give
+    the same document.
+    """
+    to_binary = not path.endswith(".tbin")
+    output = _output_path(path, ".tbin" if to_binary else ".json", output_dir)
+    tmp_path = output + ".tmp"
+    try:
+        if to_binary:
+            with (
+                open(path, encoding="utf-8") as fp,
+                open(tmp_path, "wb") as out,
+            ):
+                json_to_binary(fp, out)
+            if check:
+                with (
+                    TranscriptBinaryReader(tmp_path) as reader,
+                    open(path, encoding="utf-8") as fp,
+                ):
+                    buffer = io.StringIO()
+                    write_json(reader, buffer)
+                    if json.loads(buffer.getvalue()) != json.load(fp):
+                        raise ValueError("round trip changed the transcript")
+        else:
+            with (
+                TranscriptBinaryReader(path) as reader,
+                open(tmp_path, "w", encoding="utf-8") as out,
+            ):
+                write_json(reader, out)
+        os.replace(tmp_path, output)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(tmp_path)
+        raise
+    return output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=("to-binary", "to-json"))
+    parser.add_argument("paths", nargs="+", help="transcripts or directories")
+    parser.add_argument("--output-dir", help="default: next to each input")
+    parser.add_argument(
+        "--check", action="store_true", help="verify each .tbin round trip"
+    )
+    args = parser.parse_args()
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    to_binary = args.command == "to-binary"
+    failed = 0
+    in_bytes = out_bytes = 0
+    for path in _inputs(args.paths, ".json" if to_binary else ".tbin"):
+        try:
+            output = convert(path, args.output_dir, args.check)
+        except (OSError, ValueError) as exc:
+            print(f"{path}: {exc}", file=sys.stderr)
+            failed += 1
+            continue
+        in_bytes += os.path.getsize(path)
+        out_bytes += os.path.getsize(output)
+        print(f"{path} -> {output}")
+    if in_bytes:
+        print(
+            f"{in_bytes / 1e6:.1f} MB -> {out_bytes / 1e6:.1f} MB "
+            f"({in_bytes / max(out_bytes, 1):.1f}x)"
+        )
+    if failed:
+        raise SystemExit(f"{failed} files not converted")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,692 @@
+"""On-disk word index for searching across transcripts.
+
+Every transcript the index sees becomes an immutable *segment* file in the
+index directory (``transcripts/index`` by default) holding:
+
+* a table of words stored as columns – epoch start/end (ns), conference,
+  participant, word, file and the word's position in that file – sorted
+  by (conference, participant, start), so "words spoken by participant X
+  in conference Y between t1 and t2" is three binary searches over a
+  memory-mapped file;
+* an inverted index: the sorted row numbers of every distinct word;
+* the row numbers in start-time order, for time-only queries;
+* the word, participant, conference and file tables as JSON.
+
+The transcription server adds a segment as it writes each transcript, and
+once ``fanout`` segments of a similar size exist they are merged into one,
+so a query opens a number of files logarithmic in the number of
+transcripts. ``MANIFEST`` lists the live segments and is only replaced
+under ``flock``, which lets several server workers and this CLI share an
+index.
+
+Usage::
+
+    python scripts/transcript_index.py build transcripts
+    python scripts/transcript_index.py search --conference standup \
+        --participant alice --from 2026-10-19T09:00 --to 2026-10-19T09:30
+    python scripts/transcript_index.py search --word refund --json
+"""
+
+import argparse
+import bisect
+import contextlib
+import fcntl
+import glob
+import itertools
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from collections.abc import Iterator, Sequence
+from datetime import datetime, timezone
+from typing import Any
+
+import numpy as np
+
+from merge_conference_transcripts import iter_words
+from transcript_stream import anchor_epoch_ms, read_metadata, speaker_of
+
+DEFAULT_DIR = os.path.join("transcripts", "index")
+NS_PER_MS = 1_000_000
+
+_MANIFEST = "MANIFEST"
+_MANIFEST_LOCK = ".manifest.lock"
+_COMPACT_LOCK = ".compact.lock"
+_SUFFIX = ".tix"
+_MAGIC = b"TIDX0001"
+# magic, rows, distinct words, JSON tables length, min/max start (ns).
+_HEADER = struct.Struct("<8sQQQqq")
+_HEADER_BYTES = 64
+# Stored one after the other, 8-byte columns first to keep them aligned.
+_COLUMNS = (
+    ("start", "<i8"),
+    ("end", "<i8"),
+    ("conference", "<u4"),
+    ("participant", "<u4"),
+    ("word", "<u4"),
+    ("file", "<u4"),
+    ("position", "<u4"),
+)
+_ROW = np.dtype(list(_COLUMNS))
+# Column → key of the dicts :meth:`TranscriptIndex.search` returns.
+_RESULT = {
+    "start": "start_ns",
+    "end": "end_ns",
+    "word": "word",
+    "participant": "participant",
+    "conference": "conference",
+    "file": "file",
+    "position": "position",
+}
+_NO_ROWS = np.zeros(0, dtype=np.int64)
+_names = itertools.count()
+
+
+def _layout(rows: int, words: int) -> tuple[int, int, int, int]:
+    """Byte offsets of the postings, time order, word offsets and tables."""
+    postings_at = _HEADER_BYTES + rows * _ROW.itemsize
+    by_start_at = postings_at + rows * 4
+    lex_at = by_start_at + rows * 4
+    return postings_at, by_start_at, lex_at, lex_at + (words + 1) * 4
+
+
+def _bisect(column: np.ndarray, value, side: str = "left"):
+    """``searchsorted`` with *value* cast to the column's dtype.
+
+    A needle of another dtype makes NumPy convert the whole (mmapped)
+    column first, turning a binary search into a full copy.
+    """
+    return column.searchsorted(np.asarray(value, column.dtype), side)
+
+
+def _lookup(table: list[str], value: str) -> int | None:
+    i = bisect.bisect_left(table, value)
+    return i if i < len(table) and table[i] == value else None
+
+
+def conference_of(metadata: dict[str, Any]) -> str:
+    """The conference a transcript belongs to (the call SID otherwise)."""
+    params = metadata.get("custom_parameters") or {}
+    return params.get("conference_name") or metadata.get("call_sid") or ""
+
+
+def _write_segment(
+    path: str,
+    tables: dict[str, list],
+    rows: np.ndarray,
+) -> None:
+    """Sort *rows* and write them with their postings and *tables*."""
+    rows = rows[
+        np.lexsort((rows["start"], rows["participant"], rows["conference"]))
+    ]
+    postings = np.argsort(rows["word"], kind="stable").astype("<u4")
+    by_start = np.argsort(rows["start"], kind="stable").astype("<u4")
+    lex = np.zeros(len(tables["words"]) + 1, dtype="<u4")
+    lex[1:] = np.cumsum(
+        np.bincount(rows["word"], minlength=len(tables["words"]))
+    )
+    encoded = json.dumps(
+        tables, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+    header = _HEADER.pack(
+        _MAGIC,
+        len(rows),
+        len(tables["words"]),
+        len(encoded),
+        int(rows["start"].min()),
+        int(rows["start"].max()),
+    )
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(header.ljust(_HEADER_BYTES, b"\0"))
+        for name, _dtype in _COLUMNS:
+            fp.write(np.ascontiguousarray(rows[name]).tobytes())
+        fp.write(postings.tobytes())
+        fp.write(by_start.tobytes())
+        fp.write(lex.tobytes())
+        fp.write(encoded)
+    os.replace(tmp_path, path)
+
+
+class _Segment:
+    """One memory-mapped segment file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.bytes = os.path.getsize(path)
+        with open(path, "rb") as fp:
+            self._mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, rows, words, tables_len, self.min_ns, self.max_ns = (
+            _HEADER.unpack_from(self._mm, 0)
+        )
+        if magic != _MAGIC:
+            raise ValueError(f"{path} is not a transcript index segment")
+        postings_at, by_start_at, lex_at, tables_at = _layout(rows, words)
+        self.columns: dict[str, np.ndarray] = {}
+        offset = _HEADER_BYTES
+        for name, dtype in _COLUMNS:
+            self.columns[name] = np.frombuffer(self._mm, dtype, rows, offset)
+            offset += rows * np.dtype(dtype).itemsize
+        self.postings = np.frombuffer(self._mm, "<u4", rows, postings_at)
+        self.by_start = np.frombuffer(self._mm, "<u4", rows, by_start_at)
+        self.lex = np.frombuffer(self._mm, "<u4", words + 1, lex_at)
+        tables = json.loads(self._mm[tables_at : tables_at + tables_len])
+        self.words: list[str] = tables["words"]
+        self.participants: list[str] = tables["participants"]
+        self.conferences: list[str] = tables["conferences"]
+        self.files: list[dict[str, Any]] = tables["files"]
+        # Id → string lookups for whole result columns at once.
+        self.labels = {
+            "word": np.array(self.words, dtype=object),
+            "participant": np.array(self.participants, dtype=object),
+            "conference": np.array(self.conferences, dtype=object),
+            "file": np.array([f["path"] for f in self.files], dtype=object),
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns["start"])
+
+    def _blocks(
+        self, conference: str | None, participant: str | None
+    ) -> list[tuple[int, int]]:
+        """Row ranges of each matching (conference, participant) pair."""
+        conferences = self.columns["conference"]
+        participants = self.columns["participant"]
+        if conference is None:
+            edges = _bisect(conferences, np.arange(len(self.conferences) + 1))
+            ranges = list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+        else:
+            c = _lookup(self.conferences, conference)
+            if c is None:
+                return []
+            ranges = [
+                (
+                    int(_bisect(conferences, c, "left")),
+                    int(_bisect(conferences, c, "right")),
+                )
+            ]
+        p = None
+        if participant is not None:
+            p = _lookup(self.participants, participant)
+            if p is None:
+                return []
+        blocks = []
+        for lo, hi in ranges:
+            if lo >= hi:
+                continue
+            column = participants[lo:hi]
+            if p is not None:
+                blocks.append(
+                    (
+                        lo + int(_bisect(column, p, "left")),
+                        lo + int(_bisect(column, p, "right")),
+                    )
+                )
+                continue
+            edges = lo + _bisect(column, np.arange(len(self.participants) + 1))
+            blocks.extend(
+                (a, b)
+                for a, b in zip(edges[:-1].tolist(), edges[1:].tolist())
+                if a < b
+            )
+        return blocks
+
+    def select(
+        self,
+        conference: str | None,
+        participant: str | None,
+        start_ns: int,
+        end_ns: int,
+        word: str | None,
+    ) -> np.ndarray:
+        """Row numbers of the words starting in ``[start_ns, end_ns]``."""
+        if start_ns > self.max_ns or end_ns < self.min_ns:
+            return _NO_ROWS
+        postings = None
+        if word is not None:
+            word_id = _lookup(self.words, word)
+            if word_id is None:
+                return _NO_ROWS
+            postings = self.postings[self.lex[word_id] : self.lex[word_id + 1]]
+        if conference is None and participant is None:
+            starts = self.columns["start"]
+            if postings is not None:
+                found = starts[postings]
+                return postings[(found >= start_ns) & (found <= end_ns)]
+            # Bisect the rows in time order (a handful of page reads).
+            lo = bisect.bisect_left(
+                self.by_start, start_ns, key=starts.__getitem__
+            )
+            hi = bisect.bisect_right(
+                self.by_start, end_ns, lo, key=starts.__getitem__
+            )
+            return self.by_start[lo:hi]
+        found = []
+        for lo, hi in self._blocks(conference, participant):
+            starts = self.columns["start"][lo:hi]
+            a = lo + int(_bisect(starts, start_ns, "left"))
+            b = lo + int(_bisect(starts, end_ns, "right"))
+            if postings is None:
+                found.append(np.arange(a, b))
+            else:
+                found.append(
+                    postings[_bisect(postings, a) : _bisect(postings, b)]
+                )
+        return np.concatenate(found) if found else _NO_ROWS
+
+
+def _merge(segments: Sequence[_Segment], path: str) -> None:
+    """Write the rows of *segments* as one segment, re-numbering ids."""
+    tables: dict[str, list] = {
+        key: sorted(set().union(*(getattr(s, key) for s in segments)))
+        for key in ("words", "participants", "conferences")
+    }
+    sorted_tables = {key: np.array(tables[key]) for key in tables}
+    tables["files"] = []
+    parts = []
+    for segment in segments:
+        rows = np.zeros(len(segment), dtype=_ROW)
+        for name, _dtype in _COLUMNS:
+            rows[name] = segment.columns[name]
+        for key, column in (
+            ("words", "word"),
+            ("participants", "participant"),
+            ("conferences", "conference"),
+        ):
+            ids = np.searchsorted(
+                sorted_tables[key], np.array(getattr(segment, key))
+            )
+            rows[column] = ids[rows[column]]
+        rows["file"] += len(tables["files"])
+        tables["files"].extend(segment.files)
+        parts.append(rows)
+    _write_segment(path, tables, np.concatenate(parts))
+
+
+class TranscriptIndex:
+    """Segmented, memory-mapped index of transcript words.
+
+    :meth:`add` writes one segment per transcript and merges a size tier
+    once it holds ``fanout`` segments; :meth:`search` bisects every segment
+    that overlaps the requested time range.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_DIR,
+        fanout: int = 8,
+        auto_compact: bool = True,
+    ):
+        self.directory = directory
+        self.fanout = fanout
+        self.auto_compact = auto_compact
+        self._lock = threading.Lock()
+        self._manifest_key: tuple | None = None
+        self._segments: dict[str, _Segment] = {}
+        self._paths: set[str] = set()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _new_name(self) -> str:
+        return (
+            f"{int(time.time() * 1000):013d}-{os.getpid()}-"
+            f"{next(_names)}{_SUFFIX}"
+        )
+
+    @contextlib.contextmanager
+    def _flock(self, name: str, blocking: bool = True) -> Iterator[bool]:
+        with open(self._path(name), "a") as fp:
+            try:
+                fcntl.flock(
+                    fp, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB)
+                )
+            except BlockingIOError:
+                yield False
+                return
+            yield True
+
+    def _read_manifest(self) -> list[str]:
+        try:
+            with open(self._path(_MANIFEST), encoding="utf-8") as fp:
+                return json.load(fp)["segments"]
+        except FileNotFoundError:
+            return []
+
+    def _write_manifest(self, names: list[str]) -> None:
+        tmp_path = self._path(f"{_MANIFEST}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            json.dump({"segments": names}, fp)
+        os.replace(tmp_path, self._path(_MANIFEST))
+
+    def segments(self) -> list[_Segment]:
+        """The live segments, re-read only when ``MANIFEST`` changes."""
+        for _ in range(3):
+            try:
+                st = os.stat(self._path(_MANIFEST))
+            except FileNotFoundError:
+                return []
+            key = (st.st_ino, st.st_mtime_ns, st.st_size)
+            with self._lock:
+                if key == self._manifest_key:
+                    return list(self._segments.values())
+                try:
+                    self._segments = {
+                        name: self._segments.get(name)
+                        or _Segment(self._path(name))
+                        for name in self._read_manifest()
+                    }
+                except FileNotFoundError:
+                    # Merged away between reading MANIFEST and opening.
+                    continue
+                self._paths = {
+                    f["path"]
+                    for segment in self._segments.values()
+                    for f in segment.files
+                }
+                self._manifest_key = key
+                return list(self._segments.values())
+        raise RuntimeError(f"{self.directory}: MANIFEST keeps changing")
+
+    def contains(self, path: str) -> bool:
+        self.segments()
+        return os.path.abspath(path) in self._paths
+
+    def add(
+        self,
+        path: str,
+        metadata: dict[str, Any],
+        text: Sequence[str],
+        word_ids: Sequence[int],
+        starts: Sequence[int],
+        ends: Sequence[int],
+        absolute: bool = False,
+    ) -> int:
+        """Index one transcript and return the number of words added.
+
+        Words are given like the server's ``_WordStore``: distinct *text*,
+        and per word its index into *text* and start/end ns, relative to the
+        transcript's anchor epoch unless *absolute*. Already indexed paths
+        are skipped.
+        """
+        path = os.path.abspath(path)
+        if not len(word_ids) or self.contains(path):
+            return 0
+        anchor_ms = anchor_epoch_ms(metadata)
+        offset = 0 if absolute else (anchor_ms or 0) * NS_PER_MS
+        vocabulary, word_of = np.unique(
+            np.array([w.lower() for w in text]), return_inverse=True
+        )
+        rows = np.zeros(len(word_ids), dtype=_ROW)
+        rows["word"] = word_of[np.asarray(word_ids)]
+        rows["start"] = np.asarray(starts, dtype=np.int64) + offset
+        rows["end"] = np.asarray(ends, dtype=np.int64) + offset
+        rows["position"] = np.arange(len(word_ids))
+        participant = speaker_of(metadata, path)
+        conference = conference_of(metadata)
+        tables = {
+            "words": vocabulary.tolist(),
+            "participants": [participant],
+            "conferences": [conference],
+            "files": [
+                {
+                    "path": path,
+                    "participant": participant,
+                    "conference": conference,
+                    "call_sid": metadata.get("call_sid"),
+                    "stream_sid": metadata.get("stream_sid"),
+                    "epoch_ms": anchor_ms,
+                    "mtime_ms": _mtime_ms(path),
+                    "words": len(word_ids),
+                    "indexed_ms": int(time.time() * 1000),
+                }
+            ],
+        }
+        name = self._new_name()
+        _write_segment(self._path(name), tables, rows)
+        with self._flock(_MANIFEST_LOCK):
+            self._write_manifest([*self._read_manifest(), name])
+        if self.auto_compact:
+            self.compact()
+        return len(word_ids)
+
+    def _tier_to_merge(self, segments: list[_Segment]) -> list[_Segment]:
+        tiers: dict[int, list[_Segment]] = {}
+        for segment in segments:
+            tier = int(math.log(max(len(segment), 1), self.fanout))
+            tiers.setdefault(tier, []).append(segment)
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= self.fanout:
+                return tiers[tier]
+        return []
+
+    def compact(self, full: bool = False) -> int:
+        """Merge a full size tier (every segment with *full*).
+
+        Returns the number of segments merged; 0 when there was nothing to
+        do or another process is already merging.
+        """
+        with self._flock(_COMPACT_LOCK, blocking=False) as locked:
+            if not locked:
+                return 0
+            merged = 0
+            while True:
+                segments = self.segments()
+                group = (
+                    (segments if len(segments) > 1 else [])
+                    if full
+                    else self._tier_to_merge(segments)
+                )
+                if not group:
+                    return merged
+                name = self._new_name()
+                _merge(group, self._path(name))
+                replaced = {segment.name for segment in group}
+                with self._flock(_MANIFEST_LOCK):
+                    self._write_manifest(
+                        [n for n in self._read_manifest() if n not in replaced]
+                        + [name]
+                    )
+                for segment in group:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(segment.path)
+                merged += len(group)
+
+    def search(
+        self,
+        conference: str | None = None,
+        participant: str | None = None,
+        start_ms: float | None = None,
+        end_ms: float | None = None,
+        word: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """Words matching every given filter, in start-time order.
+
+        Times are epoch milliseconds and select words *starting* in
+        ``[start_ms, end_ms]``.
+        """
+        start_ns = -(2**63) if start_ms is None else int(start_ms * NS_PER_MS)
+        end_ns = 2**63 - 1 if end_ms is None else int(end_ms * NS_PER_MS)
+        word = word.lower() if word else None
+        hits = []
+        for segment in self.segments():
+            rows = segment.select(
+                conference, participant, start_ns, end_ns, word
+            )
+            if len(rows):
+                hits.append((segment, rows))
+        if not hits:
+            return []
+        starts = np.concatenate([s.columns["start"][r] for s, r in hits])
+        owners = np.repeat(np.arange(len(hits)), [len(r) for _, r in hits])
+        rows = np.concatenate([r for _, r in hits])
+        if limit is not None and limit < len(starts):
+            # Only the first *limit* hits need sorting (and decoding).
+            first = np.argpartition(starts, limit)[:limit]
+            order = first[np.argsort(starts[first], kind="stable")]
+        else:
+            order = np.argsort(starts, kind="stable")
+        owners, rows = owners[order], rows[order]
+        columns = {name: np.empty(len(order), dtype=object) for name in _RESULT}
+        for i, (segment, _) in enumerate(hits):
+            mine = owners == i
+            picked = rows[mine]
+            for name in _RESULT:
+                values = segment.columns[name][picked]
+                labels = segment.labels.get(name)
+                if labels is not None:
+                    values = labels[values]
+                columns[name][mine] = values.tolist()
+        keys = tuple(_RESULT.values())
+        return [
+            dict(zip(keys, values))
+            for values in zip(*(columns[name].tolist() for name in _RESULT))
+        ]
+
+    def files(self) -> list[dict[str, Any]]:
+        """Every indexed transcript, oldest first by its own time: the
+        anchor epoch, else the file's mtime when it was indexed.
+        """
+        return sorted(
+            (f for segment in self.segments() for f in segment.files),
+            key=_file_time_ms,
+        )
+
+    def stats(self) -> dict[str, int]:
+        segments = self.segments()
+        return {
+            "segments": len(segments),
+            "files": sum(len(s.files) for s in segments),
+            "words": sum(len(s) for s in segments),
+            "bytes": sum(s.bytes for s in segments),
+        }
+
+
+def _mtime_ms(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns // NS_PER_MS
+    except OSError:
+        return None
+
+
+def _file_time_ms(entry: dict[str, Any]) -> int:
+    for key in ("epoch_ms", "mtime_ms", "indexed_ms"):
+        if entry.get(key) is not None:
+            return entry[key]
+    return 0
+
+
+def index_file(index: TranscriptIndex, path: str) -> int:
+    """Read a transcript written earlier and add it to *index*."""
+    ids: dict[str, int] = {}
+    word_ids, starts, ends = [], [], []
+    absolute = False
+    for start, end, word, absolute in iter_words(path):
+        word_ids.append(ids.setdefault(word, len(ids)))
+        starts.append(start)
+        ends.append(end)
+    return index.add(
+        path,
+        read_metadata(path),
+        list(ids),
+        word_ids,
+        starts,
+        ends,
+        absolute=absolute,
+    )
+
+
+def _epoch_ms(value: str) -> float:
+    """Epoch milliseconds, or an ISO 8601 time (UTC unless it has an offset)."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp() * 1000
+
+
+def _format_ns(ns: int) -> str:
+    moment = datetime.fromtimestamp(ns / 1e9, tz=timezone.utc)
+    return moment.isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--index", default=DEFAULT_DIR, help="index dir")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="index existing transcripts")
+    build.add_argument("paths", nargs="+", help="transcripts or directories")
+    search = commands.add_parser("search", help="find words")
+    search.add_argument("--conference")
+    search.add_argument("--participant")
+    search.add_argument(
+        "--from", dest="start", type=_epoch_ms, help="epoch ms or ISO time"
+    )
+    search.add_argument(
+        "--to", dest="end", type=_epoch_ms, help="epoch ms or ISO time"
+    )
+    search.add_argument("--word")
+    search.add_argument("--limit", type=int)
+    search.add_argument("--json", action="store_true", help="JSON lines")
+    commands.add_parser("compact", help="merge every segment into one")
+    commands.add_parser("stats", help="print index size")
+    args = parser.parse_args()
+
+    index = TranscriptIndex(args.index)
+    if args.command == "build":
+        paths = []
+        for path in args.paths:
+            if os.path.isdir(path):
+                paths.extend(sorted(glob.glob(os.path.join(path, "*.json"))))
+            else:
+                paths.append(path)
+        added = files = 0
+        for path in paths:
+            if path.endswith("-adjusted.json"):
+                continue  # a copy of another transcript
+            try:
+                count = index_file(index, path)
+            except (OSError, ValueError) as exc:
+                print(f"{path}: {exc}", file=sys.stderr)
+                continue
+            added += count
+            files += bool(count)
+        print(f"Indexed {added} words from {files} new transcripts.")
+    elif args.command == "search":
+        started = time.perf_counter()
+        words = index.search(
+            args.conference,
+            args.participant,
+            args.start,
+            args.end,
+            args.word,
+            args.limit,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for word in words:
+            if args.json:
+                print(json.dumps(word, ensure_ascii=False))
+            else:
+                print(
+                    f"{_format_ns(word['start_ns'])} {word['conference']} "
+                    f"{word['participant']}: {word['word']}"
+                )
+        print(f"{len(words)} words in {elapsed_ms:.1f} ms", file=sys.stderr)
+    elif args.command == "compact":
+        print(f"Merged {index.compact(full=True)} segments.")
+    else:
+        print(json.dumps(index.stats()))
+
+
+if __name__ == "__main__":
+    main()
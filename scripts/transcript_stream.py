@@ -0,0 +1,138 @@
+"""Incremental reading of large transcript JSON documents.
+
+Transcripts are ``{"metadata": ..., "transcription": [{"results": [...]}]}``
+documents that can grow to hundreds of megabytes for long calls. The
+scripts here walk them one value at a time instead of ``json.load``-ing the
+whole document.
+"""
+
+import json
+import os
+import re
+from typing import Any, TextIO
+
+_CHUNK_SIZE = 1 << 16
+# Structural characters the reader skips between values.
+_SEPARATORS = " \t\r\n,"
+# How much text :meth:`IncrementalJSONReader.match` makes available.
+_LOOKAHEAD = 4096
+_METADATA_RE = re.compile(r'"metadata"\s*:')
+_TRANSCRIPTION_RE = re.compile(r'"transcription"\s*:')
+
+
+class IncrementalJSONReader:
+    """Pull JSON values out of a file one at a time."""
+
+    def __init__(self, fp: TextIO):
+        self._fp = fp
+        self._buf = ""
+        self._pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        chunk = self._fp.read(_CHUNK_SIZE)
+        if not chunk:
+            return False
+        self._buf = self._buf[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def skip_past(
+        self, pattern: re.Pattern, stop: re.Pattern | None = None
+    ) -> None:
+        """Move past the next match of *pattern*; ValueError if none, or if
+        *stop* matches first. Skipped text is dropped as it is read.
+        """
+        while True:
+            match = pattern.search(self._buf, self._pos)
+            end = match.start() if match else len(self._buf)
+            if stop is not None and stop.search(self._buf, self._pos, end):
+                raise ValueError(f"{pattern.pattern!r} not found")
+            if match:
+                self._pos = match.end()
+                return
+            # Keep only a tail that may hold the start of a match.
+            self._pos = max(self._pos, len(self._buf) - _LOOKAHEAD)
+            if not self._fill():
+                raise ValueError(f"{pattern.pattern!r} not found")
+
+    def match(self, pattern: re.Pattern) -> bool:
+        """Consume *pattern* if the text at the current position matches."""
+        while len(self._buf) - self._pos < _LOOKAHEAD and self._fill():
+            pass
+        match = pattern.match(self._buf, self._pos)
+        if match is None:
+            return False
+        self._pos = match.end()
+        return True
+
+    def peek(self) -> str:
+        """Skip separators; return the next character ("" at EOF)."""
+        while True:
+            while (
+                self._pos < len(self._buf)
+                and self._buf[self._pos] in _SEPARATORS
+            ):
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def value(self) -> Any:
+        """Decode the next JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            self._pos = end
+            return obj
+
+
+def read_metadata(path: str) -> dict[str, Any]:
+    """Return a transcript's metadata without reading its results."""
+    if path.endswith(".tbin"):
+        from transcript_binary import TranscriptBinaryReader
+
+        with TranscriptBinaryReader(path) as reader:
+            return reader.metadata
+    with open(path, encoding="utf-8") as fp:
+        if path.endswith(".jsonl"):
+            return json.loads(fp.readline() or "{}").get("metadata", {})
+        reader = IncrementalJSONReader(fp)
+        # Metadata is written first; legacy files have none at all.
+        reader.skip_past(_METADATA_RE, stop=_TRANSCRIPTION_RE)
+        return reader.value()
+
+
+def epoch_param_ms(params: dict[str, Any], name: str) -> int | None:
+    """An ``*_in_epoch_seconds`` stream parameter in ms, if set."""
+    try:
+        seconds = float(params.get(name) or 0)
+    except (TypeError, ValueError):
+        return None
+    return round(seconds * 1000) if seconds > 0 else None
+
+
+def anchor_epoch_ms(metadata: dict[str, Any]) -> int | None:
+    """Epoch (ms) of time 0 in a transcript."""
+    if metadata.get("transcript_epoch_ms") is not None:
+        return int(metadata["transcript_epoch_ms"])
+    params = metadata.get("custom_parameters") or {}
+    stream_start = epoch_param_ms(params, "stream_start_time_in_epoch_seconds")
+    if stream_start is not None:
+        return stream_start
+    return metadata.get("started_at_epoch_ms")
+
+
+def speaker_of(metadata: dict[str, Any], path: str) -> str:
+    """The participant label of a transcript."""
+    return (
+        metadata.get("participant")
+        or (metadata.get("custom_parameters") or {}).get("track1_label")
+        or os.path.basename(path).rsplit("-", 1)[0]
+    )
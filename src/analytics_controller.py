@@ -0,0 +1,47 @@
+import time
+
+from flask import Blueprint, current_app, jsonify, request
+
+analytics_bp = Blueprint("analytics", __name__)
+
+
+def _time_range():
+    """Read ``start``/``end`` (epoch seconds) from the query string; the
+    default window is the last 24 hours.
+    """
+    end = request.args.get("end", type=float) or time.time()
+    start = request.args.get("start", type=float)
+    if start is None:
+        start = end - 24 * 3600
+    return start, end
+
+
+@analytics_bp.route("/calls/<sid>/timeline", methods=["GET"])
+def call_timeline(sid):
+    """Return every status event recorded for *sid*, oldest first."""
+    journal = current_app.config["call_event_journal"]
+    start = request.args.get("start", 0.0, type=float)
+    end = request.args.get("end", type=float)
+    events = journal.timeline(sid, start, end)
+    if not events:
+        return jsonify({"error": f"No events for call {sid}"}), 404
+    return jsonify({"sid": sid, "events": events})
+
+
+@analytics_bp.route("/calls/stats", methods=["GET"])
+def call_stats():
+    """Ring-time and answer-time aggregates per identity.
+
+    Query params: ``start`` / ``end`` (epoch seconds) and optional
+    ``identity``.
+    """
+    journal = current_app.config["call_event_journal"]
+    start, end = _time_range()
+    identity = request.args.get("identity")
+    return jsonify(
+        {
+            "start": start,
+            "end": end,
+            "identities": journal.identity_stats(start, end, identity),
+        }
+    )
@@ -0,0 +1,322 @@
+import bisect
+import glob
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# One index record per event: timestamp (ms), sid hash, identity hash, byte
+# offset and length of the JSON line in the segment.
+_INDEX = struct.Struct("<qQQII")
+_SEGMENT_RE = re.compile(r"events-(\d+)\.jsonl$")
+
+
+def _key(value: str | None) -> int:
+    """Stable 64-bit hash used to match sids/identities in the index."""
+    if not value:
+        return 0
+    digest = hashlib.blake2b(value.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class _Segment:
+    """A closed-or-active ``events-<seq>.jsonl`` file and its ``.idx``."""
+
+    def __init__(self, seq: int, path: str):
+        self.seq = seq
+        self.path = path
+        self.index_path = path[: -len(".jsonl")] + ".idx"
+        self.first_ms: int | None = None
+        self.last_ms: int | None = None
+        self.size = os.path.getsize(path) if os.path.exists(path) else 0
+        self.created = time.time()
+        records = self._index_bytes()
+        if records:
+            self.first_ms = _INDEX.unpack_from(records, 0)[0]
+            self.last_ms = _INDEX.unpack_from(
+                records, len(records) - _INDEX.size
+            )[0]
+
+    def _index_bytes(self) -> bytes:
+        # Only used on open; queries go through mmap.
+        if not os.path.exists(self.index_path):
+            return b""
+        with open(self.index_path, "rb") as fp:
+            data = fp.read()
+        return data[: len(data) - len(data) % _INDEX.size]
+
+    def overlaps(self, start_ms: int, end_ms: int) -> bool:
+        if self.first_ms is None:
+            return False
+        return self.first_ms <= end_ms and self.last_ms >= start_ms
+
+    def scan(self, start_ms: int, end_ms: int, sid_key=None, identity_key=None):
+        """Yield decoded events in ``[start_ms, end_ms]`` from the mmapped
+        segment, optionally restricted to a sid/identity hash.
+        """
+        try:
+            idx_fp = open(self.index_path, "rb")
+            data_fp = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with idx_fp, data_fp:
+            idx_len = os.fstat(idx_fp.fileno()).st_size
+            idx_len -= idx_len % _INDEX.size
+            data_len = os.fstat(data_fp.fileno()).st_size
+            if not idx_len or not data_len:
+                return
+            with (
+                mmap.mmap(
+                    idx_fp.fileno(), idx_len, access=mmap.ACCESS_READ
+                ) as idx,
+                mmap.mmap(
+                    data_fp.fileno(), data_len, access=mmap.ACCESS_READ
+                ) as data,
+            ):
+                count = idx_len // _INDEX.size
+                timestamps = _TimestampView(idx, count)
+                lo = bisect.bisect_left(timestamps, start_ms)
+                for pos in range(lo * _INDEX.size, idx_len, _INDEX.size):
+                    ts_ms, sid_hash, identity_hash, offset, length = (
+                        _INDEX.unpack_from(idx, pos)
+                    )
+                    if ts_ms > end_ms:
+                        break
+                    if sid_key is not None and sid_hash != sid_key:
+                        continue
+                    if (
+                        identity_key is not None
+                        and identity_hash != identity_key
+                    ):
+                        continue
+                    if offset + length > data_len:
+                        break
+                    yield json.loads(data[offset : offset + length])
+
+
+class _TimestampView:
+    """Sequence view over the timestamp column of an index mmap (for bisect)."""
+
+    def __init__(self, buf, count: int):
+        self.buf = buf
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return _INDEX.unpack_from(self.buf, i * _INDEX.size)[0]
+
+
+class CallEventJournal:
+    """Append-only, segment-rotated journal of call status events.
+
+    Each event is one JSON line in ``events-<seq>.jsonl``; a fixed-width
+    ``events-<seq>.idx`` sidecar records its timestamp, sid/identity hashes
+    and byte range. Segments rotate by size or age and old ones are deleted
+    after ``retention`` seconds. Queries bisect the index by time and read
+    only the matching lines through ``mmap``, so reporting never loads the
+    history into memory.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = 16 * 1024 * 1024,
+        segment_seconds: float = 3600.0,
+        retention: float = 30 * 24 * 3600.0,
+    ):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.retention = retention
+        self._lock = threading.Lock()
+        self._segments: list[_Segment] = []
+        self._data = None
+        self._index = None
+        self.appended = 0
+        os.makedirs(directory, exist_ok=True)
+        for path in glob.glob(os.path.join(directory, "events-*.jsonl")):
+            match = _SEGMENT_RE.search(os.path.basename(path))
+            if not match:
+                continue
+            segment = _Segment(int(match.group(1)), path)
+            if segment.first_ms is None:
+                # Left empty by a previous run.
+                for stale in (segment.path, segment.index_path):
+                    if os.path.exists(stale):
+                        os.remove(stale)
+                continue
+            self._segments.append(segment)
+        self._segments.sort(key=lambda segment: segment.seq)
+        # Always start a fresh segment: the previous one may end in a torn
+        # write, which the index simply never points at.
+        self._rotate()
+
+    def _segment_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"events-{seq:08d}.jsonl")
+
+    def _rotate(self) -> None:
+        if self._data is not None:
+            self._data.close()
+            self._index.close()
+        seq = self._segments[-1].seq + 1 if self._segments else 1
+        path = self._segment_path(seq)
+        self._data = open(path, "ab")
+        self._index = open(path[: -len(".jsonl")] + ".idx", "ab")
+        self._segments.append(_Segment(seq, path))
+        self._expire()
+
+    def _expire(self) -> None:
+        cutoff_ms = int((time.time() - self.retention) * 1000)
+        while len(self._segments) > 1:
+            oldest = self._segments[0]
+            if oldest.last_ms is not None and oldest.last_ms >= cutoff_ms:
+                break
+            for path in (oldest.path, oldest.index_path):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+            self._segments.pop(0)
+
+    def append(self, event: dict) -> float:
+        """Append one status event (must carry ``sid``) and return its
+        ``timestamp``, which is stamped here, under the lock, so the index
+        of every segment stays in time order for :meth:`_Segment.scan`.
+        """
+        with self._lock:
+            segment = self._segments[-1]
+            timestamp = time.time()
+            ts_ms = int(timestamp * 1000)
+            if segment.last_ms is not None and ts_ms < segment.last_ms:
+                # The wall clock stepped back; never index out of order.
+                ts_ms = segment.last_ms
+                timestamp = ts_ms / 1000
+            event["timestamp"] = timestamp
+            line = (json.dumps(event, separators=(",", ":")) + "\n").encode()
+            if segment.size and (
+                segment.size + len(line) > self.segment_bytes
+                or timestamp - segment.created > self.segment_seconds
+            ):
+                self._rotate()
+                segment = self._segments[-1]
+            try:
+                self._data.write(line)
+                self._data.flush()
+                # Index written after the data so it never points past EOF.
+                self._index.write(
+                    _INDEX.pack(
+                        ts_ms,
+                        _key(event.get("sid")),
+                        _key(event.get("identity")),
+                        segment.size,
+                        len(line) - 1,
+                    )
+                )
+                self._index.flush()
+            except OSError as exc:
+                logger.error("📒 Failed to journal call event: %s", exc)
+                return timestamp
+            segment.size += len(line)
+            if segment.first_ms is None:
+                segment.first_ms = ts_ms
+            segment.last_ms = ts_ms
+            self.appended += 1
+        return timestamp
+
+    def _scan(self, start: float, end: float, sid=None, identity=None):
+        start_ms, end_ms = int(start * 1000), int(end * 1000)
+        with self._lock:
+            segments = [
+                s for s in self._segments if s.overlaps(start_ms, end_ms)
+            ]
+        sid_key = _key(sid) if sid else None
+        identity_key = _key(identity) if identity else None
+        for segment in segments:
+            for event in segment.scan(start_ms, end_ms, sid_key, identity_key):
+                # Hash collisions are possible, so confirm on the record.
+                if sid and event.get("sid") != sid:
+                    continue
+                if identity and event.get("identity") != identity:
+                    continue
+                yield event
+
+    def timeline(
+        self, sid: str, start: float = 0.0, end: float | None = None
+    ) -> list[dict]:
+        """Return every journaled event for call *sid* in time order."""
+        end = time.time() if end is None else end
+        return list(self._scan(start, end, sid=sid))
+
+    def identity_stats(
+        self, start: float, end: float, identity: str | None = None
+    ) -> dict:
+        """Aggregate ring and answer times per identity over ``[start, end]``.
+
+        Ring time is ringing → in-progress; answer (talk) time is
+        in-progress → the terminal status.
+        """
+        calls: dict[str, dict] = {}
+        for event in self._scan(start, end, identity=identity):
+            who = event.get("identity")
+            if not who:
+                continue
+            call = calls.setdefault(event["sid"], {"identity": who})
+            status = event.get("status")
+            if status == "ringing":
+                call.setdefault("ringing", event["timestamp"])
+            elif status == "in-progress":
+                call.setdefault("answered", event["timestamp"])
+            elif status in ("completed", "no-answer", "busy", "failed"):
+                call["ended"] = event["timestamp"]
+                call["final_status"] = status
+
+        stats: dict[str, dict] = {}
+        for call in calls.values():
+            entry = stats.setdefault(
+                call["identity"],
+                {"calls": 0, "answered": 0, "ring_times": [], "talk_times": []},
+            )
+            entry["calls"] += 1
+            if "answered" in call:
+                entry["answered"] += 1
+                if "ringing" in call:
+                    entry["ring_times"].append(
+                        call["answered"] - call["ringing"]
+                    )
+                if "ended" in call:
+                    entry["talk_times"].append(call["ended"] - call["answered"])
+
+        result = {}
+        for who, entry in stats.items():
+            ring, talk = entry["ring_times"], entry["talk_times"]
+            result[who] = {
+                "calls": entry["calls"],
+                "answered": entry["answered"],
+                "answer_rate": round(entry["answered"] / entry["calls"], 3),
+                "avg_ring_seconds": (
+                    round(sum(ring) / len(ring), 3) if ring else None
+                ),
+                "max_ring_seconds": round(max(ring), 3) if ring else None,
+                "avg_answer_seconds": (
+                    round(sum(talk) / len(talk), 3) if talk else None
+                ),
+                "total_answer_seconds": round(sum(talk), 3),
+            }
+        return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "segments": len(self._segments),
+                "bytes": sum(s.size for s in self._segments),
+                "appended": self.appended,
+            }
@@ -9,6 +9,9 @@ events_bp = Blueprint("events", __name__)
 def call_events():
     """Handle Twilio call status callbacks and forward them via Socket.IO."""
     socketio = current_app.config["socketio"]
-    call_log = current_app.config["call_log"]
-    resp = CallEventsHandler(socketio, call_log).handle(request)
+    call_graph = current_app.config["call_graph"]
+    event_journal = current_app.config["call_event_journal"]
+    resp = CallEventsHandler(socketio, call_graph, event_journal).handle(
+        request
+    )
     return resp
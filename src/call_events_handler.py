@@ -1,10 +1,15 @@
 import os
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from flask import current_app
 from flask_socketio import SocketIO
 
+from src.call_event_journal import CallEventJournal
+from src.call_graph import CallGraph
+from src.twilio_guard import TwilioGuardError, retry_delay
+
 
 def str2bool(val, default=False):
     if isinstance(val, bool):
@@ -19,9 +24,15 @@ class CallEventsHandler:
     webhooks.
     """
 
-    def __init__(self, socketio: SocketIO, call_log: dict):
+    def __init__(
+        self,
+        socketio: SocketIO,
+        call_graph: CallGraph,
+        event_journal: CallEventJournal,
+    ):
         self.socketio = socketio
-        self.call_log = call_log
+        self.call_graph = call_graph
+        self.event_journal = event_journal
 
     def handle(self, flask_request):
         """Process the incoming Flask request and emit events."""
@@ -42,7 +53,6 @@ class CallEventsHandler:
         status = flask_request.values.get("CallStatus")
         from_number = flask_request.values.get("From")
         to_number = flask_request.values.get("To")
-        timestamp = time.time()
         duration = flask_request.values.get("CallDuration")
 
         current_app.logger.debug(
@@ -53,35 +63,46 @@ class CallEventsHandler:
         )
 
         call_type = "child" if parent_sid else "parent"
+        graph = self.call_graph
 
         self._emit_parent_child_sids(call_type, sid, parent_sid, identity)
 
-        log_key = self._ensure_log_entry(sid, parent_sid, call_type)
-
-        self.call_log[log_key]["events"].append(
+        event = {
+            "status": status,
+            "from": from_number,
+            "to": to_number,
+            "duration": duration,
+        }
+        # The journal stamps the time under its lock, keeping its index
+        # sorted; the call graph records the same timestamp.
+        timestamp = self.event_journal.append(
             {
-                "status": status,
-                "from": from_number,
-                "to": to_number,
-                "timestamp": timestamp,
-                "duration": duration,
+                "sid": sid,
+                "parent_sid": parent_sid,
+                "type": call_type,
+                "identity": identity,
+                **event,
             }
         )
+        event["timestamp"] = timestamp
+        graph.record_call_event(
+            sid,
+            parent_sid=parent_sid,
+            call_type=call_type,
+            identity=identity,
+            event=event,
+        )
 
-        if status == "ringing":
-            self.call_log[log_key]["ringing_time"] = timestamp
-        elif status == "in-progress":
+        if status == "in-progress":
             current_app.logger.debug(
                 "current time in epoch when the participant: %s answered the call: %s",
                 identity,
                 time.time(),
             )
-            redis = current_app.config["redis"]
-
-            call_info = redis.get(sid, {})
+            call_info = graph.call(sid)
             call_conference_info = call_info.get("conference", {})
-            conference_name = call_conference_info.get("conference_name", None)
-            conference_info = redis.get(conference_name, {})
+            conference_name = graph.conference_of(sid)
+            conference_info = graph.conference(conference_name)
             stream_audio = str2bool(call_info.get("stream_audio", False))
             kick_participant_from_conference = str2bool(
                 call_conference_info.get(
@@ -95,31 +116,29 @@ class CallEventsHandler:
             )
 
             if update_participant_in_conference:
-                conference_info["participants"][sid] = {
-                    "participant_label": call_info.get(
-                        "participant_label", None
-                    ),
-                    "call_sid": sid,
-                    "muted": True,
-                    "on_hold": False,
-                    "role": call_info.get("role", None),
-                }
+                graph.set_participant(
+                    conference_name,
+                    sid,
+                    {
+                        "participant_label": call_info.get(
+                            "participant_label", None
+                        ),
+                        "call_sid": sid,
+                        "muted": True,
+                        "on_hold": False,
+                        "role": call_info.get("role", None),
+                    },
+                )
 
             if kick_participant_from_conference:
-                all_calls = conference_info["calls"]
-                for call_sid, call_info in all_calls.items():
-                    if call_info.get("role") == "ai-voice-agent":
-                        client = current_app.config["twilio_client"]
-                        client.conferences(
-                            conference_info["conference_sid"]
-                        ).participants(call_sid).delete()
-                        current_app.logger.info(
-                            "🎤 Kicked participant %s from conference %s",
-                            call_info["call_tag"],
-                            conference_name,
-                        )
+                self._start_participant_batch(
+                    "kick",
+                    conference_name,
+                    conference_info.get("conference_sid"),
+                    graph.present_with_role(conference_name, "ai-voice-agent"),
+                )
             if stream_audio:
-                participant_label = redis[sid]["participant_label"]
+                participant_label = call_info["participant_label"]
                 client = current_app.config["twilio_client"]
                 app = current_app._get_current_object()
 
@@ -128,46 +147,26 @@ class CallEventsHandler:
                     args=(client, sid, participant_label, app),
                     daemon=True,
                 ).start()
-            self.call_log[log_key]["answered_time"] = timestamp
         elif status in ["completed", "no-answer", "busy", "failed"]:
             if status == "no-answer" or status == "busy":
-                redis = current_app.config["redis"]
-                call_info = redis.get(sid, {})
+                call_info = graph.call(sid)
                 call_conference_info = call_info.get("conference", {})
-                conference_name = call_conference_info.get(
-                    "conference_name", None
-                )
-                conference_info = redis.get(conference_name, {})
+                conference_name = graph.conference_of(sid)
+                conference_info = graph.conference(conference_name)
                 kick_participant_from_conference = str2bool(
                     call_conference_info.get(
                         "kick_participant_from_conference", False
                     )
                 )
                 if kick_participant_from_conference:
-                    all_calls = conference_info["calls"]
-                    for call_sid, call_info in all_calls.items():
-                        if (
-                            call_info.get("role") == "ai-voice-agent"
-                            or call_info.get("role") == "customer"
-                        ):
-                            client = current_app.config["twilio_client"]
-                            client.conferences(
-                                conference_info["conference_sid"]
-                            ).participants(call_sid).update(
-                                hold=False, muted=False
-                            )
-                            p = redis[conference_name]["participants"].get(
-                                call_sid
-                            )
-                            if p:
-                                p["on_hold"] = False
-                            current_app.logger.info(
-                                "🎤 Unheld participant %s from conference %s",
-                                call_info["call_tag"],
-                                conference_name,
-                            )
-
-            self.call_log[log_key]["end_time"] = timestamp
+                    self._start_participant_batch(
+                        "unhold",
+                        conference_name,
+                        conference_info.get("conference_sid"),
+                        graph.present_with_role(
+                            conference_name, "ai-voice-agent", "customer"
+                        ),
+                    )
 
         self._emit_status_event(
             call_type,
@@ -182,7 +181,7 @@ class CallEventsHandler:
         )
 
         self._maybe_emit_ring_duration(
-            log_key, call_type, sid, parent_sid, timestamp, identity
+            call_type, sid, parent_sid, timestamp, identity
         )
 
         current_app.logger.info(
@@ -192,6 +191,81 @@ class CallEventsHandler:
         )
         return "", 204
 
+    def _start_participant_batch(
+        self, action, conference_name, conference_sid, members
+    ):
+        """Run *action* ("kick" or "unhold") for *members* in a background
+        thread so the webhook can return immediately.
+        """
+        if not members or not conference_sid:
+            return
+        client = current_app.config["twilio_client"]
+        app = current_app._get_current_object()
+        threading.Thread(
+            target=self._run_participant_batch,
+            args=(
+                client,
+                action,
+                conference_name,
+                conference_sid,
+                members,
+                app,
+            ),
+            daemon=True,
+        ).start()
+
+    def _run_participant_batch(
+        self, client, action, conference_name, conference_sid, members, app
+    ):
+        """Issue the participant REST calls for one batch concurrently."""
+
+        def apply(call_sid):
+            participant = client.conferences(conference_sid).participants(
+                call_sid
+            )
+            if action == "kick":
+                participant.delete()
+            else:
+                participant.update(hold=False, muted=False)
+
+        with app.app_context():
+            with ThreadPoolExecutor(max_workers=min(len(members), 8)) as pool:
+                futures = {
+                    pool.submit(apply, call_sid): (call_sid, member)
+                    for call_sid, member in members
+                }
+                for future in as_completed(futures):
+                    call_sid, member = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        current_app.logger.warning(
+                            "🎤 Failed to %s participant %s in conference %s: %s",
+                            action,
+                            call_sid,
+                            conference_name,
+                            e,
+                        )
+                        continue
+                    if action == "kick":
+                        self.call_graph.participant_left(
+                            conference_name, call_sid
+                        )
+                        current_app.logger.info(
+                            "🎤 Kicked participant %s from conference %s",
+                            member.get("call_tag"),
+                            conference_name,
+                        )
+                    else:
+                        self.call_graph.update_participant(
+                            conference_name, call_sid, on_hold=False
+                        )
+                        current_app.logger.info(
+                            "🎤 Unheld participant %s from conference %s",
+                            member.get("call_tag"),
+                            conference_name,
+                        )
+
     def _start_media_stream(self, client, call_sid, participant_label, app):
         """Start a Media Stream on the specified call so audio is sent to the
         websocket.
@@ -209,13 +283,9 @@ class CallEventsHandler:
 
             for attempt in range(3):
                 try:
-                    redis = current_app.config["redis"]
-                    call_info = redis.get(call_sid, {})
-                    call_conference_info = call_info.get("conference", {})
-                    conference_name = call_conference_info.get(
-                        "conference_name"
-                    )
-                    global_conference_info = redis.get(conference_name, {})
+                    graph = current_app.config["call_graph"]
+                    conference_name = graph.conference_of(call_sid)
+                    global_conference_info = graph.conference(conference_name)
                     recording_start_time_epoch = global_conference_info.get(
                         "recording_start_time", 0
                     )
@@ -240,6 +310,8 @@ class CallEventsHandler:
                             "parameter4_value": time.time(),
                             "parameter5_name": "recording_start_time_in_epoch_seconds",
                             "parameter5_value": recording_start_time_epoch,
+                            "parameter6_name": "conference_name",
+                            "parameter6_value": conference_name,
                         },
                     )
                     current_app.logger.debug(
@@ -253,6 +325,23 @@ class CallEventsHandler:
                         attempt + 1,
                     )
                     break
+                except TwilioGuardError as e:
+                    # Streams are non-critical: park the work until Twilio
+                    # recovers instead of adding to the overload.
+                    current_app.logger.warning(
+                        "🎤 Deferring media stream start for %s: %s",
+                        call_sid,
+                        e,
+                    )
+                    client.defer(
+                        f"media stream start for {call_sid}",
+                        self._start_media_stream,
+                        client,
+                        call_sid,
+                        participant_label,
+                        app,
+                    )
+                    break
                 except Exception as e:
                     current_app.logger.warning(
                         "Retry %s/3 - Failed to start media stream for %s: %s",
@@ -260,7 +349,7 @@ class CallEventsHandler:
                         call_sid,
                         e,
                     )
-                    time.sleep(1)
+                    time.sleep(retry_delay(attempt))
 
     def _emit_parent_child_sids(
         self,
@@ -273,56 +362,28 @@ class CallEventsHandler:
         if identity is None:
             return
 
+        graph = self.call_graph
         if call_type == "parent":
-            if not self.call_log.get(sid, {}).get("parent_sid_emitted"):
+            if not graph.call(sid).get("parent_sid_emitted"):
                 self.socketio.emit(
                     "parent_call_sid", {"parent_sid": sid}, room=identity
                 )
-                self.call_log.setdefault(sid, {})["parent_sid_emitted"] = True
+                graph.update_call(sid, parent_sid_emitted=True)
 
         if call_type == "child":
-            if not self.call_log.get(parent_sid, {}).get("parent_sid_emitted"):
+            if not graph.call(parent_sid).get("parent_sid_emitted"):
                 self.socketio.emit(
                     "parent_call_sid", {"parent_sid": parent_sid}, room=identity
                 )
-                self.call_log.setdefault(parent_sid, {})[
-                    "parent_sid_emitted"
-                ] = True
+                graph.update_call(parent_sid, parent_sid_emitted=True)
 
-            if not self.call_log.get(sid, {}).get("child_sid_emitted"):
+            if not graph.call(sid).get("child_sid_emitted"):
                 self.socketio.emit(
                     "child_call_sid",
                     {"child_sid": sid, "parent_sid": parent_sid},
                     room=identity,
                 )
-                self.call_log.setdefault(sid, {})["child_sid_emitted"] = True
-
-    def _ensure_log_entry(
-        self, sid: str, parent_sid: str | None, call_type: str
-    ) -> str:
-        log_key = sid
-        if log_key not in self.call_log:
-            self.call_log[log_key] = {
-                "sid": sid,
-                "parent_sid": parent_sid,
-                "type": call_type,
-                "events": [],
-                "ringing_time": None,
-                "answered_time": None,
-                "end_time": None,
-                "ring_duration_emitted": False,
-            }
-        else:
-            entry = self.call_log[log_key]
-            entry.setdefault("sid", sid)
-            entry.setdefault("parent_sid", parent_sid)
-            entry.setdefault("type", call_type)
-            entry.setdefault("events", [])
-            entry.setdefault("ringing_time", None)
-            entry.setdefault("answered_time", None)
-            entry.setdefault("end_time", None)
-            entry.setdefault("ring_duration_emitted", False)
-        return log_key
+                graph.update_call(sid, child_sid_emitted=True)
 
     def _emit_status_event(
         self,
@@ -376,7 +437,6 @@ class CallEventsHandler:
 
     def _maybe_emit_ring_duration(
         self,
-        log_key,
         call_type,
         sid,
         parent_sid,
@@ -385,7 +445,7 @@ class CallEventsHandler:
     ):
         if identity is None:
             return
-        entry = self.call_log[log_key]
+        entry = self.call_graph.call(sid)
         if (
             entry["ringing_time"] is not None
             and entry["end_time"] is not None
@@ -403,4 +463,4 @@ class CallEventsHandler:
                 "event": "ring_duration",
             }
             self.socketio.emit("call_event", ring_data, room=identity)
-            entry["ring_duration_emitted"] = True
+            self.call_graph.update_call(sid, ring_duration_emitted=True)
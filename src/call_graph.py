@@ -0,0 +1,380 @@
+import functools
+import threading
+
+# Call statuses after which a call no longer counts as active for an identity.
+TERMINAL_STATUSES = frozenset({"completed", "no-answer", "busy", "failed"})
+
+
+def _mutation(method):
+    """Mark a CallGraph method as a state change.
+
+    The outermost mutation of a call chain is reported to the registered
+    listener (see :meth:`CallGraph.set_mutation_listener`) while the lock is
+    still held, so listeners observe changes in the order they were applied.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            self._depth += 1
+            try:
+                result = method(self, *args, **kwargs)
+            finally:
+                self._depth -= 1
+            if self._depth == 0 and self._listener is not None:
+                self._listener(method.__name__, args, kwargs)
+            return result
+
+    return wrapper
+
+
+class CallGraph:
+    """Single in-memory store for calls and conferences with secondary
+    indexes.
+
+    Replaces the former ``call_log`` and ``redis`` dicts. A call record holds
+    both the status-callback facts (ring/answer/end times, emitted flags,
+    parent number) and the routing configuration set up by the hold
+    and transfer flows (stream/conference settings). A conference record keeps
+    the familiar ``calls`` / ``participants`` shape.
+
+    Maintained indexes:
+
+    • call → parent and parent → children
+    • call → conference
+    • conference → role → call SIDs currently in the conference, kept up to
+      date from participant join/leave events
+    • identity → active (not yet ended) call SIDs
+
+    Records returned by the accessors are live objects and must be treated as
+    read-only; all writes go through the methods below so that the indexes
+    never drift from the data. Every write method is deterministic given its
+    arguments, which lets :mod:`src.state_store` journal and replay them.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._calls: dict[str, dict] = {}
+        self._conferences: dict[str, dict] = {}
+        self._children: dict[str, set[str]] = {}
+        self._conference_of: dict[str, str] = {}
+        self._present: dict[str, dict[str, set[str]]] = {}
+        self._identity_calls: dict[str, set[str]] = {}
+        self._listener = None
+        self._depth = 0
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def set_mutation_listener(self, listener) -> None:
+        """Call ``listener(method_name, args, kwargs)`` after each write."""
+        self._listener = listener
+
+    @property
+    def lock(self) -> threading.RLock:
+        return self._lock
+
+    def apply(self, method_name: str, args, kwargs) -> None:
+        """Replay a journaled write without notifying the listener."""
+        listener, self._listener = self._listener, None
+        try:
+            getattr(self, method_name)(*args, **kwargs)
+        finally:
+            self._listener = listener
+
+    def to_state(self) -> dict:
+        """Return the full graph state as plain (serialisable) structures.
+
+        The call and conference records are the live ones, not copies:
+        serialise the result while holding :attr:`lock`.
+        """
+        with self._lock:
+            return {
+                "calls": self._calls,
+                "conferences": self._conferences,
+                "conference_of": self._conference_of,
+                "present": {
+                    name: {
+                        role or "": sorted(sids) for role, sids in by.items()
+                    }
+                    for name, by in self._present.items()
+                },
+            }
+
+    def call_count(self) -> int:
+        return len(self._calls)
+
+    def load_state(self, state: dict) -> None:
+        """Replace the graph contents with *state* and rebuild indexes."""
+        with self._lock:
+            self._calls = state.get("calls", {})
+            self._conferences = state.get("conferences", {})
+            self._conference_of = dict(state.get("conference_of", {}))
+            self._present = {
+                name: {role or None: set(sids) for role, sids in by.items()}
+                for name, by in state.get("present", {}).items()
+            }
+            self._children = {}
+            self._identity_calls = {}
+            for sid, entry in self._calls.items():
+                if entry.get("parent_sid"):
+                    self._children.setdefault(entry["parent_sid"], set()).add(
+                        sid
+                    )
+                self._index_identity(sid, entry)
+
+    @_mutation
+    def prune(self, ended_before: float) -> int:
+        """Forget calls that ended before *ended_before* (epoch seconds) and
+        conferences left without any known call. Returns calls removed.
+        """
+        stale = [
+            sid
+            for sid, entry in self._calls.items()
+            if entry.get("end_time") is not None
+            and entry["end_time"] < ended_before
+        ]
+        for sid in stale:
+            entry = self._calls.pop(sid)
+            self._conference_of.pop(sid, None)
+            self._children.pop(sid, None)
+            siblings = self._children.get(entry.get("parent_sid"))
+            if siblings is not None:
+                siblings.discard(sid)
+            for active in self._identity_calls.values():
+                active.discard(sid)
+        for name in list(self._conferences):
+            members = self._conferences[name].get("calls", {})
+            present = any(self._present.get(name, {}).values())
+            if not present and not any(sid in self._calls for sid in members):
+                del self._conferences[name]
+                self._present.pop(name, None)
+        return len(stale)
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+
+    def _ensure_call(self, sid: str) -> dict:
+        entry = self._calls.get(sid)
+        if entry is None:
+            entry = self._calls[sid] = {
+                "sid": sid,
+                "parent_sid": None,
+                "type": None,
+                "ringing_time": None,
+                "answered_time": None,
+                "end_time": None,
+                "ring_duration_emitted": False,
+            }
+        return entry
+
+    def call(self, sid: str | None) -> dict:
+        """Return the record for *sid*, or an empty dict if unknown."""
+        return self._calls.get(sid, {}) if sid else {}
+
+    @_mutation
+    def record_call_event(
+        self,
+        sid: str,
+        parent_sid: str | None,
+        call_type: str,
+        identity: str | None,
+        event: dict,
+    ) -> dict:
+        """Apply a status-callback *event* to the call and update indexes.
+
+        Only the derived timings are kept here; the full event history lives
+        in :mod:`src.call_event_journal`.
+        """
+        status = event.get("status")
+        timestamp = event.get("timestamp")
+        with self._lock:
+            entry = self._ensure_call(sid)
+            if entry["type"] is None:
+                entry["type"] = call_type
+            if parent_sid and entry["parent_sid"] is None:
+                entry["parent_sid"] = parent_sid
+                self._children.setdefault(parent_sid, set()).add(sid)
+            if "from" not in entry:
+                entry["from"] = event.get("from")
+                entry["to"] = event.get("to")
+
+            if status == "ringing":
+                entry["ringing_time"] = timestamp
+            elif status == "in-progress":
+                entry["answered_time"] = timestamp
+            elif status in TERMINAL_STATUSES:
+                entry["end_time"] = timestamp
+
+            if identity:
+                entry.setdefault("identity", identity)
+            self._index_identity(sid, entry)
+            return entry
+
+    @_mutation
+    def update_call(self, sid: str, **fields) -> dict:
+        """Set plain fields (flags, ``parent_number`` …) on a call record."""
+        with self._lock:
+            entry = self._ensure_call(sid)
+            entry.update(fields)
+            return entry
+
+    @_mutation
+    def configure_call(self, sid: str, config: dict) -> dict:
+        """Store stream/conference routing *config* on a call record.
+
+        ``config["conference"]["conference_name"]``, when present, is indexed
+        as the call's conference.
+        """
+        with self._lock:
+            entry = self._ensure_call(sid)
+            entry.update(config)
+            conference_name = (config.get("conference") or {}).get(
+                "conference_name"
+            )
+            if conference_name:
+                self._conference_of[sid] = conference_name
+            self._index_identity(sid, entry)
+            return entry
+
+    def _index_identity(self, sid: str, entry: dict) -> None:
+        identity = entry.get("identity")
+        if not identity:
+            return
+        active = self._identity_calls.setdefault(identity, set())
+        if entry.get("end_time") is None:
+            active.add(sid)
+        else:
+            active.discard(sid)
+
+    def parent_of(self, sid: str) -> str | None:
+        return self.call(sid).get("parent_sid")
+
+    def children_of(self, sid: str) -> list[str]:
+        return sorted(self._children.get(sid, ()))
+
+    def conference_of(self, sid: str | None) -> str | None:
+        return self._conference_of.get(sid) if sid else None
+
+    def active_calls_for(self, identity: str) -> list[str]:
+        return sorted(self._identity_calls.get(identity, ()))
+
+    def counterparty_number(self, sid: str, own_number: str | None):
+        """Return the far-end number of *sid* from its first status event."""
+        entry = self.call(sid)
+        from_number, to_number = entry.get("from"), entry.get("to")
+        if from_number and from_number != own_number:
+            return from_number
+        if to_number and to_number != own_number:
+            return to_number
+        return None
+
+    # ------------------------------------------------------------------
+    # Conferences
+    # ------------------------------------------------------------------
+
+    def conference(self, name: str | None) -> dict:
+        """Return the record for conference *name*, or an empty dict."""
+        return self._conferences.get(name, {}) if name else {}
+
+    @_mutation
+    def ensure_conference(self, name: str, created_by: str | None = None):
+        with self._lock:
+            conference = self._conferences.get(name)
+            if conference is None:
+                conference = self._conferences[name] = {
+                    "created_by": created_by,
+                    "calls": {},
+                    "participants": {},
+                }
+            conference.setdefault("calls", {})
+            conference.setdefault("participants", {})
+            return conference
+
+    @_mutation
+    def create_conference(self, name: str, created_by: str | None, **fields):
+        """(Re)create conference *name*, dropping any previous membership."""
+        with self._lock:
+            previous = self._conferences.get(name, {})
+            for sid in previous.get("calls", {}):
+                if self._conference_of.get(sid) == name:
+                    del self._conference_of[sid]
+            self._present.pop(name, None)
+            self._conferences[name] = {
+                "created_by": created_by,
+                **fields,
+                "calls": {},
+                "participants": {},
+            }
+            return self._conferences[name]
+
+    @_mutation
+    def set_conference_fields(self, name: str, **fields) -> dict:
+        """Set plain fields (``conference_sid``, ``recording_start_time`` …)."""
+        with self._lock:
+            conference = self.ensure_conference(name)
+            conference.update(fields)
+            return conference
+
+    @_mutation
+    def add_conference_call(self, name: str, call_sid: str, info: dict):
+        """Register *call_sid* as a member of conference *name*."""
+        with self._lock:
+            conference = self.ensure_conference(name)
+            conference["calls"][call_sid] = info
+            self._conference_of[call_sid] = name
+
+    @_mutation
+    def participant_joined(
+        self, name: str, call_sid: str, role: str | None
+    ) -> None:
+        """Record that *call_sid* is now in conference *name* as *role*."""
+        with self._lock:
+            self.participant_left(name, call_sid)
+            self._present.setdefault(name, {}).setdefault(role, set()).add(
+                call_sid
+            )
+
+    @_mutation
+    def participant_left(self, name: str, call_sid: str | None) -> None:
+        with self._lock:
+            for sids in self._present.get(name, {}).values():
+                sids.discard(call_sid)
+
+    @_mutation
+    def conference_ended(self, name: str) -> None:
+        with self._lock:
+            self._present.pop(name, None)
+
+    def present_with_role(
+        self, name: str, *roles: str
+    ) -> list[tuple[str, dict]]:
+        """Return ``(call_sid, call_info)`` for participants of *name* that are
+        currently in the conference with any of *roles*.
+        """
+        present = self._present.get(name, {})
+        calls = self.conference(name).get("calls", {})
+        return [
+            (sid, calls.get(sid, {}))
+            for role in roles
+            for sid in sorted(present.get(role, ()))
+        ]
+
+    @_mutation
+    def set_participant(self, name: str, call_sid: str, info: dict) -> None:
+        with self._lock:
+            self.ensure_conference(name)["participants"][call_sid] = info
+
+    @_mutation
+    def update_participant(self, name: str, call_sid: str, **fields) -> bool:
+        """Update a known participant; return False if it is not tracked."""
+        with self._lock:
+            participant = (
+                self.conference(name).get("participants", {}).get(call_sid)
+            )
+            if participant is None:
+                return False
+            participant.update(fields)
+            return True
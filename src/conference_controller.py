@@ -178,8 +178,8 @@ def get_conference_participants(conference_name):
         "🎪 get_conference_participants invoked",
         extra={"conference_name": conference_name},
     )
-    redis = current_app.config["redis"]
-    participants = redis.get(conference_name, {}).get("participants", {})
+    graph = current_app.config["call_graph"]
+    participants = graph.conference(conference_name).get("participants", {})
     result = []
     for sid, info in participants.items():
         # Skip any participant that has already left the conference
@@ -209,9 +209,9 @@ def mute_participant():
     conference_name = data.get("conference_name")
     call_sid = data.get("call_sid")
     mute = data.get("mute", True)
-    redis = current_app.config["redis"]
+    graph = current_app.config["call_graph"]
     client = current_app.config["twilio_client"]
-    conf_sid = redis.get(conference_name, {}).get("conference_sid")
+    conf_sid = graph.conference(conference_name).get("conference_sid")
     if not conf_sid or not call_sid:
         return abort(400, "Missing conference_sid or call_sid")
     try:
@@ -219,9 +219,7 @@ def mute_participant():
             muted=bool(mute)
         )
 
-        p = redis[conference_name]["participants"].get(call_sid)
-        if p:
-            p["muted"] = bool(mute)
+        graph.update_participant(conference_name, call_sid, muted=bool(mute))
         current_app.logger.info("🎪 mute_participant processing complete")
         return jsonify({"success": True})
     except Exception as e:
@@ -237,9 +235,9 @@ def hold_participant():
     conference_name = data.get("conference_name")
     call_sid = data.get("call_sid")
     hold = data.get("hold", True)
-    redis = current_app.config["redis"]
+    graph = current_app.config["call_graph"]
     client = current_app.config["twilio_client"]
-    conf_sid = redis.get(conference_name, {}).get("conference_sid")
+    conf_sid = graph.conference(conference_name).get("conference_sid")
     if not conf_sid or not call_sid:
         return abort(400, "Missing conference_sid or call_sid")
     try:
@@ -247,9 +245,7 @@ def hold_participant():
             hold=bool(hold)
         )
 
-        p = redis[conference_name]["participants"].get(call_sid)
-        if p:
-            p["on_hold"] = bool(hold)
+        graph.update_participant(conference_name, call_sid, on_hold=bool(hold))
         current_app.logger.info("🎪 hold_participant processing complete")
         return jsonify({"success": True})
     except Exception as e:
@@ -273,17 +269,16 @@ def kick_participant():
             jsonify({"success": False, "error": "You cannot kick yourself."}),
             400,
         )
-    redis = current_app.config["redis"]
+    graph = current_app.config["call_graph"]
     client = current_app.config["twilio_client"]
-    conf_sid = redis.get(conference_name, {}).get("conference_sid")
+    conf_sid = graph.conference(conference_name).get("conference_sid")
     if not conf_sid or not call_sid:
         return abort(400, "Missing conference_sid or call_sid")
     try:
         client.conferences(conf_sid).participants(call_sid).delete()
 
-        p = redis[conference_name]["participants"].get(call_sid)
-        if p:
-            p["left"] = True
+        graph.update_participant(conference_name, call_sid, left=True)
+        graph.participant_left(conference_name, call_sid)
         current_app.logger.info("🎪 kick_participant processing complete")
         return jsonify({"success": True})
     except Exception as e:
@@ -322,12 +317,10 @@ def conference_recording_events():
             "recording_start_time_epoch: %s",
             recording_start_time_epoch,
         )
-        redis = current_app.config["redis"]
-        conference_info_via_friendly_name = redis.get(friendly_name, {})
-        conference_info_via_friendly_name["recording_start_time"] = (
-            recording_start_time_epoch
+        graph = current_app.config["call_graph"]
+        conference_info_via_friendly_name = graph.set_conference_fields(
+            friendly_name, recording_start_time=recording_start_time_epoch
         )
-        redis[friendly_name] = conference_info_via_friendly_name
         current_app.logger.warning(
             "conference_info_via_friendly_name: %s",
             conference_info_via_friendly_name,
@@ -339,6 +332,13 @@ def conference_recording_events():
     event_data = request.values.to_dict()
     socketio.emit("conference_recording_event", event_data)
 
+    pipeline = current_app.config.get("recording_pipeline")
+    if pipeline:
+        outcome = pipeline.submit(event_data, conference_name=friendly_name)
+        current_app.logger.info(
+            "🎪 Recording %s: %s", event_data.get("RecordingSid"), outcome
+        )
+
     current_app.logger.info(
         "🎪 conference_recording_events endpoint processing complete"
     )
@@ -5,6 +5,8 @@ import time
 from flask import current_app, url_for
 from flask_socketio import SocketIO
 
+from src.twilio_guard import TwilioGuardError, retry_delay
+
 
 def str2bool(val, default=False):
     if isinstance(val, bool):
@@ -57,12 +59,11 @@ class ConferenceEventsHandler:
         start_conference_on_enter = values.get("StartConferenceOnEnter")
         hold = str2bool(values.get("Hold"))
         muted = str2bool(values.get("Muted"))
-        redis = current_app.config["redis"]
-        redis.setdefault(friendly_name, {})
-        redis[friendly_name]["conference_sid"] = conference_sid
-        redis[friendly_name].setdefault("participants", {})
-        participants = redis[friendly_name]["participants"]
-        calls = redis[friendly_name].get("calls", {})
+        graph = current_app.config["call_graph"]
+        conference = graph.set_conference_fields(
+            friendly_name, conference_sid=conference_sid
+        )
+        calls = conference["calls"]
 
         role = None
         if call_sid in calls:
@@ -82,20 +83,24 @@ class ConferenceEventsHandler:
         )
 
         current_app.logger.debug(
-            "Redis conference snapshot: %s", redis.get(friendly_name)
+            "Conference snapshot: %s", graph.conference(friendly_name)
         )
+        if event_type == "participant-join":
+            graph.participant_joined(friendly_name, call_sid, role)
         if event_type == "participant-leave":
             # Twilio sometimes sends the participant's SID under the ParticipantSid parameter instead
             # of CallSid.  Fall back to that when CallSid is missing so that we correctly flag the
             # departing participant in our in-memory cache.
             leave_sid = call_sid or values.get("ParticipantSid")
-            if leave_sid in participants:
-                participants[leave_sid]["left"] = True
+            graph.update_participant(friendly_name, leave_sid, left=True)
+            graph.participant_left(friendly_name, leave_sid)
+        if event_type == "conference-end":
+            graph.conference_ended(friendly_name)
         try:
             if event_type == "participant-unhold":
-                role = redis[friendly_name]["calls"][call_sid]["role"]
+                call_info = calls[call_sid]
+                role = call_info["role"]
                 current_app.logger.debug("🎤 role: %s", role)
-                call_info = redis[friendly_name]["calls"].get(call_sid, {})
                 stream_audio_flag = str2bool(
                     call_info.get("stream_audio", False)
                 )
@@ -110,9 +115,9 @@ class ConferenceEventsHandler:
                     ).start()
 
             if event_type == "participant-hold":
-                role = redis[friendly_name]["calls"][call_sid]["role"]
+                call_info = calls[call_sid]
+                role = call_info["role"]
                 current_app.logger.debug("🎤 role: %s", role)
-                call_info = redis[friendly_name]["calls"].get(call_sid, {})
                 stream_audio_flag = str2bool(
                     call_info.get("stream_audio", False)
                 )
@@ -125,7 +130,7 @@ class ConferenceEventsHandler:
                     except Exception as e:
                         current_app.logger.error(
                             f"No stream to stop on {call_sid} leg: {e}"
-                )
+                        )
                 if role == "customer":
                     add_to_conference = call_info.get(
                         "add_to_conference", False
@@ -158,9 +163,9 @@ class ConferenceEventsHandler:
                             daemon=True,
                         ).start()
             if event_type == "participant-join":
-                role = redis[friendly_name]["calls"][call_sid]["role"]
+                call_info = calls[call_sid]
+                role = call_info["role"]
                 current_app.logger.debug("🎤 role: %s", role)
-                call_info = redis[friendly_name]["calls"].get(call_sid, {})
                 hold_on_conference_join = str2bool(
                     call_info.get("hold_on_conference_join", False)
                 )
@@ -189,17 +194,12 @@ class ConferenceEventsHandler:
                 )
 
                 if role == "agent":
-                    call_info = redis[friendly_name]["calls"].get(call_sid, {})
                     add_to_conference = call_info.get(
                         "add_to_conference", False
                     )
                     if add_to_conference:
-                        participant_role = redis[friendly_name]["calls"][
-                            call_sid
-                        ]["participant_role"]
-                        identity = redis[friendly_name]["calls"][call_sid][
-                            "participant_identity"
-                        ]
+                        participant_role = call_info["participant_role"]
+                        identity = call_info["participant_identity"]
                         current_app.logger.debug(
                             "🎤 Adding participant %s to conference %s",
                             participant_label,
@@ -227,7 +227,7 @@ class ConferenceEventsHandler:
                 if hold_on_conference_join:
                     current_app.logger.debug(
                         "🎤 Placing participant %s on hold (call_sid=%s)",
-                        redis[friendly_name]["calls"][call_sid]["call_tag"],
+                        call_info["call_tag"],
                         call_sid,
                     )
                     client = current_app.config["twilio_client"]
@@ -240,7 +240,7 @@ class ConferenceEventsHandler:
                             conference_sid,
                             call_sid,
                             friendly_name,
-                            redis,
+                            graph,
                             url_for,
                             app,
                         ),
@@ -250,7 +250,7 @@ class ConferenceEventsHandler:
                 if play_temporary_greeting:
                     current_app.logger.debug(
                         "🎤 Playing temporary greeting for participant %s (call_sid=%s)",
-                        redis[friendly_name]["calls"][call_sid]["call_tag"],
+                        call_info["call_tag"],
                         call_sid,
                     )
                     client = current_app.config["twilio_client"]
@@ -263,7 +263,7 @@ class ConferenceEventsHandler:
                             conference_sid,
                             call_sid,
                             friendly_name,
-                            redis,
+                            graph,
                             url_for,
                             app,
                         ),
@@ -336,7 +336,7 @@ class ConferenceEventsHandler:
             targets.add(participant_label)
 
         # Also include the agent that originally created the conference.
-        created_by = redis.get(friendly_name, {}).get("created_by")
+        created_by = graph.conference(friendly_name).get("created_by")
         if created_by:
             targets.add(created_by)
 
@@ -366,7 +366,7 @@ class ConferenceEventsHandler:
         conference_sid,
         call_sid,
         friendly_name,
-        redis,
+        graph,
         url_for_func,
         app,
     ):
@@ -380,9 +380,9 @@ class ConferenceEventsHandler:
                         hold_url=url_for_func("hold.hold_music"),
                         hold_method="POST",
                     )
-                    redis[friendly_name]["participants"][call_sid][
-                        "on_hold"
-                    ] = True
+                    graph.update_participant(
+                        friendly_name, call_sid, on_hold=True
+                    )
                     current_app.logger.debug(
                         "🎤 Successfully put %s on hold (attempt %s)",
                         call_sid,
@@ -396,7 +396,7 @@ class ConferenceEventsHandler:
                         call_sid,
                         e,
                     )
-                    time.sleep(1)
+                    time.sleep(retry_delay(attempt))
 
     def _play_temporary_greeting(
         self,
@@ -404,7 +404,7 @@ class ConferenceEventsHandler:
         conference_sid,
         call_sid,
         friendly_name,
-        redis,
+        graph,
         url_for_func,
         app,
     ):
@@ -418,15 +418,33 @@ class ConferenceEventsHandler:
                             "greet.temporary_message", _external=True
                         )
                     )
-                    redis[friendly_name]["participants"][call_sid][
-                        "play_temporary_greeting"
-                    ] = False
+                    graph.update_participant(
+                        friendly_name, call_sid, play_temporary_greeting=False
+                    )
                     current_app.logger.debug(
                         "🎤 Successfully played temporary greeting for %s (attempt %s)",
                         call_sid,
                         attempt + 1,
                     )
                     break
+                except TwilioGuardError as e:
+                    current_app.logger.warning(
+                        "🎤 Deferring temporary greeting for %s: %s",
+                        call_sid,
+                        e,
+                    )
+                    client.defer(
+                        f"temporary greeting for {call_sid}",
+                        self._play_temporary_greeting,
+                        client,
+                        conference_sid,
+                        call_sid,
+                        friendly_name,
+                        graph,
+                        url_for_func,
+                        app,
+                    )
+                    break
                 except Exception as e:
                     current_app.logger.warning(
                         "Retry %s/5 - Failed to play temporary greeting for %s: %s",
@@ -434,7 +452,7 @@ class ConferenceEventsHandler:
                         call_sid,
                         e,
                     )
-                    time.sleep(1)
+                    time.sleep(retry_delay(attempt))
 
     def _start_media_stream(self, client, call_sid, participant_label, app):
         """Start a Media Stream on the specified call so audio is sent to the
@@ -451,14 +469,9 @@ class ConferenceEventsHandler:
 
             for attempt in range(3):
                 try:
-                    redis = current_app.config["redis"]
-
-                    call_info = redis.get(call_sid, {})
-                    conference_info_of_call = call_info.get("conference", {})
-                    conference_name = conference_info_of_call.get(
-                        "conference_name"
-                    )
-                    global_conference_info = redis.get(conference_name, {})
+                    graph = current_app.config["call_graph"]
+                    conference_name = graph.conference_of(call_sid)
+                    global_conference_info = graph.conference(conference_name)
                     recording_start_time_epoch = global_conference_info.get(
                         "recording_start_time", 0
                     )
@@ -482,6 +495,8 @@ class ConferenceEventsHandler:
                             "parameter4_value": time.time(),
                             "parameter5_name": "recording_start_time_in_epoch_seconds",
                             "parameter5_value": recording_start_time_epoch,
+                            "parameter6_name": "conference_name",
+                            "parameter6_value": conference_name,
                         },
                     )
                     current_app.logger.warning(
@@ -495,6 +510,23 @@ class ConferenceEventsHandler:
                         attempt + 1,
                     )
                     break
+                except TwilioGuardError as e:
+                    # Streams are non-critical: park the work until Twilio
+                    # recovers instead of adding to the overload.
+                    current_app.logger.warning(
+                        "🎤 Deferring media stream start for %s: %s",
+                        call_sid,
+                        e,
+                    )
+                    client.defer(
+                        f"media stream start for {call_sid}",
+                        self._start_media_stream,
+                        client,
+                        call_sid,
+                        participant_label,
+                        app,
+                    )
+                    break
                 except Exception as e:
                     current_app.logger.warning(
                         "Retry %s/3 - Failed to start media stream for %s: %s",
@@ -502,7 +534,7 @@ class ConferenceEventsHandler:
                         call_sid,
                         e,
                     )
-                    time.sleep(1)
+                    time.sleep(retry_delay(attempt))
 
     def _add_participant_to_conference(
         self,
@@ -582,37 +614,38 @@ class ConferenceEventsHandler:
             )
             call_sid = call.call_sid
 
-            redis = current_app.config["redis"]
-            if friendly_name not in redis:
-                redis[friendly_name] = {
-                    "created_by": identity,
-                    "calls": {},
-                    "participants": {},
-                }
-
-            redis[friendly_name]["calls"][call_sid] = {
-                "call_tag": participant_label,
-                "role": participant_role,
-                "hold_on_conference_join": False,
-                "play_temporary_greeting_to_participant": (
-                    True if participant_role == "agent" else False
-                ),
-            }
-
-            redis[call_sid] = {
-                "stream_audio": stream_audio,
-                "participant_label": participant_label,
-                "muted": True,
-                "on_hold": False,
-                "role": participant_role,
-                "conference": {
-                    "conference_sid": conference_sid,
-                    "conference_name": friendly_name,
+            graph = current_app.config["call_graph"]
+            graph.ensure_conference(friendly_name, created_by=identity)
+            graph.add_conference_call(
+                friendly_name,
+                call_sid,
+                {
+                    "call_tag": participant_label,
+                    "role": participant_role,
+                    "hold_on_conference_join": False,
+                    "play_temporary_greeting_to_participant": (
+                        True if participant_role == "agent" else False
+                    ),
+                },
+            )
+
+            graph.configure_call(
+                call_sid,
+                {
+                    "stream_audio": stream_audio,
+                    "participant_label": participant_label,
+                    "muted": True,
                     "on_hold": False,
                     "role": participant_role,
-                    "start_conference_on_enter": False,
-                    "end_conference_on_exit": False,
-                    "kick_participant_from_conference": kick,
-                    "update_participant_in_conference": True,
+                    "conference": {
+                        "conference_sid": conference_sid,
+                        "conference_name": friendly_name,
+                        "on_hold": False,
+                        "role": participant_role,
+                        "start_conference_on_enter": False,
+                        "end_conference_on_exit": False,
+                        "kick_participant_from_conference": kick,
+                        "update_participant_in_conference": True,
+                    },
                 },
-            }
+            )
@@ -3,6 +3,7 @@ from flask import Blueprint, current_app, request, url_for
 from twilio.twiml.voice_response import VoiceResponse
 
 from src.constants import NAME
+from src.twilio_guard import TwilioGuardError
 from src.utils import xml_response
 
 load_dotenv()
@@ -27,7 +28,27 @@ def play_greeting_to_participant(
         conference_name=conference_name,
         _external=True,
     )
-    client.calls(participant_call_sid).update(url=greeting_url, method="POST")
+    try:
+        client.calls(participant_call_sid).update(
+            url=greeting_url, method="POST"
+        )
+    except TwilioGuardError as e:
+        # Greetings are non-critical; replay once the Twilio API recovers.
+        current_app.logger.warning(
+            "🙋 Deferring greeting for call %s: %s", participant_call_sid, e
+        )
+        client.defer(
+            f"greeting for {participant_call_sid}",
+            _deferred_greeting,
+            current_app._get_current_object(),
+            participant_call_sid,
+            conference_name,
+        )
+
+
+def _deferred_greeting(app, participant_call_sid: str, conference_name: str):
+    with app.app_context():
+        play_greeting_to_participant(participant_call_sid, conference_name)
 
 
 @greet_bp.route("/greeting", methods=["GET", "POST"])
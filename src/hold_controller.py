@@ -26,7 +26,7 @@ def hold_call():
     current_app.logger.info("🎶 hold_call invoked", extra={"payload": data})
 
     client = current_app.config["twilio_client"]
-    call_log = current_app.config["call_log"]
+    graph = current_app.config["call_graph"]
     child_call_sid = data.get("child_call_sid")
     parent_call_sid = data.get("parent_call_sid")
     parent_target = data.get("parent_target")
@@ -121,17 +121,9 @@ def hold_call():
                     "Could not place child on hold: %s", e
                 )
 
-        parent_number = parent_target
-        if not parent_number and parent_call_sid in call_log:
-            events = call_log[parent_call_sid].get("events", [])
-            if events:
-                first_evt = events[0]
-                cand_from = first_evt.get("from")
-                cand_to = first_evt.get("to")
-                if cand_from and cand_from != CALLER_ID:
-                    parent_number = cand_from
-                elif cand_to and cand_to != CALLER_ID:
-                    parent_number = cand_to
+        parent_number = parent_target or graph.counterparty_number(
+            parent_call_sid, CALLER_ID
+        )
 
         if not parent_number:
 
@@ -141,9 +133,7 @@ def hold_call():
                 pass
 
         if parent_number:
-            call_log.setdefault(parent_call_sid, {})[
-                "parent_number"
-            ] = parent_number
+            graph.update_call(parent_call_sid, parent_number=parent_number)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -224,29 +214,32 @@ def hold_call_via_conference():
         )
 
     try:
-        redis = current_app.config["redis"]
-        redis[conference_name] = {
-            "created_by": identity,
-            "calls": {
-                parent_call_sid: {
-                    "call_tag": parent_name,
-                    "hold_on_conference_join": False,
-                    "initial_call_recording_sid": get_value(
-                        recordings, parent_call_sid
-                    ),
-                    "role": parent_role,
-                },
-                child_call_sid: {
-                    "call_tag": child_name,
-                    "hold_on_conference_join": True,
-                    "initial_call_recording_sid": get_value(
-                        recordings, child_call_sid
-                    ),
-                    "role": child_role,
-                },
+        graph = current_app.config["call_graph"]
+        graph.create_conference(conference_name, created_by=identity)
+        graph.add_conference_call(
+            conference_name,
+            parent_call_sid,
+            {
+                "call_tag": parent_name,
+                "hold_on_conference_join": False,
+                "initial_call_recording_sid": get_value(
+                    recordings, parent_call_sid
+                ),
+                "role": parent_role,
+            },
+        )
+        graph.add_conference_call(
+            conference_name,
+            child_call_sid,
+            {
+                "call_tag": child_name,
+                "hold_on_conference_join": True,
+                "initial_call_recording_sid": get_value(
+                    recordings, child_call_sid
+                ),
+                "role": child_role,
             },
-            "participants": {},
-        }
+        )
         client.calls(child_call_sid).update(
             url=url_for(
                 "conference.join_conference",
@@ -265,13 +258,17 @@ def hold_call_via_conference():
             child_call_sid,
             conference_name,
         )
-        redis[conference_name]["participants"][child_call_sid] = {
-            "participant_label": child_name,
-            "call_sid": child_call_sid,
-            "muted": False,
-            "on_hold": True,
-            "role": child_role,
-        }
+        graph.set_participant(
+            conference_name,
+            child_call_sid,
+            {
+                "participant_label": child_name,
+                "call_sid": child_call_sid,
+                "muted": False,
+                "on_hold": True,
+                "role": child_role,
+            },
+        )
         client.calls(parent_call_sid).update(
             url=url_for(
                 "conference.join_conference",
@@ -292,13 +289,17 @@ def hold_call_via_conference():
             conference_name,
         )
 
-        redis[conference_name]["participants"][parent_call_sid] = {
-            "participant_label": parent_name,
-            "call_sid": parent_call_sid,
-            "muted": True,
-            "on_hold": False,
-            "role": parent_role,
-        }
+        graph.set_participant(
+            conference_name,
+            parent_call_sid,
+            {
+                "participant_label": parent_name,
+                "call_sid": parent_call_sid,
+                "muted": True,
+                "on_hold": False,
+                "role": parent_role,
+            },
+        )
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -314,11 +315,11 @@ def unhold_call():
     """
     data = request.json
     client = current_app.config["twilio_client"]
-    call_log = current_app.config["call_log"]
+    graph = current_app.config["call_graph"]
     parent_call_sid = data.get("parent_call_sid")
     conference_friendly_name = f"CallRoom_{parent_call_sid}"
 
-    parent_number = call_log.get(parent_call_sid, {}).get("parent_number")
+    parent_number = graph.call(parent_call_sid).get("parent_number")
     if not parent_number:
         return jsonify({"error": "Parent number not found for given SID"}), 400
 
@@ -0,0 +1,25 @@
+from flask import Blueprint, current_app, jsonify
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """Return runtime metrics (Twilio rate limits, circuit breaker, state
+    persistence, call event journal, recording downloads, live transcripts)
+    as JSON.
+    """
+    client = current_app.config["twilio_client"]
+    state_store = current_app.config["state_store"]
+    journal = current_app.config["call_event_journal"]
+    pipeline = current_app.config.get("recording_pipeline")
+    relay = current_app.config.get("transcript_relay")
+    return jsonify(
+        {
+            "twilio": client.stats(),
+            "state": state_store.stats(),
+            "call_events": journal.stats(),
+            "recordings": pipeline.stats() if pipeline else None,
+            "live_transcripts": relay.stats() if relay else None,
+        }
+    )
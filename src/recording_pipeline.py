@@ -0,0 +1,434 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Twilio serves a recording's media at its RecordingUrl plus an extension
+# (after redirecting to a presigned storage URL).
+DEFAULT_URL_TEMPLATE = "{RecordingUrl}.mp3"
+_CHUNK_SIZE = 1 << 16
+# Transcript metadata is at the start of the file; read at most this much.
+_METADATA_BYTES = 1 << 16
+
+
+def _transcript_metadata(path: str) -> dict:
+    with open(path, encoding="utf-8") as fp:
+        head = fp.read(_METADATA_BYTES)
+    if path.endswith(".jsonl"):
+        head = head.split("\n", 1)[0]
+    start = head.find('"metadata"')
+    start = head.find(":", start) + 1 if start >= 0 else 0
+    if not start:
+        return {}
+    try:
+        metadata, _end = json.JSONDecoder().raw_decode(head[start:].lstrip())
+    except ValueError:
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+class RecordingPipeline:
+    """Download completed Twilio recordings into content-addressed storage.
+
+    Layout under *directory*:
+
+    • ``objects/<aa>/<sha256>.<ext>`` – recording media, stored once per
+      distinct content.
+    • ``manifest.jsonl`` – one JSON line per state change of a recording
+      (``pending`` → ``stored`` / ``failed``); the last line for a
+      RecordingSid wins. Each record links the recording to its call,
+      conference name and the transcripts that carry the same conference
+      name or call SID.
+    • ``tmp/`` – partial downloads, resumed with a Range request.
+
+    :meth:`submit` is called from the recording status webhooks and never
+    blocks: ``completed`` callbacks are deduplicated by RecordingSid and
+    queued for a fixed pool of worker threads. When the queue is full the
+    recording stays ``pending`` and is picked up when a worker frees up (or
+    on the next :meth:`start`).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        auth: tuple[str, str] | None = None,
+        workers: int = 4,
+        max_queued: int = 256,
+        url_template: str = DEFAULT_URL_TEMPLATE,
+        transcripts_dir: str | None = "transcripts",
+        attempts: int = 3,
+    ):
+        self.directory = directory
+        self.auth = auth
+        self.workers = workers
+        self.url_template = url_template
+        self.transcripts_dir = transcripts_dir
+        self.attempts = attempts
+        self._queue: queue.Queue[str | None] = queue.Queue(max_queued)
+        self._lock = threading.Lock()
+        self._records: dict[str, dict] = {}
+        self._active: set[str] = set()
+        self._deferred: set[str] = set()
+        self._threads: list[threading.Thread] = []
+        self._stopping = threading.Event()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._manifest_path = os.path.join(directory, "manifest.jsonl")
+        self._manifest = None
+        self._transcripts: dict[str, tuple[float, dict]] = {}
+        self.downloaded = 0
+        self.downloaded_bytes = 0
+        self.duplicates = 0
+        self.deduplicated_objects = 0
+        self.deferred = 0
+        self.failures = 0
+        self.last_download_seconds: float | None = None
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "tmp"), exist_ok=True)
+        self._load_manifest()
+
+    # --- manifest ---------------------------------------------------------
+
+    def _load_manifest(self) -> None:
+        if os.path.exists(self._manifest_path):
+            with open(self._manifest_path, encoding="utf-8") as fp:
+                for line in fp:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line
+                    self._records[record["recording_sid"]] = record
+        # Compact to one line per recording.
+        tmp_path = self._manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as fp:
+            for record in self._records.values():
+                fp.write(json.dumps(record, separators=(",", ":")) + "\n")
+        os.replace(tmp_path, self._manifest_path)
+        self._manifest = open(self._manifest_path, "a", encoding="utf-8")
+
+    def _save(self, record: dict) -> None:
+        """Record a state change; callers hold ``self._lock``."""
+        record["updated_at"] = time.time()
+        self._records[record["recording_sid"]] = record
+        if self._manifest is None:
+            return  # stopped; the last saved state is replayed on start
+        self._manifest.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self._manifest.flush()
+
+    def manifest(self, conference_name: str | None = None) -> list[dict]:
+        """Return manifest records, optionally for one conference."""
+        with self._lock:
+            records = [dict(r) for r in self._records.values()]
+        if conference_name is not None:
+            records = [
+                r
+                for r in records
+                if r.get("conference_name") == conference_name
+            ]
+        return records
+
+    # --- lifecycle --------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the worker pool and queue recordings left ``pending``."""
+        self._stopping.clear()
+        for _ in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name="recording-pipeline", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+        self._requeue_pending()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Finish in-flight downloads; queued ones stay ``pending``."""
+        self._stopping.set()
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+        with self._lock:
+            if self._manifest is not None:
+                self._manifest.close()
+                self._manifest = None
+        self._session.close()
+
+    def _requeue_pending(self) -> None:
+        with self._lock:
+            pending = [
+                sid
+                for sid, record in self._records.items()
+                if record["status"] == "pending" and sid not in self._active
+            ]
+            self._deferred.update(pending)
+        self._requeue_deferred()
+
+    def _requeue_deferred(self) -> None:
+        while True:
+            with self._lock:
+                if not self._deferred:
+                    return
+                sid = self._deferred.pop()
+            if not self._enqueue(sid):
+                with self._lock:
+                    self._deferred.add(sid)
+                return
+
+    def _enqueue(self, sid: str) -> bool:
+        with self._lock:
+            if sid in self._active:
+                return True
+            try:
+                self._queue.put_nowait(sid)
+            except queue.Full:
+                return False
+            self._active.add(sid)
+        return True
+
+    # --- intake -----------------------------------------------------------
+
+    def submit(self, event: dict, conference_name: str | None = None) -> str:
+        """Queue a recording status callback for download.
+
+        Returns ``"queued"``, ``"deferred"`` (queue full; stays pending),
+        ``"duplicate"`` (RecordingSid already pending or stored) or
+        ``"ignored"`` (not a completed recording).
+        """
+        sid = event.get("RecordingSid")
+        if event.get("RecordingStatus") != "completed" or not sid:
+            return "ignored"
+        if not event.get("RecordingUrl"):
+            return "ignored"
+        with self._lock:
+            existing = self._records.get(sid)
+            if existing is not None and existing["status"] != "failed":
+                self.duplicates += 1
+                return "duplicate"
+            self._save(
+                {
+                    "recording_sid": sid,
+                    "status": "pending",
+                    "call_sid": event.get("CallSid"),
+                    "conference_sid": event.get("ConferenceSid"),
+                    "conference_name": conference_name,
+                    "recording_url": event.get("RecordingUrl"),
+                    "duration": event.get("RecordingDuration"),
+                    "channels": event.get("RecordingChannels"),
+                    "recording_start_time": event.get("RecordingStartTime"),
+                    "source": event.get("RecordingSource"),
+                    "callback": dict(event),
+                    "received_at": time.time(),
+                }
+            )
+        if self._enqueue(sid):
+            return "queued"
+        with self._lock:
+            self.deferred += 1
+            self._deferred.add(sid)
+        logger.warning("🎙️ Recording queue full; %s deferred", sid)
+        return "deferred"
+
+    # --- workers ----------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            sid = self._queue.get()
+            if sid is None:
+                return
+            if self._stopping.is_set():
+                with self._lock:
+                    self._active.discard(sid)
+                continue
+            try:
+                self._process(sid)
+            except Exception:  # noqa: BLE001 - keep the worker alive
+                logger.exception("🎙️ Recording %s failed", sid)
+            finally:
+                with self._lock:
+                    self._active.discard(sid)
+            if self._deferred and self._queue.empty():
+                self._requeue_deferred()
+
+    def _process(self, sid: str) -> None:
+        with self._lock:
+            record = dict(self._records[sid])
+        url = self.url_template.format(**record["callback"])
+        started = time.perf_counter()
+        error = None
+        for attempt in range(1, self.attempts + 1):
+            try:
+                digest, size, ext = self._download(sid, url)
+                error = None
+                break
+            except (OSError, requests.RequestException) as exc:
+                error = exc
+                response = getattr(exc, "response", None)
+                status = getattr(response, "status_code", 0)
+                logger.warning(
+                    "🎙️ Download of %s failed (attempt %s/%s): %s",
+                    sid,
+                    attempt,
+                    self.attempts,
+                    exc,
+                )
+                if status and status < 500:
+                    break  # retrying will not help
+                if attempt < self.attempts:
+                    time.sleep(min(0.5 * 2 ** (attempt - 1), 5))
+        if error is not None:
+            with self._lock:
+                self.failures += 1
+                self._save({**record, "status": "failed", "error": str(error)})
+            return
+
+        path, existed = self._store(sid, digest, ext)
+        record.update(
+            status="stored",
+            sha256=digest,
+            bytes=size,
+            path=os.path.relpath(path, self.directory),
+            transcripts=self._find_transcripts(record),
+        )
+        record.pop("error", None)
+        with self._lock:
+            self.downloaded += 1
+            self.downloaded_bytes += size
+            self.deduplicated_objects += existed
+            self.last_download_seconds = time.perf_counter() - started
+            self._save(record)
+        logger.info(
+            "🎙️ Stored recording %s (%s bytes, sha256 %s)",
+            sid,
+            size,
+            digest[:12],
+        )
+
+    def _download(self, sid: str, url: str) -> tuple[str, int, str]:
+        """Stream *url* to ``tmp/<sid>.part``; return (sha256, size, ext)."""
+        part_path = os.path.join(self.directory, "tmp", sid + ".part")
+        digest = hashlib.sha256()
+        offset = 0
+        if os.path.exists(part_path):
+            with open(part_path, "rb") as fp:
+                while chunk := fp.read(_CHUNK_SIZE):
+                    digest.update(chunk)
+                    offset += len(chunk)
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        with self._session.get(
+            url, auth=self.auth, headers=headers, stream=True, timeout=30
+        ) as response:
+            if response.status_code == 416 and offset:
+                pass  # the part is already complete
+            else:
+                response.raise_for_status()
+                if response.status_code != 206:
+                    digest, offset = hashlib.sha256(), 0
+                with open(part_path, "ab" if offset else "wb") as fp:
+                    for chunk in response.iter_content(_CHUNK_SIZE):
+                        fp.write(chunk)
+                        digest.update(chunk)
+                        offset += len(chunk)
+            ext = os.path.splitext(response.url.split("?", 1)[0])[1]
+        return digest.hexdigest(), offset, ext or ".mp3"
+
+    def _store(self, sid: str, digest: str, ext: str) -> tuple[str, bool]:
+        part_path = os.path.join(self.directory, "tmp", sid + ".part")
+        object_dir = os.path.join(self.directory, "objects", digest[:2])
+        os.makedirs(object_dir, exist_ok=True)
+        path = os.path.join(object_dir, digest + ext)
+        if os.path.exists(path):
+            os.remove(part_path)
+            return path, True
+        os.replace(part_path, path)
+        return path, False
+
+    # --- transcripts ------------------------------------------------------
+
+    def _find_transcripts(self, record: dict) -> list[str]:
+        """Transcripts of the recording's conference (or call)."""
+        if not self.transcripts_dir or not os.path.isdir(self.transcripts_dir):
+            return []
+        conference_name = record.get("conference_name")
+        call_sid = record.get("call_sid")
+        matches = []
+        for path in sorted(
+            glob.glob(os.path.join(self.transcripts_dir, "*.json"))
+        ):
+            metadata = self._cached_metadata(path)
+            params = metadata.get("custom_parameters") or {}
+            if conference_name and params.get("conference_name") == (
+                conference_name
+            ):
+                matches.append(path)
+            elif (
+                not conference_name
+                and call_sid
+                and (metadata.get("call_sid") == call_sid)
+            ):
+                matches.append(path)
+        return matches
+
+    def _cached_metadata(self, path: str) -> dict:
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return {}
+        cached = self._transcripts.get(path)
+        if cached is None or cached[0] != mtime:
+            try:
+                cached = (mtime, _transcript_metadata(path))
+            except OSError:
+                return {}
+            self._transcripts[path] = cached
+        return cached[1]
+
+    def relink_transcripts(self) -> int:
+        """Refresh the transcript links of stored recordings.
+
+        Transcripts are finalised when their stream stops, which can be
+        after the recording was downloaded. Returns the records updated.
+        """
+        updated = 0
+        for record in self.manifest():
+            if record["status"] != "stored":
+                continue
+            transcripts = self._find_transcripts(record)
+            if transcripts != record.get("transcripts"):
+                with self._lock:
+                    self._save({**record, "transcripts": transcripts})
+                updated += 1
+        return updated
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses: dict[str, int] = {}
+            for record in self._records.values():
+                statuses[record["status"]] = (
+                    statuses.get(record["status"], 0) + 1
+                )
+            return {
+                "workers": self.workers,
+                "queued": self._queue.qsize(),
+                "in_flight": len(self._active),
+                "deferred_pending": len(self._deferred),
+                "recordings": statuses,
+                "downloaded": self.downloaded,
+                "downloaded_bytes": self.downloaded_bytes,
+                "duplicates": self.duplicates,
+                "deduplicated_objects": self.deduplicated_objects,
+                "deferred": self.deferred,
+                "failures": self.failures,
+                "last_download_seconds": self.last_download_seconds,
+            }
@@ -0,0 +1,20 @@
+from flask import Blueprint, current_app, jsonify, request
+
+recordings_bp = Blueprint("recordings", __name__)
+
+
+@recordings_bp.route("/recordings", methods=["GET"])
+def recordings_manifest():
+    """Return the downloaded-recordings manifest.
+
+    Query params: optional ``conference_name``; ``relink=1`` refreshes the
+    transcript links first (transcripts can finish after the recording).
+    """
+    pipeline = current_app.config.get("recording_pipeline")
+    if pipeline is None:
+        return jsonify({"error": "Recording pipeline is disabled"}), 404
+    if request.args.get("relink") == "1":
+        pipeline.relink_transcripts()
+    return jsonify(
+        {"recordings": pipeline.manifest(request.args.get("conference_name"))}
+    )
@@ -0,0 +1,228 @@
+import atexit
+import glob
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+# msgpack keeps snapshots compact and fast to load; fall back to JSON when it
+# is not installed so the app still runs with the bare requirements.
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+from src.call_graph import CallGraph
+
+logger = logging.getLogger(__name__)
+
+_JOURNAL_RE = re.compile(r"journal-(\d+)\.(?:msgpack|jsonl)$")
+
+
+class StateStore:
+    """Persist the :class:`CallGraph` so a restart resumes in-flight calls.
+
+    Layout under *directory*:
+
+    • ``snapshot.<ext>`` – the full graph plus the sequence number of the
+      first journal that is *not* folded into it.
+    • ``journal-<seq>.<ext>`` – an append-only log of graph writes made since
+      the snapshot was cut (method name + arguments).
+
+    Every graph write is appended to the current journal as it happens; every
+    ``interval`` seconds a new snapshot is written atomically and the journals
+    it covers are deleted. :meth:`restore` loads the snapshot and replays the
+    remaining journals in order, which makes a warm restart sub-second even
+    with thousands of tracked calls.
+    """
+
+    def __init__(
+        self,
+        graph: CallGraph,
+        directory: str,
+        interval: float = 30.0,
+        retention: float = 3600.0,
+    ):
+        self.graph = graph
+        self.directory = directory
+        self.interval = interval
+        self.retention = retention
+        self.ext = "msgpack" if msgpack is not None else "jsonl"
+        self._seq = 0
+        self._journal = None
+        self._journal_entries = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.last_snapshot_at: float | None = None
+        self.last_snapshot_seconds: float | None = None
+        self.last_snapshot_bytes = 0
+        self.last_restore_seconds: float | None = None
+        self.replayed_entries = 0
+        os.makedirs(directory, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    def _dumps(self, obj) -> bytes:
+        if msgpack is not None:
+            return msgpack.packb(obj, use_bin_type=True)
+        return (json.dumps(obj, separators=(",", ":")) + "\n").encode()
+
+    def _loads(self, data: bytes):
+        if msgpack is not None:
+            return msgpack.unpackb(data, raw=False, strict_map_key=False)
+        return json.loads(data)
+
+    def _read_journal(self, path: str):
+        """Yield journal entries, stopping quietly at a torn final write."""
+        with open(path, "rb") as fp:
+            if msgpack is not None:
+                unpacker = msgpack.Unpacker(fp, raw=False, strict_map_key=False)
+                try:
+                    yield from unpacker
+                except (msgpack.OutOfData, ValueError):
+                    logger.warning("💾 Truncated journal tail in %s", path)
+                return
+            for line in fp:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning("💾 Truncated journal tail in %s", path)
+                    return
+
+    # ------------------------------------------------------------------
+    # Paths
+    # ------------------------------------------------------------------
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, f"snapshot.{self.ext}")
+
+    def _journal_path(self, seq: int) -> str:
+        return os.path.join(self.directory, f"journal-{seq:08d}.{self.ext}")
+
+    def _journals(self) -> list[tuple[int, str]]:
+        found = []
+        for path in glob.glob(os.path.join(self.directory, "journal-*")):
+            match = _JOURNAL_RE.search(os.path.basename(path))
+            if match and path.endswith(self.ext):
+                found.append((int(match.group(1)), path))
+        return sorted(found)
+
+    # ------------------------------------------------------------------
+    # Restore / journal / snapshot
+    # ------------------------------------------------------------------
+
+    def restore(self) -> None:
+        """Load the last snapshot, replay newer journals and start journaling."""
+        started = time.perf_counter()
+        first_seq = 0
+        snapshot_path = self._snapshot_path()
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "rb") as fp:
+                snapshot = self._loads(fp.read())
+            self.graph.load_state(snapshot["graph"])
+            first_seq = snapshot["journal_seq"]
+
+        replayed = 0
+        last_seq = first_seq - 1
+        for seq, path in self._journals():
+            if seq < first_seq:
+                os.remove(path)
+                continue
+            for method_name, args, kwargs in self._read_journal(path):
+                self.graph.apply(method_name, args, kwargs)
+                replayed += 1
+            last_seq = seq
+
+        self.replayed_entries = replayed
+        self._seq = last_seq + 1
+        self._open_journal()
+        self.graph.set_mutation_listener(self._append)
+        self.last_restore_seconds = time.perf_counter() - started
+        logger.info(
+            "💾 Restored call state: %s calls, %s journal entries in %.3fs",
+            self.graph.call_count(),
+            replayed,
+            self.last_restore_seconds,
+        )
+
+    def _open_journal(self) -> None:
+        self._journal = open(self._journal_path(self._seq), "ab")
+        self._journal_entries = 0
+
+    def _append(self, method_name: str, args, kwargs) -> None:
+        # Runs under the graph lock, so entries land in application order.
+        try:
+            self._journal.write(self._dumps([method_name, list(args), kwargs]))
+            self._journal.flush()
+            self._journal_entries += 1
+        except Exception as exc:
+            logger.error("💾 Failed to journal %s: %s", method_name, exc)
+
+    def snapshot(self) -> None:
+        """Write a compact snapshot and drop the journals it supersedes."""
+        started = time.perf_counter()
+        if self.retention:
+            self.graph.prune(time.time() - self.retention)
+        with self.graph.lock:
+            data = self._dumps(
+                {"journal_seq": self._seq + 1, "graph": self.graph.to_state()}
+            )
+            # Later writes go to a fresh journal that the snapshot does not
+            # cover; the old one is only deleted once the snapshot is durable.
+            self._journal.close()
+            covered_seq = self._seq
+            self._seq += 1
+            self._open_journal()
+
+        tmp_path = self._snapshot_path() + ".tmp"
+        with open(tmp_path, "wb") as fp:
+            fp.write(data)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp_path, self._snapshot_path())
+        for seq, path in self._journals():
+            if seq <= covered_seq:
+                os.remove(path)
+
+        self.last_snapshot_at = time.time()
+        self.last_snapshot_seconds = time.perf_counter() - started
+        self.last_snapshot_bytes = len(data)
+
+    def start(self) -> None:
+        """Snapshot every ``interval`` seconds and once more at exit."""
+        if self._thread is not None:
+            return
+
+        def run():
+            while not self._stop.wait(self.interval):
+                try:
+                    self.snapshot()
+                except Exception as exc:
+                    logger.error("💾 Snapshot failed: %s", exc)
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        self._stop.set()
+        try:
+            self.snapshot()
+        except Exception as exc:
+            logger.error("💾 Final snapshot failed: %s", exc)
+
+    def stats(self) -> dict:
+        return {
+            "format": self.ext,
+            "journal_seq": self._seq,
+            "journal_entries": self._journal_entries,
+            "last_snapshot_at": self.last_snapshot_at,
+            "last_snapshot_seconds": self.last_snapshot_seconds,
+            "last_snapshot_bytes": self.last_snapshot_bytes,
+            "last_restore_seconds": self.last_restore_seconds,
+            "replayed_entries": self.replayed_entries,
+        }
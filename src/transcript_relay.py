@@ -0,0 +1,357 @@
+import collections
+import json
+import logging
+import math
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept per stage for the percentiles in ``stats``.
+_LATENCY_SAMPLES = 1000
+# Streams whose last ``seq`` is remembered, to count lost datagrams.
+_MAX_STREAMS = 4096
+# Most latency values accepted from one browser acknowledgement.
+_MAX_ACK_SAMPLES = 256
+
+
+def _percentiles(samples) -> dict | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "count": len(ordered),
+        "p50": at(0.5),
+        "p95": at(0.95),
+        "max": ordered[-1],
+    }
+
+
+class TranscriptRelay:
+    """Push live transcript segments to the browser dialers over Socket.IO.
+
+    ``live_transcription_server.py`` sends one JSON datagram per segment
+    (``{"stream_sid", "call_sid", "conference", "participant", "channel",
+    "final", "text", "start_ms", "end_ms", "seq", "published_ms"}``, times
+    in epoch ms) to *address*. Each segment goes to the rooms (identities)
+    of the agents on its conference – or, for a normal call, of the
+    identity that placed it – as a ``transcript`` event
+    ``{"batch", "emitted_ms", "segments": [...]}``. Segments with no agent
+    to go to are dropped, never broadcast.
+
+    Backpressure and coalescing, per room:
+
+    • At most one batch every *min_interval* seconds; a quiet room gets a
+      segment as soon as it arrives.
+    • While a batch waits, a speaker's final segments are merged into one
+      and only its newest interim is kept, so a chatty call costs a room
+      at most one event per interval however fast results arrive.
+    • Dialers acknowledge batches (``transcript_ack``). A room with
+      *max_in_flight* batches unacknowledged gets nothing more until it
+      catches up, or one merged batch every *stall_timeout* seconds (for
+      hidden tabs and clients that never acknowledge).
+
+    Latency is measured from the end of a segment's audio (``end_ms``):
+    to its publication by the transcription server, to its emission here
+    and, as reported in the acknowledgements, to the dialer's screen.
+    """
+
+    def __init__(
+        self,
+        socketio,
+        call_graph,
+        address: tuple[str, int] = ("127.0.0.1", 5679),
+        min_interval: float = 0.25,
+        max_in_flight: int = 8,
+        stall_timeout: float = 5.0,
+    ):
+        self.socketio = socketio
+        self.call_graph = call_graph
+        self.address = address
+        self.min_interval = min_interval
+        self.max_in_flight = max_in_flight
+        self.stall_timeout = stall_timeout
+        self._cond = threading.Condition()
+        # room → (stream_sid, channel) → {"final": ..., "interim": ...}
+        self._outboxes: dict[str, dict[tuple, dict]] = {}
+        # room → {"sent": last batch, "acked": last acknowledged batch,
+        # "sent_at": monotonic time of the last batch}
+        self._windows: dict[str, dict] = {}
+        self._last_seq: collections.OrderedDict[str, int] = (
+            collections.OrderedDict()
+        )
+        self._latency = {
+            stage: collections.deque(maxlen=_LATENCY_SAMPLES)
+            for stage in (
+                "audio_to_publish",
+                "audio_to_emit",
+                "audio_to_screen",
+            )
+        }
+        self._sock: socket.socket | None = None
+        self._threads: list[threading.Thread] = []
+        self._stopping = threading.Event()
+        self.received = 0
+        self.lost = 0
+        self.malformed = 0
+        self.unrouted = 0
+        self.coalesced = 0
+        self.stalled = 0
+        self.batches = 0
+        self.emitted = 0
+
+    # --- lifecycle --------------------------------------------------------
+
+    def start(self) -> None:
+        """Bind *address* and start the receive and emit threads."""
+        self._stopping.clear()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # Absorb bursts while the emit thread holds the lock.
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        self._sock.bind(self.address)
+        self._sock.settimeout(0.5)
+        for target, name in (
+            (self._receive, "transcript-relay-receive"),
+            (self._run, "transcript-relay-emit"),
+        ):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(
+            "📝 Live transcript relay listening on %s:%s", *self.address
+        )
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stopping.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    # --- intake -----------------------------------------------------------
+
+    def _receive(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                data, _sender = self._sock.recvfrom(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return  # closed by stop()
+            try:
+                segment = json.loads(data)
+                self.offer(segment)
+            except (ValueError, TypeError, KeyError, AttributeError):
+                with self._cond:
+                    self.malformed += 1
+
+    def offer(self, segment: dict) -> int:
+        """Queue *segment* for its rooms; return how many it goes to."""
+        end_ms = segment.get("end_ms")
+        published_ms = segment.get("published_ms")
+        if not isinstance(end_ms, (int, float)):
+            raise ValueError("segment without end_ms")
+        if not isinstance(segment.get("text"), str):
+            raise ValueError("segment without text")
+        rooms = self.rooms_for(segment)
+        key = (segment.get("stream_sid"), segment.get("channel", 0))
+        with self._cond:
+            self.received += 1
+            self._track_seq(segment)
+            if isinstance(published_ms, (int, float)):
+                self._latency["audio_to_publish"].append(published_ms - end_ms)
+            if not rooms:
+                self.unrouted += 1
+                return 0
+            for room in rooms:
+                entry = self._outboxes.setdefault(room, {}).setdefault(
+                    key, {"final": None, "interim": None}
+                )
+                self._coalesce(entry, segment)
+            self._cond.notify()
+        return len(rooms)
+
+    def rooms_for(self, segment: dict) -> set[str]:
+        """Identities of the agents that should see *segment*."""
+        graph = self.call_graph
+        rooms: set[str | None] = set()
+        with graph.lock:
+            conference_name = segment.get("conference")
+            if conference_name:
+                conference = graph.conference(conference_name)
+                rooms.add(conference.get("created_by"))
+                for sid, info in conference.get("calls", {}).items():
+                    rooms.add(info.get("participant_identity"))
+                    rooms.add(graph.call(sid).get("identity"))
+            else:
+                # The identity that placed the call, or its parent.
+                sid, seen = segment.get("call_sid"), set()
+                while sid and sid not in seen:
+                    seen.add(sid)
+                    rooms.add(graph.call(sid).get("identity"))
+                    sid = graph.parent_of(sid)
+        rooms.discard(None)
+        return rooms  # type: ignore[return-value]
+
+    def _track_seq(self, segment: dict) -> None:
+        """Count datagrams lost between the server and here; under lock."""
+        stream_sid, seq = segment.get("stream_sid"), segment.get("seq")
+        if stream_sid is None or not isinstance(seq, int):
+            return
+        last = self._last_seq.pop(stream_sid, None)
+        if last is not None and seq > last + 1:
+            self.lost += seq - last - 1
+        self._last_seq[stream_sid] = seq if last is None else max(seq, last)
+        if len(self._last_seq) > _MAX_STREAMS:
+            self._last_seq.popitem(last=False)
+
+    def _coalesce(self, entry: dict, segment: dict) -> None:
+        """Add *segment* to a speaker's waiting segments; under lock."""
+        final = entry["final"]
+        if segment.get("final"):
+            if final is None:
+                entry["final"] = dict(segment)
+            else:
+                final["text"] = f"{final['text']} {segment['text']}"
+                for field in ("end_ms", "seq", "published_ms"):
+                    final[field] = segment.get(field)
+                self.coalesced += 1
+            interim = entry["interim"]
+            if interim is not None and interim["end_ms"] <= segment["end_ms"]:
+                entry["interim"] = None
+                self.coalesced += 1
+            return
+        if final is not None and segment["end_ms"] <= final["end_ms"]:
+            self.coalesced += 1  # older than the final that replaced it
+            return
+        if entry["interim"] is not None:
+            self.coalesced += 1
+        entry["interim"] = segment
+
+    # --- emission ---------------------------------------------------------
+
+    def _due_at(self, room: str) -> float:
+        window = self._windows.get(room)
+        if window is None:
+            return 0.0
+        if window["sent"] - window["acked"] >= self.max_in_flight:
+            return window["sent_at"] + self.stall_timeout
+        return window["sent_at"] + self.min_interval
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping.is_set():
+                        return
+                    now = time.monotonic()
+                    due = [
+                        self._due_at(room)
+                        for room, outbox in self._outboxes.items()
+                        if outbox
+                    ]
+                    if due and min(due) <= now:
+                        break
+                    self._cond.wait(min(due) - now if due else None)
+                batches = self._take_due(now)
+            self._emit(batches)
+
+    def _take_due(self, now: float) -> list[tuple[str, int, list[dict]]]:
+        """Pop the outboxes of rooms due a batch; under lock."""
+        batches = []
+        for room in list(self._outboxes):
+            outbox = self._outboxes[room]
+            if not outbox or self._due_at(room) > now:
+                continue
+            window = self._windows.setdefault(
+                room, {"sent": 0, "acked": 0, "sent_at": 0.0}
+            )
+            if window["sent"] - window["acked"] >= self.max_in_flight:
+                self.stalled += 1
+            window["sent"] += 1
+            window["sent_at"] = now
+            del self._outboxes[room]
+            batches.append(
+                (
+                    room,
+                    window["sent"],
+                    [
+                        segment
+                        for entry in outbox.values()
+                        for segment in (entry["final"], entry["interim"])
+                        if segment is not None
+                    ],
+                )
+            )
+        return batches
+
+    def _emit(self, batches: list[tuple[str, int, list[dict]]]) -> None:
+        for room, batch, segments in batches:
+            emitted_ms = time.time() * 1000
+            try:
+                self.socketio.emit(
+                    "transcript",
+                    {
+                        "batch": batch,
+                        "emitted_ms": round(emitted_ms),
+                        "segments": segments,
+                    },
+                    room=room,
+                )
+            except Exception:  # noqa: BLE001 - keep the relay alive
+                logger.exception("📝 Could not emit transcript to %s", room)
+                continue
+            with self._cond:
+                self.batches += 1
+                self.emitted += len(segments)
+                self._latency["audio_to_emit"].extend(
+                    emitted_ms - segment["end_ms"] for segment in segments
+                )
+
+    def ack(self, room: str, data: dict) -> None:
+        """Record a dialer's ``transcript_ack``: the *batch* it rendered
+        and the audio-to-screen ``latency_ms`` of its segments.
+        """
+        try:
+            batch = int(data.get("batch"))
+        except (TypeError, ValueError):
+            return
+        latencies = [
+            float(value)
+            for value in (data.get("latency_ms") or ())[:_MAX_ACK_SAMPLES]
+            if isinstance(value, (int, float)) and math.isfinite(value)
+        ]
+        with self._cond:
+            window = self._windows.get(room)
+            if window is not None and window["acked"] < batch <= window["sent"]:
+                window["acked"] = batch
+                self._cond.notify()
+            self._latency["audio_to_screen"].extend(latencies)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "address": "%s:%d" % self.address,
+                "received": self.received,
+                "lost": self.lost,
+                "malformed": self.malformed,
+                "unrouted": self.unrouted,
+                "coalesced": self.coalesced,
+                "batches": self.batches,
+                "emitted": self.emitted,
+                "stalled": self.stalled,
+                "waiting_rooms": sum(1 for o in self._outboxes.values() if o),
+                "latency_ms": {
+                    stage: _percentiles(samples)
+                    for stage, samples in self._latency.items()
+                },
+            }
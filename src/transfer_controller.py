@@ -40,11 +40,11 @@ def warm_transfer():
     transfer_to = data.get("transfer_to")
 
     # NEW: If **either** of the supplied legs is already part of a conference in
-    # Redis, just update that existing conference with the new participant to be
+    # the call graph, just update that existing conference with the new participant to be
     # added instead of building a brand-new conference. This supports payloads
     # that contain only the parent leg, only the child leg, or both.
 
-    redis = current_app.config["redis"]
+    graph = current_app.config["call_graph"]
 
     existing_conference_info = None
     conference_name_existing = None
@@ -53,8 +53,8 @@ def warm_transfer():
     for sid in (parent_call_sid, child_call_sid):
         if sid is None:
             continue
-        entry = redis.get(sid)
-        if entry and entry.get("conference"):
+        entry = graph.call(sid)
+        if entry.get("conference"):
             existing_conference_info = entry["conference"]
             conference_name_existing = existing_conference_info.get(
                 "conference_name"
@@ -202,65 +202,71 @@ def warm_transfer():
             mute_on_conference_join[child_call_sid] = True  # agent to agent
 
     try:
-        redis = current_app.config["redis"]
-        redis[parent_call_sid] = {
-            "participant_label": parent_name,
-            "child_call_sid": child_call_sid,
-            "child_call_moved_to_conference": True,
-            "identity": identity,
-            "stream_audio": True,
-            "conference": {
-                "conference_name": conference_name,
-                "on_hold": hold_on_conference_join[parent_call_sid],
-                "role": parent_role,
-                "start_conference_on_enter": start_conference_on_enter[
-                    parent_call_sid
-                ],
-                "end_conference_on_exit": end_conference_on_exit[
-                    parent_call_sid
-                ],
-                "mute": mute_on_conference_join[parent_call_sid],
-                "add_to_conference": transfer_to,
-                "participant_role": "agent",
-                "participant_identity": (
-                    transfer_to[7:]
-                    if transfer_to.startswith("client:")
-                    else transfer_to
-                ),
-            },
-        }
-        redis[conference_name] = {
-            "created_by": identity,
-            "created": False,
-            "calls": {
-                parent_call_sid: {
-                    "add_to_conference": transfer_to,
-                    "participant_role": "agent",
-                    "participant_identity": identity,  # transfer_to[7:] if transfer_to.startswith("client:") else transfer_to,
-                    "call_tag": parent_name,
-                    "hold_on_conference_join": hold_on_conference_join[
+        graph.configure_call(
+            parent_call_sid,
+            {
+                "participant_label": parent_name,
+                "child_call_sid": child_call_sid,
+                "child_call_moved_to_conference": True,
+                "identity": identity,
+                "stream_audio": True,
+                "conference": {
+                    "conference_name": conference_name,
+                    "on_hold": hold_on_conference_join[parent_call_sid],
+                    "role": parent_role,
+                    "start_conference_on_enter": start_conference_on_enter[
                         parent_call_sid
                     ],
-                    "initial_call_recording_sid": get_value(
-                        recordings, parent_call_sid
-                    ),
-                    "role": parent_role,
-                    "stream_audio": True,
-                },
-                child_call_sid: {
-                    "call_tag": child_name,
-                    "hold_on_conference_join": hold_on_conference_join[
-                        child_call_sid
+                    "end_conference_on_exit": end_conference_on_exit[
+                        parent_call_sid
                     ],
-                    "initial_call_recording_sid": get_value(
-                        recordings, child_call_sid
+                    "mute": mute_on_conference_join[parent_call_sid],
+                    "add_to_conference": transfer_to,
+                    "participant_role": "agent",
+                    "participant_identity": (
+                        transfer_to[7:]
+                        if transfer_to.startswith("client:")
+                        else transfer_to
                     ),
-                    "role": child_role,
-                    "stream_audio": True,
                 },
             },
-            "participants": {},
-        }
+        )
+        graph.create_conference(
+            conference_name, created_by=identity, created=False
+        )
+        graph.add_conference_call(
+            conference_name,
+            parent_call_sid,
+            {
+                "add_to_conference": transfer_to,
+                "participant_role": "agent",
+                "participant_identity": identity,  # transfer_to[7:] if transfer_to.startswith("client:") else transfer_to,
+                "call_tag": parent_name,
+                "hold_on_conference_join": hold_on_conference_join[
+                    parent_call_sid
+                ],
+                "initial_call_recording_sid": get_value(
+                    recordings, parent_call_sid
+                ),
+                "role": parent_role,
+                "stream_audio": True,
+            },
+        )
+        graph.add_conference_call(
+            conference_name,
+            child_call_sid,
+            {
+                "call_tag": child_name,
+                "hold_on_conference_join": hold_on_conference_join[
+                    child_call_sid
+                ],
+                "initial_call_recording_sid": get_value(
+                    recordings, child_call_sid
+                ),
+                "role": child_role,
+                "stream_audio": True,
+            },
+        )
 
         client.calls(child_call_sid).update(
             url=url_for(
@@ -297,21 +303,29 @@ def warm_transfer():
                     f"No stream to stop on {sid_label} leg: {e}"
                 )
 
-        redis[conference_name]["participants"][child_call_sid] = {
-            "participant_label": child_name,
-            "call_sid": child_call_sid,
-            "muted": mute_on_conference_join[child_call_sid],
-            "on_hold": hold_on_conference_join[child_call_sid],
-            "role": child_role,
-        }
-
-        redis[conference_name]["participants"][parent_call_sid] = {
-            "participant_label": parent_name,
-            "call_sid": parent_call_sid,
-            "muted": mute_on_conference_join[parent_call_sid],
-            "on_hold": hold_on_conference_join[parent_call_sid],
-            "role": parent_role,
-        }
+        graph.set_participant(
+            conference_name,
+            child_call_sid,
+            {
+                "participant_label": child_name,
+                "call_sid": child_call_sid,
+                "muted": mute_on_conference_join[child_call_sid],
+                "on_hold": hold_on_conference_join[child_call_sid],
+                "role": child_role,
+            },
+        )
+
+        graph.set_participant(
+            conference_name,
+            parent_call_sid,
+            {
+                "participant_label": parent_name,
+                "call_sid": parent_call_sid,
+                "muted": mute_on_conference_join[parent_call_sid],
+                "on_hold": hold_on_conference_join[parent_call_sid],
+                "role": parent_role,
+            },
+        )
         current_app.logger.debug(
             "🔀 Child call %s joined conference %s",
             child_call_sid,
@@ -332,11 +346,11 @@ def unhold_call():
     """
     data = request.json
     client = current_app.config["twilio_client"]
-    call_log = current_app.config["call_log"]
+    graph = current_app.config["call_graph"]
     parent_call_sid = data.get("parent_call_sid")
     conference_friendly_name = f"CallRoom_{parent_call_sid}"
 
-    parent_number = call_log.get(parent_call_sid, {}).get("parent_number")
+    parent_number = graph.call(parent_call_sid).get("parent_number")
     if not parent_number:
         return jsonify({"error": "Parent number not found for given SID"}), 400
 
@@ -473,37 +487,38 @@ def add_participant_to_conference(
         )
         call_sid = call.call_sid
 
-        redis = current_app.config["redis"]
-        if friendly_name not in redis:
-            redis[friendly_name] = {
-                "created_by": identity,
-                "calls": {},
-                "participants": {},
-            }
-
-        redis[friendly_name]["calls"][call_sid] = {
-            "call_tag": participant_label,
-            "role": participant_role,
-            "hold_on_conference_join": False,
-            "play_temporary_greeting_to_participant": (
-                True if participant_role == "agent" else False
-            ),
-        }
-
-        redis[call_sid] = {
-            "stream_audio": stream_audio,
-            "participant_label": participant_label,
-            "muted": True,
-            "on_hold": False,
-            "role": participant_role,
-            "conference": {
-                "conference_sid": conference_sid,
-                "conference_name": friendly_name,
+        graph = current_app.config["call_graph"]
+        graph.ensure_conference(friendly_name, created_by=identity)
+        graph.add_conference_call(
+            friendly_name,
+            call_sid,
+            {
+                "call_tag": participant_label,
+                "role": participant_role,
+                "hold_on_conference_join": False,
+                "play_temporary_greeting_to_participant": (
+                    True if participant_role == "agent" else False
+                ),
+            },
+        )
+
+        graph.configure_call(
+            call_sid,
+            {
+                "stream_audio": stream_audio,
+                "participant_label": participant_label,
+                "muted": True,
                 "on_hold": False,
                 "role": participant_role,
-                "start_conference_on_enter": False,
-                "end_conference_on_exit": False,
-                "kick_participant_from_conference": kick,
-                "update_participant_in_conference": True,
+                "conference": {
+                    "conference_sid": conference_sid,
+                    "conference_name": friendly_name,
+                    "on_hold": False,
+                    "role": participant_role,
+                    "start_conference_on_enter": False,
+                    "end_conference_on_exit": False,
+                    "kick_participant_from_conference": kick,
+                    "update_participant_in_conference": True,
+                },
             },
-        }
+        )
@@ -0,0 +1,409 @@
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+from twilio.base.exceptions import TwilioRestException
+
+logger = logging.getLogger(__name__)
+
+# Methods on Twilio list/context resources that issue an HTTP request.
+_REQUEST_METHODS = frozenset({"create", "update", "delete", "fetch", "list"})
+
+# Top-level client attributes we guard, mapped to the bucket they draw from.
+# Participants live under ``conferences`` and are re-bucketed on access.
+_RESOURCE_OF_ATTR = {
+    "calls": "calls",
+    "conferences": "conferences",
+    "recordings": "recordings",
+}
+
+# Requests per second (and burst size) for each resource type. Each value can
+# be overridden with ``TWILIO_RATE_<RESOURCE>`` (e.g. ``TWILIO_RATE_CALLS=2``).
+DEFAULT_RATES: dict[str, float] = {
+    "calls": 5.0,
+    "conferences": 10.0,
+    "participants": 10.0,
+    "recordings": 5.0,
+}
+
+
+def _rate_from_env(resource: str) -> float:
+    value = os.getenv(f"TWILIO_RATE_{resource.upper()}")
+    try:
+        return float(value) if value else DEFAULT_RATES[resource]
+    except ValueError:
+        return DEFAULT_RATES[resource]
+
+
+def retry_delay(attempt: int, base: float = 1.0, cap: float = 8.0) -> float:
+    """Return an exponential back-off delay with jitter for *attempt* (0-based).
+
+    Used by the background retry loops instead of a fixed one-second sleep so
+    that many threads failing at once do not hit Twilio again in lock-step.
+    """
+    delay = min(cap, base * (2**attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class TwilioGuardError(Exception):
+    """Raised when a request is refused client-side before reaching Twilio."""
+
+
+class CircuitOpenError(TwilioGuardError):
+    """The Twilio API is degraded and the circuit breaker is failing fast."""
+
+
+class RateLimitExceeded(TwilioGuardError):
+    """No rate-limit token became available within the allowed wait."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at ``rate`` tokens/s.
+
+    The balance may go negative after :meth:`penalize`, which makes every
+    caller wait out the penalty before the next request is let through.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = max(rate, 0.01)
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.throttled_total = 0
+        self.rejected_total = 0
+        self.penalties_total = 0
+        self.waited_seconds_total = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self, max_wait: float) -> bool:
+        """Take one token, sleeping up to *max_wait* seconds for it."""
+        started = time.monotonic()
+        throttled = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    if throttled:
+                        self.waited_seconds_total += now - started
+                    return True
+                delay = (1 - self._tokens) / self.rate
+                if now + delay - started > max_wait:
+                    self.rejected_total += 1
+                    return False
+                if not throttled:
+                    throttled = True
+                    self.throttled_total += 1
+            time.sleep(delay)
+
+    def penalize(self, seconds: float) -> None:
+        """Empty the bucket and go into debt so callers back off *seconds*."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0) - seconds * self.rate
+            self.penalties_total += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._refill(time.monotonic())
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "tokens": round(self._tokens, 2),
+                "throttled_total": self.throttled_total,
+                "rejected_total": self.rejected_total,
+                "penalties_total": self.penalties_total,
+                "waited_seconds_total": round(self.waited_seconds_total, 3),
+            }
+
+
+class CircuitBreaker:
+    """Classic closed → open → half-open circuit breaker.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects calls for ``reset_timeout`` seconds. It then lets a single trial
+    request through; success closes it again, failure re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.opens_total = 0
+        self.rejected_total = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def retry_in(self) -> float:
+        """Seconds until the next trial request is allowed (0 if now)."""
+        with self._lock:
+            if self.state != self.OPEN or self.opened_at is None:
+                return 0.0
+            return max(0.0, self.opened_at + self.reset_timeout - time.time())
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.time() - (self.opened_at or 0) < self.reset_timeout:
+                    self.rejected_total += 1
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            # Half-open: only one trial request at a time.
+            if self._trial_in_flight:
+                self.rejected_total += 1
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def release_trial(self) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info("⚡ Twilio circuit breaker closed")
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED
+                and self.consecutive_failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self.opened_at = time.time()
+                self.opens_total += 1
+                logger.warning(
+                    "⚡ Twilio circuit breaker opened after %s failures",
+                    self.consecutive_failures,
+                )
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "opened_at": self.opened_at,
+                "opens_total": self.opens_total,
+                "rejected_total": self.rejected_total,
+            }
+
+
+class _GuardedResource:
+    """Wraps a Twilio list/context resource so that every request method goes
+    through :meth:`GuardedTwilioClient._execute`.
+    """
+
+    def __init__(self, target, guard: "GuardedTwilioClient", resource: str):
+        self._target = target
+        self._guard = guard
+        self._resource = resource
+
+    def __call__(self, *args, **kwargs):
+        # ``client.calls(sid)`` → context object, still guarded.
+        return _GuardedResource(
+            self._target(*args, **kwargs), self._guard, self._resource
+        )
+
+    def __getattr__(self, name):
+        attr = getattr(self._target, name)
+        if name.startswith("_") or isinstance(
+            attr, (str, int, float, bool, dict, list, tuple, type(None))
+        ):
+            return attr
+        if name in _REQUEST_METHODS and callable(attr):
+
+            def guarded(*args, **kwargs):
+                return self._guard._execute(self._resource, attr, args, kwargs)
+
+            return guarded
+        resource = "participants" if name == "participants" else self._resource
+        return _GuardedResource(attr, self._guard, resource)
+
+
+class GuardedTwilioClient:
+    """Proxy around :class:`twilio.rest.Client` shared by every controller.
+
+    • Each resource type (calls, conferences, participants, recordings) draws
+      from its own :class:`TokenBucket`; an HTTP 429 drains that bucket so all
+      threads back off together instead of retrying on their own schedule.
+    • A :class:`CircuitBreaker` counts 429/5xx/connection failures and, while
+      open, makes requests fail fast with :class:`CircuitOpenError`.
+    • Non-critical work (greetings, media streams) can be handed to
+      :meth:`defer`; it is replayed in order once the breaker lets requests
+      through again.
+    """
+
+    def __init__(
+        self,
+        client,
+        rates: dict[str, float] | None = None,
+        failure_threshold: int | None = None,
+        reset_timeout: float | None = None,
+        max_wait: float | None = None,
+        throttle_backoff: float | None = None,
+        max_deferred: int = 500,
+    ):
+        self._client = client
+        rates = rates or {r: _rate_from_env(r) for r in DEFAULT_RATES}
+        self._buckets = {r: TokenBucket(rate) for r, rate in rates.items()}
+        self._breaker = CircuitBreaker(
+            failure_threshold=failure_threshold
+            or int(os.getenv("TWILIO_BREAKER_FAILURES", "5")),
+            reset_timeout=reset_timeout
+            or float(os.getenv("TWILIO_BREAKER_RESET_S", "30")),
+        )
+        self._max_wait = max_wait or float(
+            os.getenv("TWILIO_RATE_MAX_WAIT_S", "5")
+        )
+        self._throttle_backoff = throttle_backoff or float(
+            os.getenv("TWILIO_THROTTLE_BACKOFF_S", "2")
+        )
+        self._deferred: deque = deque(maxlen=max_deferred)
+        self._deferred_cond = threading.Condition()
+        self._deferred_worker: threading.Thread | None = None
+        self._deferred_executed = 0
+        self._deferred_dropped = 0
+        self._stats_lock = threading.Lock()
+        self._requests_total = 0
+        self._throttled_responses = 0
+        self._server_errors = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        resource = _RESOURCE_OF_ATTR.get(name)
+        if resource is None:
+            return attr
+        return _GuardedResource(attr, self, resource)
+
+    @property
+    def is_degraded(self) -> bool:
+        return self._breaker.state != CircuitBreaker.CLOSED
+
+    def _execute(self, resource: str, func, args, kwargs):
+        if not self._breaker.allow():
+            raise CircuitOpenError(
+                f"Twilio API degraded; {resource} request rejected"
+            )
+        bucket = self._buckets.get(resource) or self._buckets["calls"]
+        if not bucket.acquire(self._max_wait):
+            # Give the half-open trial slot back; we never reached Twilio.
+            self._breaker.release_trial()
+            raise RateLimitExceeded(
+                f"No {resource} rate-limit token within {self._max_wait}s"
+            )
+        self._count("_requests_total")
+        try:
+            result = func(*args, **kwargs)
+        except TwilioRestException as exc:
+            if exc.status == 429:
+                self._count("_throttled_responses")
+                bucket.penalize(self._throttle_backoff)
+                self._breaker.record_failure()
+            elif exc.status >= 500:
+                self._count("_server_errors")
+                self._breaker.record_failure()
+            else:
+                # 4xx other than 429 means the API itself is answering fine.
+                self._breaker.record_success()
+            raise
+        except requests.RequestException:
+            self._count("_server_errors")
+            self._breaker.record_failure()
+            raise
+        except BaseException:
+            # Not an answer from Twilio (a client-side error): say nothing
+            # about its health, but never keep a half-open trial slot.
+            self._breaker.release_trial()
+            raise
+        self._breaker.record_success()
+        return result
+
+    def _count(self, counter: str) -> None:
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def defer(self, description: str, func, *args) -> None:
+        """Queue non-critical work until the Twilio API is healthy again."""
+        with self._deferred_cond:
+            if len(self._deferred) == self._deferred.maxlen:
+                self._deferred_dropped += 1
+            self._deferred.append((description, func, args))
+            if self._deferred_worker is None:
+                self._deferred_worker = threading.Thread(
+                    target=self._drain_deferred, daemon=True
+                )
+                self._deferred_worker.start()
+            self._deferred_cond.notify()
+        logger.warning("⚡ Deferred %s until Twilio recovers", description)
+
+    def _drain_deferred(self) -> None:
+        while True:
+            with self._deferred_cond:
+                while not self._deferred:
+                    self._deferred_cond.wait()
+            delay = self._breaker.retry_in()
+            if delay > 0:
+                time.sleep(delay)
+                continue
+            with self._deferred_cond:
+                if not self._deferred:
+                    continue
+                description, func, args = self._deferred.popleft()
+            logger.info("⚡ Running deferred %s", description)
+            try:
+                func(*args)
+                self._deferred_executed += 1
+            except Exception as exc:
+                logger.warning("⚡ Deferred %s failed: %s", description, exc)
+            if self.is_degraded:
+                # The work re-deferred itself or the trial failed; back off.
+                time.sleep(max(self._breaker.retry_in(), 1.0))
+
+    def stats(self) -> dict:
+        """Return limiter, breaker and deferred-queue state for ``/metrics``."""
+        with self._deferred_cond:
+            queued = [description for description, _, _ in self._deferred]
+        with self._stats_lock:
+            counters = (
+                self._requests_total,
+                self._throttled_responses,
+                self._server_errors,
+            )
+        return {
+            "circuit_breaker": self._breaker.snapshot(),
+            "rate_limits": {r: b.snapshot() for r, b in self._buckets.items()},
+            "requests_total": counters[0],
+            "throttled_responses_total": counters[1],
+            "server_errors_total": counters[2],
+            "deferred": {
+                "queued": len(queued),
+                "pending": queued[:20],
+                "executed_total": self._deferred_executed,
+                "dropped_total": self._deferred_dropped,
+            },
+        }
@@ -92,26 +92,26 @@ def voice():
 @voice_bp.route("/hangup", methods=["GET", "POST"])
 def hangup_call():
     """Terminate the current call leg."""
-    redis = current_app.config["redis"]
+    graph = current_app.config["call_graph"]
     call_id = request.values.get("CallSid")
     current_app.logger.info(
         "📞 hangup_call invoked", extra={"params": request.values.to_dict()}
     )
-    current_app.logger.info("📞 hangup_call redis: %s", redis)
-    if call_id in redis:
-        redis_data = redis[call_id]
-        if redis_data["child_call_moved_to_conference"]:
-            conference_name = redis_data["conference"]["conference_name"]
-            participant_label = redis_data["participant_label"]
-            start_conference_on_enter = redis_data["conference"][
+    call_record = graph.call(call_id)
+    current_app.logger.info("📞 hangup_call call record: %s", call_record)
+    if call_record:
+        if call_record.get("child_call_moved_to_conference"):
+            conference_name = call_record["conference"]["conference_name"]
+            participant_label = call_record["participant_label"]
+            start_conference_on_enter = call_record["conference"][
                 "start_conference_on_enter"
             ]
-            end_conference_on_exit = redis_data["conference"][
+            end_conference_on_exit = call_record["conference"][
                 "end_conference_on_exit"
             ]
-            mute = redis_data["conference"]["mute"]
-            role = redis_data["conference"]["role"]
-            identity = redis_data["identity"]
+            mute = call_record["conference"]["mute"]
+            role = call_record["conference"]["role"]
+            identity = call_record["identity"]
 
             client = current_app.config["twilio_client"]
             current_app.logger.debug(
@@ -296,6 +296,17 @@ def voice_recording_events():
         event_data = request.values.to_dict()
         socketio.emit("voice_recording_event", event_data)
 
+    pipeline = current_app.config.get("recording_pipeline")
+    if pipeline:
+        event_data = request.values.to_dict()
+        conference_name = current_app.config["call_graph"].conference_of(
+            event_data.get("CallSid")
+        )
+        outcome = pipeline.submit(event_data, conference_name=conference_name)
+        current_app.logger.info(
+            "📞 Recording %s: %s", event_data.get("RecordingSid"), outcome
+        )
+
     current_app.logger.info(
         "📞 voice_recording_events endpoint processing complete"
     )